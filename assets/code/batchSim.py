@@ -0,0 +1,216 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Vectorized batch simulator. Keeps the ball and paddle state of N independent
+#                           matches in NumPy arrays and advances all of them per step with the same rules
+#                           as physics.Simulation, for balance testing, regression runs and bot training.
+# Misc:                     Requires numpy (the rest of the game does not). Every quantity is an integer,
+#                           like pygame.Rect, and the swept collisions are found and resolved in the same order
+#                           and with the same integer fractions as Simulation.sweepBall(), so a batch match is
+#                           step-for-step identical to a scalar one at any tick rate.
+# =================================================================================================
+
+import numpy as np
+
+from assets.code.physics import *
+
+# Paddle direction codes used by the batch inputs (same values as the INPUT frame)
+UP = -1
+STILL = 0
+DOWN = 1
+
+# Batch direction code -> Paddle.moving
+DIRECTIONS = {UP: "up", STILL: "", DOWN: "down"}
+
+# What the ball reaches first in a sweep, in the order Simulation.sweepBall() prefers them on a tie
+NOTHING, TOP, BOTTOM, LEFT_PADDLE, LEFT_GOAL, RIGHT_PADDLE, RIGHT_GOAL = range(7)
+
+
+class BatchSimulation:
+    # N matches stored column-wise: one array per field, one element per match
+    def __init__(self, count: int, screenWidth: int = SCREEN_WIDTH, screenHeight: int = SCREEN_HEIGHT,
+                 tickRate: int = TICK_RATE) -> None:
+        self.count = count
+        self.screenWidth = screenWidth
+        self.screenHeight = screenHeight
+        self.tickRate = tickRate
+
+        # Fixed geometry, derived exactly like Simulation's rects
+        self.topWallBottom = 10
+        self.bottomWallTop = screenHeight - 10
+        self.leftPaddleX = 10
+        self.rightPaddleX = screenWidth - 20
+        self.ballStartX = int(screenWidth/2)
+        self.ballStartY = int(screenHeight/2)
+        self.paddleStartY = int((screenHeight/2)-(PADDLE_HEIGHT/2))
+        self.paddleSpeed = PADDLE_SPEED
+
+        self.ballX = np.full(count, self.ballStartX, dtype=np.int64)
+        self.ballY = np.full(count, self.ballStartY, dtype=np.int64)
+        self.xVel = np.full(count, -5, dtype=np.int64)
+        self.yVel = np.zeros(count, dtype=np.int64)
+        self.leftY = np.full(count, self.paddleStartY, dtype=np.int64)
+        self.rightY = np.full(count, self.paddleStartY, dtype=np.int64)
+        self.leftMove = np.zeros(count, dtype=np.int64)
+        self.rightMove = np.zeros(count, dtype=np.int64)
+        self.lScore = np.zeros(count, dtype=np.int64)
+        self.rScore = np.zeros(count, dtype=np.int64)
+        self.events = np.zeros(count, dtype=np.int64)
+        self.tick = 0
+
+    def setInputs(self, leftMove: np.ndarray, rightMove: np.ndarray) -> None:
+        # Paddle directions for the next step: UP, STILL or DOWN per match (scalars broadcast)
+        self.leftMove[:] = leftMove
+        self.rightMove[:] = rightMove
+
+    def trackBall(self, deadZone: int = 5) -> None:
+        # Simple scripted players for both sides: move toward the ball's height
+        ballCenter = self.ballY + BALL_SIZE // 2
+        for paddleY, move in ((self.leftY, self.leftMove), (self.rightY, self.rightMove)):
+            offset = ballCenter - (paddleY + PADDLE_HEIGHT // 2)
+            move[:] = np.where(offset > deadZone, DOWN, np.where(offset < -deadZone, UP, STILL))
+
+    def isOver(self) -> np.ndarray:
+        return (self.lScore >= WINNING_SCORE) | (self.rScore >= WINNING_SCORE)
+
+    def step(self) -> np.ndarray:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Advance every match by one tick
+        # Pre:              leftMove/rightMove hold the inputs for this tick
+        # Post:             Same effect as Simulation.step() on each match; returns the per-match
+        #                   EVENT_BOUNCE / EVENT_POINT mask (also kept in self.events)
+        events = self.events
+        events[:] = 0
+        self._sweepBall(~self.isOver())
+
+        # Paddle movement runs even after the game ends, once per frame, like the scalar version
+        for _ in range(frameSpan(self.tick, self.tickRate)):
+            for paddleY, move in ((self.leftY, self.leftMove), (self.rightY, self.rightMove)):
+                down = (move == DOWN) & (paddleY + PADDLE_HEIGHT < self.screenHeight - 10)
+                up = (move == UP) & (paddleY > 10)
+                paddleY += np.where(down, self.paddleSpeed, 0) - np.where(up, self.paddleSpeed, 0)
+
+        self.tick += 1
+        return events
+
+    def _sweepBall(self, active: np.ndarray) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Simulation.sweepBall() for every active match at once
+        # Pre:              active marks the matches still in play; events was cleared for this step
+        # Post:             Each active ball moved through the step's TICK_RATE/tickRate frames, bouncing and
+        #                   scoring exactly as the scalar sweep would. Each pass resolves the next collision of
+        #                   every match that still has one, working on those matches' indices only: most balls
+        #                   reach nothing in a step and drop out after the first pass
+        top = self.topWallBottom
+        bottom = self.bottomWallTop - BALL_SIZE
+        leftFace = self.leftPaddleX + PADDLE_WIDTH
+        rightFace = self.rightPaddleX - BALL_SIZE
+        goal = self.screenWidth - BALL_SIZE
+        # A ball that cannot reach a wall or a paddle face (or the goal line behind a paddle it has passed)
+        # this step just moves; only the rest go through the sweep
+        x, y, xVel, yVel = self.ballX, self.ballY, self.xVel, self.yVel
+        rate = self.tickRate
+        reach = (((yVel < 0) & ((y - top) * rate <= -yVel * TICK_RATE)) |
+                 ((yVel > 0) & ((bottom - y) * rate <= yVel * TICK_RATE)) |
+                 ((xVel < 0) & ((x - leftFace) * rate <= -xVel * TICK_RATE)) |
+                 ((xVel > 0) & ((rightFace - x) * rate <= xVel * TICK_RATE)))
+        free = active & ~reach
+        x[free] += xVel[free] * TICK_RATE // rate
+        y[free] += yVel[free] * TICK_RATE // rate
+        index = np.flatnonzero(active & reach)
+        remNum = np.full(len(index), TICK_RATE, dtype=np.int64)   # time left in this step, in frames
+        remDen = np.full(len(index), self.tickRate, dtype=np.int64)
+        for _ in range(MAX_BOUNCES):
+            if not len(index):
+                return
+            x, y = self.ballX[index], self.ballY[index]
+            xVel, yVel = self.xVel[index], self.yVel[index]
+            hitNum = np.zeros(len(index), dtype=np.int64)
+            hitDen = np.ones(len(index), dtype=np.int64)
+            what = np.full(len(index), NOTHING, dtype=np.int64)
+
+            def earlier(valid, num, den, kind, paddleY=None):
+                # Keep the earlier of the current hit and this collision, the current one on a tie
+                den = np.where(valid, den, 1)
+                if paddleY is not None:
+                    contact = y + yVel * num // den
+                    valid = valid & (contact < paddleY + PADDLE_HEIGHT) & (paddleY < contact + BALL_SIZE)
+                take = valid & ((what == NOTHING) | (num * hitDen < hitNum * den))
+                hitNum[take] = num[take]
+                hitDen[take] = den[take]
+                what[take] = kind
+
+            earlier(yVel < 0, np.maximum(y - top, 0), -yVel, TOP)
+            earlier(yVel > 0, np.maximum(bottom - y, 0), yVel, BOTTOM)
+            earlier((xVel < 0) & (x >= leftFace), x - leftFace, -xVel, LEFT_PADDLE, self.leftY[index])
+            earlier(xVel < 0, np.maximum(x, 0), -xVel, LEFT_GOAL)
+            earlier((xVel > 0) & (x <= rightFace), rightFace - x, xVel, RIGHT_PADDLE, self.rightY[index])
+            earlier(xVel > 0, np.maximum(goal - x, 0), xVel, RIGHT_GOAL)
+
+            # Nothing reached before the step ends: move the rest of the way and drop out
+            done = (what == NOTHING) | (hitNum * remDen > remNum * hitDen)
+            self.ballX[index[done]] = x[done] + xVel[done] * remNum[done] // remDen[done]
+            self.ballY[index[done]] = y[done] + yVel[done] * remNum[done] // remDen[done]
+            keep = ~done
+            index, x, y, xVel, yVel = index[keep], x[keep], y[keep], xVel[keep], yVel[keep]
+            hitNum, hitDen, what = hitNum[keep], hitDen[keep], what[keep]
+            remNum, remDen = remNum[keep], remDen[keep]
+
+            # Move to the collision and take its time off what is left
+            x += xVel * hitNum // hitDen
+            y += yVel * hitNum // hitDen
+            remNum, remDen = remNum * hitDen - hitNum * remDen, remDen * hitDen
+            divisor = np.maximum(np.gcd(remNum, remDen), 1)
+            remNum //= divisor
+            remDen //= divisor
+
+            for kind, wallY in ((TOP, top), (BOTTOM, bottom)):
+                hit = what == kind
+                y[hit] = wallY
+                yVel[hit] *= -1
+            for kind, paddleY, face in ((LEFT_PADDLE, self.leftY, leftFace), (RIGHT_PADDLE, self.rightY, rightFace)):
+                hit = what == kind
+                x[hit] = face
+                xVel[hit] *= -1
+                # Ball.hitPaddle: floor division of the center offset, same as Python's //
+                yVel[hit] = ((y[hit] + BALL_SIZE // 2) - (paddleY[index[hit]] + PADDLE_HEIGHT // 2)) // 2
+            self.ballX[index], self.ballY[index] = x, y
+            self.xVel[index], self.yVel[index] = xVel, yVel
+            scored = (what == LEFT_GOAL) | (what == RIGHT_GOAL)
+            self.events[index[~scored]] |= EVENT_BOUNCE
+            if scored.any():
+                # Left goal: the right player scores and the ball restarts toward them; right goal the other way
+                leftGoal = index[what == LEFT_GOAL]
+                rightGoal = index[what == RIGHT_GOAL]
+                self.rScore[leftGoal] += 1
+                self.lScore[rightGoal] += 1
+                self._resetBall(leftGoal, 5)
+                self._resetBall(rightGoal, -5)
+                self.events[index[scored]] |= EVENT_POINT
+                # The reset ball starts moving with the next whole frame; a won game stops
+                elapsedNum = TICK_RATE * remDen - remNum * self.tickRate
+                frame = -(-elapsedNum // (self.tickRate * remDen))
+                left = TICK_RATE - frame * self.tickRate
+                remNum = np.where(scored, left, remNum)
+                remDen = np.where(scored, self.tickRate, remDen)
+                keep = ~(scored & (self.isOver()[index] | (left <= 0)))
+                index, remNum, remDen = index[keep], remNum[keep], remDen[keep]
+
+    def _resetBall(self, matches: np.ndarray, xVel: int) -> None:
+        # Ball.reset() for the given matches (a mask or indices)
+        self.ballX[matches] = self.ballStartX
+        self.ballY[matches] = self.ballStartY
+        self.xVel[matches] = xVel
+        self.yVel[matches] = 0
+
+    def matchState(self, index: int) -> tuple:
+        # (leftY, rightY, ballX, ballY, xVel, yVel, lScore, rScore) of one match, for comparisons
+        return (int(self.leftY[index]), int(self.rightY[index]), int(self.ballX[index]), int(self.ballY[index]),
+                int(self.xVel[index]), int(self.yVel[index]), int(self.lScore[index]), int(self.rScore[index]))
+
+
+def scalarState(sim: Simulation) -> tuple:
+    # The matchState() tuple of a scalar Simulation
+    return (sim.leftPaddle.rect.y, sim.rightPaddle.rect.y, sim.ball.rect.x, sim.ball.rect.y,
+            sim.ball.xVel, sim.ball.yVel, sim.lScore, sim.rScore)
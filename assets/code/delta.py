@@ -0,0 +1,214 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Delta-compressed snapshots. The server keeps, per client, the last snapshot that
+#                           client acknowledged and sends only the fields that changed against it; the client
+#                           keeps the snapshots it received so it can rebuild the full state from a delta.
+# Misc:                     DELTA payload:  tick (uint16, low bits), baseline age in ticks (uint8),
+#                           changed mask (uint8), wide mask (uint8), then one value per changed field:
+#                           int8 difference from the baseline, or the raw int16 value when its wide bit is set.
+#                           Full SNAPSHOT frames act as keyframes: on the first tick, when the client asks
+#                           for a resync, or when its acknowledged baseline is too old to reference.
+# =================================================================================================
+
+import struct
+
+from assets.code.protocol import *
+
+# Snapshot fields after the tick, in SNAPSHOT order. Events is not state: it describes the tick
+# itself, so deltas compare it against 0 instead of against the baseline.
+FIELD_COUNT = 8
+EVENTS_FIELD = 6
+INPUT_ACK_FIELD = 7
+
+DELTA = struct.Struct("!HBBB")
+WIDE = struct.Struct("!h")
+NARROW = struct.Struct("!b")
+
+# Snapshots remembered per connection; a baseline older than this many ticks forces a keyframe
+MAX_BASELINE_AGE = 255
+
+# Clients acknowledge the newest snapshot they hold at least this often (in ticks), which keeps the
+# baseline recent enough for most field changes to fit in one byte
+ACK_INTERVAL = 4
+
+# A client whose input has not changed (and that has nothing to acknowledge) still sends an INPUT frame this
+# often, in seconds, so the server can tell an idle player from one that is gone
+INPUT_HEARTBEAT = 1.0
+
+TICK_MASK = 0xFFFF
+
+
+def unwrapTick(wireTick: int, nearTick: int) -> int:
+    # Expand the low 16 bits of a tick to the full tick closest to nearTick
+    diff = (wireTick - nearTick) & TICK_MASK
+    if diff >= 0x8000:
+        diff -= 0x10000
+    return nearTick + diff
+
+
+def encodeDelta(tick: int, baselineTick: int, baseline: tuple, fields: tuple,
+                version: int = PROTOCOL_VERSION) -> bytes:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Encode fields as a DELTA frame against baseline
+    # Pre:              0 < tick - baselineTick <= MAX_BASELINE_AGE; both tuples have FIELD_COUNT values
+    # Post:             Returns the frame; unchanged fields cost nothing, small changes one byte, others two
+    changed = 0
+    wide = 0
+    values = bytearray()
+    for index in range(FIELD_COUNT):
+        old = 0 if index == EVENTS_FIELD else baseline[index]
+        new = fields[index]
+        if new == old:
+            continue
+        changed |= 1 << index
+        diff = new - old
+        if -128 <= diff <= 127:
+            values += NARROW.pack(diff)
+        else:
+            wide |= 1 << index
+            values += WIDE.pack(new)
+    return encodeFrame(MSG_DELTA, DELTA.pack(tick & TICK_MASK, tick - baselineTick, changed, wide) + values,
+                       version)
+
+
+class DeltaEncoder:
+    # Server side, one per binary connection: remembers what was sent and which of it was acknowledged
+    def __init__(self) -> None:
+        self.sent = {}          # tick & TICK_MASK -> (tick, fields), oldest first
+        self.baseline = None    # (tick, fields) the client acknowledged, or None before the first ack
+
+    def ack(self, wireTick: int) -> None:
+        # The client holds this snapshot, so it can be used as the baseline from now on
+        entry = self.sent.get(wireTick)
+        if entry is None or (self.baseline is not None and entry[0] <= self.baseline[0]):
+            return
+        self.baseline = entry
+        # Older snapshots can never become the baseline again
+        while self.sent:
+            oldest = next(iter(self.sent))
+            if self.sent[oldest][0] >= entry[0]:
+                break
+            del self.sent[oldest]
+
+    def reset(self) -> None:
+        # The client lost track of its snapshots; the next frame will be a keyframe
+        self.sent.clear()
+        self.baseline = None
+
+    def encode(self, tick: int, fields: tuple, version: int = PROTOCOL_VERSION) -> bytes:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Encode this tick's snapshot for one client
+        # Pre:              tick increases between calls; fields is (leftY, rightY, ballX, ballY, lScore, rScore, events,
+        #                   inputAck)
+        # Post:             Returns a DELTA frame against the acknowledged baseline, or a full SNAPSHOT keyframe when
+        #                   there is no usable baseline; the snapshot is remembered so the client can ack it
+        if len(self.sent) > MAX_BASELINE_AGE:
+            del self.sent[next(iter(self.sent))]
+        self.sent[tick & TICK_MASK] = (tick, fields)
+
+        baseline = self.baseline
+        if baseline is None or tick - baseline[0] > MAX_BASELINE_AGE:
+            self.baseline = None
+            return encodeSnapshot(tick, *fields, version=version)
+        return encodeDelta(tick, baseline[0], baseline[1], fields, version)
+
+
+class SnapshotTracker:
+    # Client side: rebuilds full snapshots from SNAPSHOT keyframes and DELTA frames
+    def __init__(self) -> None:
+        self.history = {}       # tick & TICK_MASK -> (tick, fields), oldest first
+        self.latestTick = None
+        self.needsResync = False
+
+    def apply(self, msgType: int, payload: bytes) -> tuple[int, tuple] | None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Decode one SNAPSHOT or DELTA payload into (tick, fields)
+        # Pre:              msgType is MSG_SNAPSHOT or MSG_DELTA
+        # Post:             Returns (tick, fields) and remembers it as a possible baseline. Returns None and sets
+        #                   needsResync when a delta references a snapshot this client does not hold;
+        #                   the caller should then ask the server for a keyframe
+        if msgType == MSG_SNAPSHOT:
+            values = decodeSnapshot(payload)
+            tick, fields = values[0], tuple(values[1:])
+            self.needsResync = False
+        else:
+            wireTick, age, changed, wide = DELTA.unpack_from(payload)
+            if self.latestTick is None:
+                self.needsResync = True
+                return None
+            tick = unwrapTick(wireTick, self.latestTick)
+            baseline = self.history.get((tick - age) & TICK_MASK)
+            if baseline is None or baseline[0] != tick - age:
+                self.needsResync = True
+                return None
+            fields = list(baseline[1])
+            fields[EVENTS_FIELD] = 0
+            offset = DELTA.size
+            for index in range(FIELD_COUNT):
+                bit = 1 << index
+                if not changed & bit:
+                    continue
+                if wide & bit:
+                    (fields[index],) = WIDE.unpack_from(payload, offset)
+                    offset += WIDE.size
+                else:
+                    fields[index] += NARROW.unpack_from(payload, offset)[0]
+                    offset += NARROW.size
+            fields = tuple(fields)
+
+        if len(self.history) > MAX_BASELINE_AGE:
+            del self.history[next(iter(self.history))]
+        self.history[tick & TICK_MASK] = (tick, fields)
+        if self.latestTick is None or tick > self.latestTick:
+            self.latestTick = tick
+        return tick, fields
+
+
+class InputEncoder:
+    # Client side: delta-encodes the player's inputs. A frame goes out only when the paddle direction
+    # changed, when an acknowledgement is due, when the tracker needs a keyframe, or as a heartbeat after
+    # INPUT_HEARTBEAT seconds without any. With repeatMove every frame carries the direction, so on a lossy
+    # transport a lost change is repaired by the next ack. A changed view lag rides along on the next frame sent
+    # (every frame, with repeatMove)
+    def __init__(self, repeatMove: bool = False) -> None:
+        self.repeatMove = repeatMove
+        self.seq = 0
+        self.sentMoving = None
+        self.ackedTick = None
+        self.sentAt = None
+        self.sentViewLag = None
+
+    def encode(self, moving: str, tracker: SnapshotTracker, version: int = PROTOCOL_VERSION,
+               now: float | None = None, viewLag: int | None = None) -> bytes | None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Build the INPUT frame for this frame of the client loop, if one is needed
+        # Pre:              moving is the paddle's current movement state; tracker holds the received snapshots;
+        #                   now is the current time in seconds on any steady clock, or None for no heartbeat;
+        #                   viewLag is the player's view lag in ticks (assets/code/lagcomp.py), or None if unknown
+        # Post:             Returns an INPUT frame carrying only what changed, or None when there is nothing to send.
+        #                   A heartbeat repeats the direction
+        newMoving = moving if moving != self.sentMoving else None
+        ackTick = None
+        latest = tracker.latestTick
+        if latest is not None and not tracker.needsResync and (
+                self.ackedTick is None or latest - self.ackedTick >= ACK_INTERVAL):
+            ackTick = latest
+        heartbeat = now is not None and (self.sentAt is None or now - self.sentAt >= INPUT_HEARTBEAT)
+        if newMoving is None and ackTick is None and not tracker.needsResync and not heartbeat:
+            return None
+
+        self.seq += 1
+        self.sentAt = now
+        if newMoving is not None:
+            self.sentMoving = newMoving
+        elif self.repeatMove or heartbeat:
+            newMoving = moving
+        if ackTick is not None:
+            self.ackedTick = ackTick
+        if viewLag is not None and (self.repeatMove or viewLag != self.sentViewLag):
+            self.sentViewLag = viewLag
+        else:
+            viewLag = None
+        return encodeInput(self.seq, newMoving, ackTick, tracker.needsResync, version, viewLag)
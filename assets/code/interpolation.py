@@ -0,0 +1,200 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Client-side smoothing for the binary protocol. SnapshotBuffer keeps the snapshots
+#                           the server pushed, placed on the server's tick timeline, and draws the ball and the
+#                           opponent's paddle a short, fixed delay in the past by interpolating between the two
+#                           snapshots around that moment. PaddlePredictor moves the player's own paddle as soon
+#                           as a key is pressed and reconciles it with the server's position afterwards.
+#                           FixedTimestep turns the time between rendered frames into a whole number of fixed
+#                           simulation steps, so whatever the client simulates itself runs at the same speed at
+#                           any frame rate, and says how far into the next step a frame is drawn.
+# Misc:                     The delay trades latency for smoothness: a snapshot that arrives late or a tick the
+#                           server skipped is hidden as long as the next snapshot arrives within the delay.
+# =================================================================================================
+
+from collections import deque
+
+from assets.code.delta import *
+from assets.code.physics import *
+from assets.code.protocol import *
+
+# Default render delay behind the newest server state, in seconds (three ticks at 60 Hz)
+INTERP_DELAY = 0.05
+
+# The delay stretches to cover the gap between snapshots when the server sends less often than every tick
+# (its adaptive send rate), with this much margin in ticks, and relaxes back by CLOCK_DRIFT per snapshot
+GAP_MARGIN_TICKS = 1
+
+# Snapshots kept for interpolation; far more than the delay needs, so bursts after a stall fit
+MAX_BUFFERED = 64
+
+# The server clock estimate follows the fastest snapshot delivery seen, and creeps toward slower ones
+# by this fraction per snapshot so it adapts when the network latency grows
+CLOCK_DRIFT = 0.01
+
+# The predicted paddle jumps to the server's position when further away than this, and slides otherwise
+SNAP_DISTANCE = PADDLE_HEIGHT
+
+# Most steps a FixedTimestep runs to catch up after a slow frame; time beyond that is dropped, so a frame that
+# stalled for seconds slows the game down for a moment instead of fast-forwarding it
+MAX_CATCHUP_STEPS = 5
+
+
+class SnapshotBuffer:
+    # Timestamped snapshot buffer. Snapshots are placed in time by their server tick, not by when they
+    # happened to arrive, so network jitter does not show up as uneven motion.
+    def __init__(self, tickRate: int = TICK_RATE, delay: float = INTERP_DELAY) -> None:
+        self.tickInterval = 1.0 / tickRate
+        self.baseDelay = delay
+        self.delay = delay
+        self.snapshots = deque(maxlen=MAX_BUFFERED)     # (tick, fields), ascending tick
+        self.offset = None      # local time of server tick 0, estimated from arrivals
+        self.playedTick = None  # newest tick whose events were already returned by sample()
+        self.renderTick = None  # server tick (fractional) drawn by the last sample(), for the view lag
+
+    def add(self, tick: int, fields: tuple, arrivedAt: float) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Buffer one snapshot received at local time arrivedAt
+        # Pre:              fields is the full snapshot (see delta.SnapshotTracker); arrivedAt uses the same
+        #                   clock as the now passed to sample()
+        # Post:             The snapshot is buffered unless it is older than the newest one, and the estimate of
+        #                   the server's tick timeline and the render delay are updated
+        if self.snapshots:
+            if tick <= self.snapshots[-1][0]:
+                return
+            needed = max(self.baseDelay, (tick - self.snapshots[-1][0] + GAP_MARGIN_TICKS) * self.tickInterval)
+            self.delay = needed if needed > self.delay else self.delay + (needed - self.delay) * CLOCK_DRIFT
+        self.snapshots.append((tick, fields))
+        offset = arrivedAt - tick * self.tickInterval
+        if self.offset is None or offset < self.offset:
+            self.offset = offset
+        else:
+            self.offset += (offset - self.offset) * CLOCK_DRIFT
+
+    def sample(self, now: float) -> tuple[tuple, int] | None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Get the state to draw at local time now
+        # Pre:              now is on the same clock as the arrival times given to add()
+        # Post:             Returns (fields, events) or None before the first snapshot. Positions in fields are
+        #                   interpolated (floats) between the snapshots around now - delay and held at the newest
+        #                   one when the buffer runs dry; scores come from the older snapshot. events ORs the
+        #                   events of every snapshot the render time passed since the last call, so sounds play
+        #                   when the bounce or point is drawn
+        snapshots = self.snapshots
+        if not snapshots:
+            return None
+        renderTick = (now - self.offset - self.delay) / self.tickInterval
+        self.renderTick = min(renderTick, snapshots[-1][0])
+
+        events = 0
+        playUntil = min(int(renderTick), snapshots[-1][0])
+        for tick, fields in snapshots:
+            if tick > playUntil:
+                break
+            if self.playedTick is not None and tick > self.playedTick:
+                events |= fields[EVENTS_FIELD]
+        if self.playedTick is None or playUntil > self.playedTick:
+            self.playedTick = playUntil
+
+        # Keep one snapshot at or before the render time as the start of the interpolation
+        while len(snapshots) > 1 and snapshots[1][0] <= renderTick:
+            snapshots.popleft()
+
+        olderTick, older = snapshots[0]
+        if len(snapshots) == 1 or renderTick <= olderTick:
+            return older, events
+        newerTick, newer = snapshots[1]
+        fraction = (renderTick - olderTick) / (newerTick - olderTick)
+
+        leftY = older[0] + (newer[0] - older[0]) * fraction
+        rightY = older[1] + (newer[1] - older[1]) * fraction
+        if newer[EVENTS_FIELD] & EVENT_POINT:
+            # The ball was reset to the center; sliding it there across the field would look like play
+            ballX, ballY = older[2], older[3]
+        else:
+            ballX = older[2] + (newer[2] - older[2]) * fraction
+            ballY = older[3] + (newer[3] - older[3]) * fraction
+        return (leftY, rightY, ballX, ballY) + older[4:], events
+
+
+class FixedTimestep:
+    # Accumulator for a simulation stepped at a fixed rate under a render loop running at any rate. Each frame
+    # adds the time since the previous one and takes out as many whole steps as fit; the rest carries over, and
+    # alpha() is that rest as a fraction of a step, for drawing between the states before and after the last step
+    def __init__(self, rate: int = TICK_RATE, maxSteps: int = MAX_CATCHUP_STEPS) -> None:
+        self.interval = 1.0 / rate
+        self.maxSteps = maxSteps
+        self.lastTime = None
+        self.accumulated = 0.0
+        self.dropped = 0    # steps given up because a frame came later than maxSteps steps
+
+    def advance(self, now: float) -> int:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Count the steps due at local time now
+        # Pre:              now is on the same clock on every call (the first call only starts the clock)
+        # Post:             Returns the steps to run this frame, at most maxSteps; time owed beyond that is dropped
+        #                   and counted in dropped
+        if self.lastTime is not None:
+            self.accumulated += now - self.lastTime
+        self.lastTime = now
+        steps = int(self.accumulated / self.interval)
+        self.accumulated = max(0.0, self.accumulated - steps * self.interval)
+        if steps > self.maxSteps:
+            self.dropped += steps - self.maxSteps
+            steps = self.maxSteps
+        return steps
+
+    def alpha(self) -> float:
+        # How far the frame is into the next step, 0 to 1
+        return min(1.0, self.accumulated / self.interval)
+
+
+def blend(previous: int, current: int, alpha: float) -> int:
+    # Where to draw something that moved from previous to current in the last step, alpha into the next one
+    return round(previous + (current - previous) * alpha)
+
+
+class PaddlePredictor:
+    # Client-side prediction for the player's own paddle. The paddle moves locally one step per frame of the
+    # 60 FPS game, as on the server at any tick rate, as soon as a key is pressed; once the server has applied
+    # every input the client sent and the paddle is at rest, both ends must agree, so the local paddle is pulled
+    # to the server's position.
+    def __init__(self, paddle: Paddle, screenHeight: int) -> None:
+        self.paddle = paddle
+        self.screenHeight = screenHeight
+        self.timestep = FixedTimestep(TICK_RATE)
+        self.previousY = paddle.rect.y     # paddle position before the last step, for drawnY()
+
+    def predict(self, now: float) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Move the paddle by the frames that elapsed since the last call
+        # Pre:              paddle.moving holds the player's current input
+        # Post:             The paddle moved like Simulation.step() would have moved it over that time, by
+        #                   MAX_CATCHUP_STEPS frames at most
+        for _ in range(self.timestep.advance(now)):
+            self.previousY = self.paddle.rect.y
+            movePaddle(self.paddle, self.screenHeight)
+
+    def drawnY(self) -> int:
+        # The paddle's position between its last two steps, for frames drawn faster than the steps
+        return blend(self.previousY, self.paddle.rect.y, self.timestep.alpha())
+
+    def reconcile(self, serverY: int, inputAck: int, inputs: InputEncoder) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Correct the predicted paddle with the server's authoritative position
+        # Pre:              serverY and inputAck come from the newest snapshot; inputs sent this client's INPUTs
+        # Post:             While the server has not applied our newest input, or the paddle is moving (the server
+        #                   applied our key presses a little later than we did), the prediction stands. Otherwise
+        #                   the paddle moves toward serverY, snapping when the error is large
+        if inputAck != inputs.seq & INPUT_SEQ_MASK or inputs.sentMoving or self.paddle.moving:
+            return
+        error = serverY - self.paddle.rect.y
+        if abs(error) > SNAP_DISTANCE:
+            self.paddle.rect.y = serverY
+        elif error:
+            # Close half the gap per frame so small corrections are not visible as a jump
+            step = max(1, abs(error) // 2)
+            self.paddle.rect.y += step if error > 0 else -step
+        self.previousY = self.paddle.rect.y
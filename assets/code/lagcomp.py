@@ -0,0 +1,162 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Lag compensation for paddle hits. ClockSync (client) estimates the server's tick
+#                           clock and the round trip from PING/PONG exchanges, NTP style, which gives the
+#                           player's view lag: how many ticks pass on the server between the tick whose ball the
+#                           player is looking at and the tick at which the player's reaction to it moves the
+#                           server's paddle. LagCompensator (server) steps a match keeping a short ring buffer of
+#                           its states, paddle positions included, and judges every ball that got past a paddle
+#                           again once that player's view lag has passed: if the paddle, where the player had it
+#                           when the ball reached it on their screen, covers the ball, the match is rewound to
+#                           that tick and replayed with the hit.
+# Misc:                     A player's paddle is predicted on their screen, so it leads the server's paddle by
+#                           the uplink latency, while the ball they see trails the server by the downlink latency
+#                           and the interpolation delay. The paddle the player saw meet the ball at tick T is
+#                           therefore the server's paddle at T + viewLag. Each side is judged with its own view
+#                           lag, so nobody else waits for the slowest player; only a miss is judged late, and
+#                           replaying it can take back a point the other side was briefly shown.
+# =================================================================================================
+
+from collections import deque
+
+from assets.code.physics import *
+
+# Seconds between the PINGs a player sends to keep its ClockSync current
+SYNC_INTERVAL = 0.5
+
+# Samples ClockSync keeps; the one with the shortest round trip is the least distorted by queueing
+SYNC_SAMPLES = 8
+
+# Seconds of view lag compensated at most: 150 ms of round trip plus the client's interpolation delay.
+# A longer lag is treated as this long, so a very slow link cannot rewind the match arbitrarily far
+LAG_COMP_LIMIT = 0.25
+
+
+class ClockSync:
+    # Client side. Each PONG carries the server's tick clock (ticks, with the fraction of the current one) at the
+    # moment it answered; with the PING's send and the PONG's arrival time it gives one NTP-style sample
+    def __init__(self, tickRate: int = TICK_RATE) -> None:
+        self.tickRate = tickRate
+        # (rtt, offset) per exchange; offset is server ticks minus local seconds * tickRate
+        self.samples = deque(maxlen=SYNC_SAMPLES)
+        self.rtt = None
+        self.offset = None
+
+    def observe(self, sentAt: float, receivedAt: float, serverTick: float) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Take in one PING/PONG exchange
+        # Pre:              sentAt and receivedAt are local times (seconds) of the PING and its PONG; serverTick
+        #                   is the server's tick clock from the PONG
+        # Post:             rtt and offset follow the sample with the shortest round trip among the latest
+        #                   SYNC_SAMPLES. The server is assumed to have answered halfway through the round trip
+        rtt = receivedAt - sentAt
+        self.samples.append((rtt, serverTick - (sentAt + receivedAt) / 2 * self.tickRate))
+        self.rtt, self.offset = min(self.samples)
+
+    def serverTick(self, now: float) -> float | None:
+        # The server's tick clock at local time now, or None before the first sample
+        return None if self.offset is None else now * self.tickRate + self.offset
+
+    def viewLag(self, renderTick: float, now: float) -> int | None:
+        # Ticks from the server tick drawn at local time now (renderTick) to the server tick an input sent now
+        # is applied at: the downlink and interpolation delay behind, plus the uplink ahead
+        if self.offset is None:
+            return None
+        return max(0, round(self.serverTick(now) + self.rtt / 2 * self.tickRate - renderTick))
+
+
+class LagCompensator:
+    # Server side, one per match. step() replaces Simulation.step() and remembers, for each of the last few
+    # ticks, the match state before it and the paddle directions it ran with; misses holds the balls that got
+    # past a paddle as (side, tick), until that side's view lag has passed
+    def __init__(self, sim: Simulation) -> None:
+        self.sim = sim
+        self.limit = max(1, round(LAG_COMP_LIMIT * sim.tickRate))
+        self.history = deque(maxlen=self.limit + 1)     # (state before the tick, leftMoving, rightMoving)
+        self.misses = deque()
+        self.rewinds = 0    # misses turned into hits
+
+    def step(self, lags: dict) -> int:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Advance the match one tick, then judge the misses whose player has now reacted
+        # Pre:              The paddles' movement states hold the latest inputs; lags maps "left"/"right" to that
+        #                   player's view lag in ticks (0 turns compensation off for that side)
+        # Post:             Returns the tick's EVENT_* mask. A miss whose player, lags[side] ticks later, had the
+        #                   paddle where the ball crossed is replayed as a hit from its tick on: ball, scores and
+        #                   events change, the paddles stay where they are, and EVENT_BOUNCE is added
+        sim = self.sim
+        before = sim.snapshot()
+        self.history.append((before, sim.leftPaddle.moving, sim.rightPaddle.moving))
+        events = sim.step()
+        side = self._missed(before)
+        if side is not None:
+            self.misses.append((side, before[0]))
+
+        while self.misses:
+            side, tick = self.misses[0]
+            lag = min(lags.get(side, 0), self.limit)
+            if tick + lag > sim.tick:
+                break   # still waiting to see where this player put the paddle
+            self.misses.popleft()
+            if lag > 0 and self._rewind(side, tick, tick + lag):
+                events |= EVENT_BOUNCE
+                self.rewinds += 1
+        return events
+
+    def _missed(self, before: tuple) -> str | None:
+        # The side whose paddle the ball got past during the tick that started from state before, if any
+        tick, lScore, rScore, x, y, xVel, yVel, leftY, rightY = before
+        ball = self.sim.ball
+        if xVel < 0 and x >= self.sim.leftPaddle.rect.right:
+            if self.sim.rScore > rScore or (ball.xVel < 0 and ball.rect.x < self.sim.leftPaddle.rect.right):
+                return "left"
+        elif xVel > 0 and x <= self.sim.rightPaddle.rect.left - BALL_SIZE:
+            if self.sim.lScore > lScore or (ball.xVel > 0 and ball.rect.x > self.sim.rightPaddle.rect.left - BALL_SIZE):
+                return "right"
+        return None
+
+    def _rewind(self, side: str, tick: int, seenTick: int) -> bool:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Replay the match from tick with side's paddle where the player had it at seenTick
+        # Pre:              tick is a miss by side still in history; tick < seenTick <= sim.tick
+        # Post:             Returns True when the paddle there hits the ball: the ticks from tick on were simulated
+        #                   again (history updated) with each paddle where it really was, and the match is at the
+        #                   same tick with the ball where the hit sends it. Returns False, changing nothing, otherwise
+        sim = self.sim
+        start = sim.tick - len(self.history)
+        if tick < start:
+            return False
+        now = sim.snapshot()
+        moving = (sim.leftPaddle.moving, sim.rightPaddle.moving)
+        paddle = sim.leftPaddle if side == "left" else sim.rightPaddle
+        seenY = now[7 if side == "left" else 8] if seenTick == sim.tick else \
+            self.history[seenTick - start][0][7 if side == "left" else 8]
+
+        entries = list(self.history)[tick - start:]
+        state, leftMoving, rightMoving = entries[0]
+        sim.restore(state)
+        paddle.rect.y = seenY
+        xVel = sim.ball.xVel
+        sim.leftPaddle.moving, sim.rightPaddle.moving = leftMoving, rightMoving
+        sim.step()
+        if sim.ball.xVel == xVel or sim.lScore != state[1] or sim.rScore != state[2]:
+            # Not even the player's paddle reached the ball: the miss stands
+            sim.restore(now)
+            sim.leftPaddle.moving, sim.rightPaddle.moving = moving
+            return False
+
+        # The hit stands; replay the rest with the paddles where they were, and keep the new states
+        for index in range(1, len(entries)):
+            state, leftMoving, rightMoving = entries[index]
+            replayed = sim.snapshot()[:7] + state[7:]
+            sim.restore(replayed)
+            self.history[tick - start + index] = (replayed, leftMoving, rightMoving)
+            sim.leftPaddle.moving, sim.rightPaddle.moving = leftMoving, rightMoving
+            sim.step()
+        sim.leftPaddle.rect.y, sim.rightPaddle.rect.y = now[7], now[8]
+        sim.leftPaddle.moving, sim.rightPaddle.moving = moving
+        # Balls that got past after the rewound tick were judged against the old ball
+        self.misses.clear()
+        return True
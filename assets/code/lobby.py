@@ -0,0 +1,216 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Matchmaking lobby. Players wait in a queue per region, sorted by rating, and are
+#                           paired with the closest rating available; the rating gap a player accepts grows
+#                           the longer they wait, so nobody waits forever for a perfect match.
+# Misc:                     Only neighbours in rating order can be the closest match, so for every adjacent pair
+#                           the lobby computes the moment the pair becomes acceptable (the gap fits the window
+#                           of the player who has waited longer) and keeps those moments in a heap. Each queue
+#                           is a SortedKeys, a sorted list cut into blocks of at most 2 * BLOCK_SIZE keys, so
+#                           joining and leaving cost two bisects and a shift within one block, not of the whole
+#                           queue, plus a few heap operations; widening the windows over time costs nothing until
+#                           a pair actually comes due: there is no sweep over the queue. Pairs whose players have
+#                           left are dropped lazily when they surface.
+# =================================================================================================
+
+import heapq
+import itertools
+from bisect import bisect_left
+
+# Rating of a player whose client does not send one (CSV clients, older binary clients)
+DEFAULT_RATING = 1500
+DEFAULT_REGION = 0
+
+# Rating gap accepted right away, and how much it widens per second of waiting
+BASE_RATING_GAP = 100
+RATING_GAP_GROWTH = 50
+
+# The heap is rebuilt from the queues once it holds this many times more pairs than there are players,
+# so pairs left behind by players who quit cannot pile up
+MAX_STALE_FACTOR = 4
+
+# Keys per SortedKeys block: a block is split beyond twice this and merged into its neighbour below a quarter
+BLOCK_SIZE = 512
+
+
+class SortedKeys:
+    # A sorted list of distinct keys in blocks (sorted lists of their own) with the last key of each in maxes.
+    # A key's block is found by bisecting maxes and its place by bisecting the block, so an insert or removal
+    # shifts at most 2 * BLOCK_SIZE keys; only a split or merge shifts maxes, one entry per block
+    def __init__(self) -> None:
+        self.blocks = []
+        self.maxes = []
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        for block in self.blocks:
+            yield from block
+
+    def insert(self, key) -> tuple:
+        # Add key; returns (the key before it, the key after it), None where there is none
+        self.size += 1
+        blocks, maxes = self.blocks, self.maxes
+        if not blocks:
+            blocks.append([key])
+            maxes.append(key)
+            return None, None
+        b = min(bisect_left(maxes, key), len(blocks) - 1)
+        block = blocks[b]
+        i = bisect_left(block, key)
+        block.insert(i, key)
+        maxes[b] = block[-1]
+        before = block[i - 1] if i > 0 else blocks[b - 1][-1] if b > 0 else None
+        after = block[i + 1] if i + 1 < len(block) else blocks[b + 1][0] if b + 1 < len(blocks) else None
+        if len(block) > 2 * BLOCK_SIZE:
+            blocks[b:b + 1] = [block[:BLOCK_SIZE], block[BLOCK_SIZE:]]
+            maxes[b:b + 1] = [block[BLOCK_SIZE - 1], block[-1]]
+        return before, after
+
+    def remove(self, key) -> tuple:
+        # Take out key, which must be present; returns the keys that were around it, now neighbours
+        self.size -= 1
+        blocks, maxes = self.blocks, self.maxes
+        b = bisect_left(maxes, key)
+        block = blocks[b]
+        i = bisect_left(block, key)
+        del block[i]
+        before = block[i - 1] if i > 0 else blocks[b - 1][-1] if b > 0 else None
+        after = block[i] if i < len(block) else blocks[b + 1][0] if b + 1 < len(blocks) else None
+        if not block:
+            del blocks[b]
+            del maxes[b]
+        else:
+            maxes[b] = block[-1]
+            if len(block) < BLOCK_SIZE // 4 and b + 1 < len(blocks):
+                # Fold a small block into the next one (splitting again if that makes it too big)
+                merged = block + blocks[b + 1]
+                blocks[b:b + 2] = [merged]
+                maxes[b:b + 2] = [merged[-1]]
+                if len(merged) > 2 * BLOCK_SIZE:
+                    blocks[b:b + 1] = [merged[:BLOCK_SIZE], merged[BLOCK_SIZE:]]
+                    maxes[b:b + 1] = [merged[BLOCK_SIZE - 1], merged[-1]]
+        return before, after
+
+
+class LobbyEntry:
+    __slots__ = ("player", "rating", "region", "since", "seq", "host")
+
+    def __init__(self, player, rating: int, region: int, since: float, seq: int, host: bool) -> None:
+        self.player = player
+        self.rating = rating
+        self.region = region
+        self.since = since      # when the player joined the queue
+        self.seq = seq          # join order; breaks rating ties in the sorted queue
+        self.host = host        # already holds a match (their opponent left); two hosts are never paired
+
+
+class Lobby:
+    # Waiting players by region. Each region's queue is a SortedKeys of (rating, seq);
+    # candidates is the heap of (due, seq, seq) for neighbouring players in those queues.
+    def __init__(self, baseGap: int = BASE_RATING_GAP, gapGrowth: float = RATING_GAP_GROWTH) -> None:
+        self.baseGap = baseGap
+        self.gapGrowth = gapGrowth
+        self.players = {}       # player -> LobbyEntry
+        self.bySeq = {}         # seq -> LobbyEntry
+        self.queues = {}        # region -> SortedKeys of (rating, seq)
+        self.candidates = []
+        self._seqs = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def __contains__(self, player) -> bool:
+        return player in self.players
+
+    def window(self, waited: float) -> float:
+        # Largest rating gap accepted after waiting `waited` seconds
+        return self.baseGap + self.gapGrowth * waited
+
+    def join(self, player, rating: int, region: int, now: float, host: bool = False) -> list:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Queue a player
+        # Pre:              player is not queued; now is a time.monotonic() reading
+        # Post:             The player waits in its region's queue. Returns the pairs that can be made right
+        #                   away, as for poll(); usually the new player and its closest acceptable neighbour
+        entry = LobbyEntry(player, rating, region, now, next(self._seqs), host)
+        self.players[player] = entry
+        self.bySeq[entry.seq] = entry
+        queue = self.queues.get(region)
+        if queue is None:
+            queue = self.queues[region] = SortedKeys()
+        before, after = queue.insert((rating, entry.seq))
+        if before is not None:
+            self._candidate(self.bySeq[before[1]], entry)
+        if after is not None:
+            self._candidate(entry, self.bySeq[after[1]])
+        return self.poll(now)
+
+    def leave(self, player) -> bool:
+        # Take a player out of the queue (disconnected, or paired); returns False if it was not queued
+        entry = self.players.pop(player, None)
+        if entry is None:
+            return False
+        del self.bySeq[entry.seq]
+        queue = self.queues[entry.region]
+        before, after = queue.remove((entry.rating, entry.seq))
+        if not queue:
+            del self.queues[entry.region]
+        elif before is not None and after is not None:
+            # Its two neighbours are neighbours now
+            self._candidate(self.bySeq[before[1]], self.bySeq[after[1]])
+        return True
+
+    def poll(self, now: float) -> list:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Make every pair that has become acceptable
+        # Pre:              now is a time.monotonic() reading, not earlier than the previous call's
+        # Post:             Returns [(first, second), ...]: paired players, taken out of the queue, first being
+        #                   the one who waited longer. Pairs come out in the order they became acceptable
+        pairs = []
+        candidates = self.candidates
+        while candidates and candidates[0][0] <= now:
+            due, firstSeq, secondSeq = heapq.heappop(candidates)
+            first = self.bySeq.get(firstSeq)
+            second = self.bySeq.get(secondSeq)
+            if first is None or second is None:
+                continue    # one of them was paired or left since
+            if second.since < first.since:
+                first, second = second, first
+            self.leave(first.player)
+            self.leave(second.player)
+            pairs.append((first.player, second.player))
+        if len(candidates) > MAX_STALE_FACTOR * len(self.players) + 64:
+            self._rebuild()
+        return pairs
+
+    def nextDue(self) -> float | None:
+        # When poll() may next have a pair to make (possibly a stale one), or None with nothing queued
+        return self.candidates[0][0] if self.candidates else None
+
+    def _candidate(self, first: LobbyEntry, second: LobbyEntry) -> None:
+        # Schedule a pair of neighbours for the moment its gap fits the longer waiter's window
+        if first.host and second.host:
+            return
+        gap = abs(first.rating - second.rating)
+        since = min(first.since, second.since)
+        if gap <= self.baseGap:
+            due = since
+        elif self.gapGrowth > 0:
+            due = since + (gap - self.baseGap) / self.gapGrowth
+        else:
+            return
+        heapq.heappush(self.candidates, (due, first.seq, second.seq))
+
+    def _rebuild(self) -> None:
+        self.candidates = []
+        for queue in self.queues.values():
+            previous = None
+            for key in queue:
+                if previous is not None:
+                    self._candidate(self.bySeq[previous[1]], self.bySeq[key[1]])
+                previous = key
@@ -0,0 +1,202 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Server instrumentation: tick timing, event handler latency, per-connection traffic,
+#                           malformed messages, snapshot lag (sync gap) and round-trip time. ServerMetrics
+#                           renders everything in the Prometheus text format for pongServer's --metrics-port
+#                           endpoint and as a one-line summary for the periodic log.
+# Misc:                     Histograms have fixed buckets allocated up front, so recording a sample is a
+#                           bisect and two additions; counters are plain attributes. Everything is updated
+#                           from the server's event loop only, so nothing here needs a lock.
+# =================================================================================================
+
+from bisect import bisect_left
+
+# Upper bounds, in seconds, for the timing histograms (tick duration, tick lateness, handler latency, RTT)
+TIME_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Upper bounds, in ticks, for the sync gap histogram
+TICK_BUCKETS = (0, 1, 2, 3, 4, 6, 8, 12, 16, 32, 64, 128, 255)
+
+# Weight of a new RTT sample in a connection's smoothed RTT (the same smoothing TCP uses)
+RTT_SMOOTHING = 0.125
+
+# Counters kept per connection, in the order they are exported
+CONNECTION_COUNTERS = (
+    ("bytesIn", "pong_connection_bytes_received_total", "Bytes received from the client"),
+    ("bytesOut", "pong_connection_bytes_sent_total", "Bytes queued for the client"),
+    ("messagesIn", "pong_connection_messages_received_total", "Frames or CSV messages received from the client"),
+    ("messagesOut", "pong_connection_messages_sent_total", "Sends queued for the client"),
+    ("malformed", "pong_connection_malformed_total", "Messages from the client that were dropped as malformed"),
+)
+
+
+class Histogram:
+    # Cumulative-bucket histogram in the Prometheus style; counts[i] holds samples <= bounds[i] and
+    # above the bound before it, with one overflow bucket at the end
+    def __init__(self, name: str, help: str, bounds: tuple) -> None:
+        self.name = name
+        self.help = help
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, fraction: float) -> float:
+        # Upper bound of the bucket holding the given quantile (the largest bound for the overflow bucket),
+        # or 0.0 without samples
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.bounds[min(index, len(self.bounds) - 1)]
+        return self.bounds[-1]
+
+    def render(self, lines: list) -> None:
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} histogram")
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bound:g}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{self.name}_sum {self.total:.6f}")
+        lines.append(f"{self.name}_count {self.count}")
+
+
+class ConnectionStats:
+    # Traffic and latency of one client connection. The server updates the counters directly; the
+    # observe methods also feed the server-wide histograms
+    __slots__ = ("metrics", "bytesIn", "bytesOut", "messagesIn", "messagesOut", "malformed", "syncGap", "rtt",
+                 "syncGapSum", "syncGapSamples")
+
+    def __init__(self, metrics: "ServerMetrics") -> None:
+        self.metrics = metrics
+        self.bytesIn = 0
+        self.bytesOut = 0
+        self.messagesIn = 0
+        self.messagesOut = 0
+        self.malformed = 0
+        self.syncGap = 0    # server tick minus the newest tick the client has shown it holds
+        self.rtt = None     # smoothed RTT estimate in seconds, None until the first sample
+        self.syncGapSum = 0     # every sync gap sampled, for the connection's mean (its drift over a game)
+        self.syncGapSamples = 0
+
+    def observeRtt(self, sample: float) -> None:
+        self.rtt = sample if self.rtt is None else self.rtt + (sample - self.rtt) * RTT_SMOOTHING
+        self.metrics.rtt.observe(sample)
+
+    def observeSyncGap(self, gap: int) -> None:
+        self.syncGap = gap
+        self.syncGapSum += gap
+        self.syncGapSamples += 1
+        self.metrics.syncGap.observe(gap)
+
+    def meanSyncGap(self) -> float | None:
+        # Mean of every sync gap sampled, None before the first
+        return self.syncGapSum / self.syncGapSamples if self.syncGapSamples else None
+
+
+class ServerMetrics:
+    # Every metric of one server process. Counters of closed connections are folded into `closed` so
+    # the server-wide totals keep growing after clients leave, as Prometheus counters must
+    def __init__(self) -> None:
+        self.tick = Histogram("pong_tick_seconds", "Time spent advancing every match by one tick", TIME_BUCKETS)
+        self.tickLateness = Histogram("pong_tick_lateness_seconds",
+                                      "How long after its scheduled time a tick started", TIME_BUCKETS)
+        self.handler = Histogram("pong_handler_seconds",
+                                 "Time spent serving the sockets one event loop iteration found ready",
+                                 TIME_BUCKETS)
+        self.rtt = Histogram("pong_rtt_seconds",
+                             "Time from sending a snapshot to the client acknowledging it", TIME_BUCKETS)
+        self.syncGap = Histogram("pong_sync_gap_ticks",
+                                 "Server tick minus the newest tick a client acknowledged", TICK_BUCKETS)
+        self.ticks = 0
+        self.ticksSkipped = 0
+        self.connections = 0     # clients seated, counted by the server
+        self.lagRewinds = 0      # misses replayed as hits by lag compensation (assets/code/lagcomp.py)
+        self.closed = ConnectionStats(self)
+        self.lastSummary = None     # (time, totals) at the previous summary()
+
+    def retire(self, stats: ConnectionStats) -> None:
+        # A connection closed; keep its counters in the totals
+        for attribute, name, help in CONNECTION_COUNTERS:
+            setattr(self.closed, attribute, getattr(self.closed, attribute) + getattr(stats, attribute))
+
+    def totals(self, live: list) -> dict:
+        # Server-wide counters: closed connections plus the live ones, live being [(labels, stats), ...]
+        totals = {}
+        for attribute, name, help in CONNECTION_COUNTERS:
+            totals[attribute] = getattr(self.closed, attribute) + sum(getattr(stats, attribute)
+                                                                      for labels, stats in live)
+        return totals
+
+    def render(self, live: list) -> str:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Export every metric in the Prometheus text format
+        # Pre:              live is [(labels, stats), ...] for the open connections, labels a preformatted
+        #                   label string such as 'addr="127.0.0.1:50000",match="1",side="left"'
+        # Post:             Returns the exposition text, ending with a newline
+        lines = []
+        for histogram in (self.tick, self.tickLateness, self.handler, self.rtt, self.syncGap):
+            histogram.render(lines)
+        lines += ["# HELP pong_ticks_total Match ticks run", "# TYPE pong_ticks_total counter",
+                  f"pong_ticks_total {self.ticks}",
+                  "# HELP pong_ticks_skipped_total Ticks dropped because the loop fell too far behind",
+                  "# TYPE pong_ticks_skipped_total counter", f"pong_ticks_skipped_total {self.ticksSkipped}",
+                  "# HELP pong_connections_total Clients seated (players and spectators)",
+                  "# TYPE pong_connections_total counter",
+                  f"pong_connections_total {self.connections}",
+                  "# HELP pong_lag_rewinds_total Misses replayed as hits by lag compensation",
+                  "# TYPE pong_lag_rewinds_total counter", f"pong_lag_rewinds_total {self.lagRewinds}",
+                  "# HELP pong_connections Connections open", "# TYPE pong_connections gauge",
+                  f"pong_connections {len(live)}"]
+
+        totals = self.totals(live)
+        for attribute, name, help in CONNECTION_COUNTERS:
+            total = name.replace("pong_connection_", "pong_")
+            lines += [f"# HELP {total} {help}, all connections", f"# TYPE {total} counter",
+                      f"{total} {totals[attribute]}"]
+        for attribute, name, help in CONNECTION_COUNTERS:
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} counter"]
+            lines += [f"{name}{{{labels}}} {getattr(stats, attribute)}" for labels, stats in live]
+        lines += ["# HELP pong_connection_sync_gap_ticks Newest sync gap of the connection",
+                  "# TYPE pong_connection_sync_gap_ticks gauge"]
+        lines += [f"pong_connection_sync_gap_ticks{{{labels}}} {stats.syncGap}" for labels, stats in live]
+        lines += ["# HELP pong_connection_rtt_seconds Smoothed RTT estimate of the connection",
+                  "# TYPE pong_connection_rtt_seconds gauge"]
+        lines += [f"pong_connection_rtt_seconds{{{labels}}} {stats.rtt:.6f}" for labels, stats in live
+                  if stats.rtt is not None]
+        return "\n".join(lines) + "\n"
+
+    def summary(self, live: list, now: float) -> str:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Build the periodic log line
+        # Pre:              live as for render(); now is a time.monotonic() reading
+        # Post:             Returns one line with rates since the previous call and the histogram percentiles
+        #                   (bucket upper bounds) since the server started
+        totals = self.totals(live)
+        rates = ""
+        if self.lastSummary is not None:
+            lastTime, lastTotals = self.lastSummary
+            elapsed = max(now - lastTime, 1e-9)
+            rates = (f" in {(totals['messagesIn'] - lastTotals['messagesIn']) / elapsed:,.0f} msg/s "
+                     f"{(totals['bytesIn'] - lastTotals['bytesIn']) / elapsed:,.0f} B/s,"
+                     f" out {(totals['messagesOut'] - lastTotals['messagesOut']) / elapsed:,.0f} msg/s "
+                     f"{(totals['bytesOut'] - lastTotals['bytesOut']) / elapsed:,.0f} B/s,")
+        self.lastSummary = (now, totals)
+        return (f"[metrics] connections {len(live)},{rates} ticks {self.ticks} (skipped {self.ticksSkipped}),"
+                f" tick p50 {self.tick.quantile(0.5) * 1000:g} ms p99 {self.tick.quantile(0.99) * 1000:g} ms,"
+                f" late p99 {self.tickLateness.quantile(0.99) * 1000:g} ms,"
+                f" handler p99 {self.handler.quantile(0.99) * 1000:g} ms,"
+                f" rtt p50 {self.rtt.quantile(0.5) * 1000:g} ms p99 {self.rtt.quantile(0.99) * 1000:g} ms,"
+                f" sync gap p99 {self.syncGap.quantile(0.99):g}, malformed {totals['malformed']}")
@@ -0,0 +1,367 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Client networking off the render thread. ClientNetwork owns the server socket after
+#                           the handshake: a reader thread drains it continuously and decodes what arrives into
+#                           an inbox, and a writer thread sends whatever the game queued. The pygame loop only
+#                           swaps the inbox out and queues bytes, so it never waits on the network.
+# Misc:                     Binary snapshots are decoded (and delta baselines tracked) on the reader thread and
+#                           stamped with their arrival time there, which is more accurate than stamping them
+#                           when the next frame happens to look. CSV replies are parsed into state tuples.
+#                           UdpClientNetwork offers the same interface over the UDP transport (assets/code/udp.py).
+#                           session and address let the game reconnect to its seat if the connection drops.
+#                           PONGs are fed to the game's ClockSync (assets/code/lagcomp.py) on the reader thread too,
+#                           so a PING's round trip does not include the time the reply waited for the next frame.
+# =================================================================================================
+
+import queue
+import socket
+import struct
+import threading
+import time
+from collections import deque
+
+from assets.code.delta import *
+from assets.code.lagcomp import *
+from assets.code.protocol import *
+from assets.code.udp import *
+
+# Size of a single read from the server socket
+RECV_SIZE = 4096
+
+# Messages kept for the game loop; if it stalls for longer than this many ticks the oldest are dropped
+MAX_INBOX = 256
+
+# A CSV request whose reply has not arrived after this many seconds is treated as lost and a new one is sent
+CSV_REPLY_TIMEOUT = 0.1
+
+# Seconds a closing UDP client waits for the server to acknowledge its goodbye, resending it meanwhile; short of
+# the half second close() gives the writer thread
+GOODBYE_WAIT = 0.3
+
+
+class SessionExpired(ConnectionError):
+    # The server refused a ROLE_RESUME HELLO: the seat was given up or the session never existed
+    pass
+
+
+class ClientNetwork:
+    # The client's side of one server connection. Only receive(), send(), close() and the decoder, lossy,
+    # error, scores, tracker, session, address and clock attributes are meant for the game loop; everything else
+    # runs on the I/O threads.
+    def __init__(self, sock: socket.socket, decoder: FrameDecoder | None, early: list = ()) -> None:
+        # early holds frames the handshake read past the WELCOME; they are delivered when start() runs
+        self.sock = sock
+        self.decoder = decoder
+        self.early = list(early)
+        self.lossy = False  # TCP: every message arrives, in order
+        self.session = None # (matchId, token) from the WELCOME when the server lets this player resume
+        self.address = None # (host, port) of the server, for resuming
+        self.clock = None   # a ClockSync the game set to be fed the server's PONGs
+        # Binary protocol: snapshots are rebuilt from deltas here; the game loop reads latestTick and
+        # needsResync from it to build its acks, which is safe because both are replaced atomically
+        self.tracker = SnapshotTracker() if decoder is not None else None
+        self.inbox = deque(maxlen=MAX_INBOX)
+        self.inboxLock = threading.Lock()
+        self.outbox = queue.SimpleQueue()
+        self.error = None   # set to a message once the connection is unusable
+        self.scores = None  # (lScore, rScore) from reliable SCORE messages; only the UDP transport sends them
+        self.reader = threading.Thread(target=self._readLoop, name="pong-recv", daemon=True)
+        self.writer = threading.Thread(target=self._writeLoop, name="pong-send", daemon=True)
+
+    def start(self) -> None:
+        # The handshake used timeouts on the socket; the I/O threads block instead
+        self.sock.settimeout(None)
+        if self.early:
+            self.inbox.extend(self._decodeFrames(self.early, time.perf_counter()))
+            self.early = []
+        self.reader.start()
+        self.writer.start()
+
+    def send(self, data: bytes) -> None:
+        # Queue bytes for the writer thread; never blocks
+        self.outbox.put(data)
+
+    def receive(self) -> list:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Take everything the reader thread decoded since the last call
+        # Pre:              start() was called
+        # Post:             Returns a list in arrival order and empties the inbox. Binary items are
+        #                   (tick, fields, arrivedAt) full snapshots, or (tick, moving) opponent inputs in a
+        #                   lockstep match; CSV items are the 6-field state tuples
+        with self.inboxLock:
+            items = list(self.inbox)
+            self.inbox.clear()
+        return items
+
+    def close(self, goodbye: bool = True) -> None:
+        # Stop both threads: the writer on its sentinel, the reader when its recv() fails. goodbye tells a binary
+        # server we are quitting, so it frees our seat at once; leave it off to keep the seat for resume()
+        if goodbye and self.decoder is not None and self.error is None:
+            self.outbox.put(encodeBye(self.decoder.version))
+            self.outbox.put(None)
+            if self.writer.is_alive():
+                self.writer.join(0.5)
+        self.outbox.put(None)
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+    def _readLoop(self) -> None:
+        # Reader thread: block in recv() and decode everything that arrives
+        while True:
+            try:
+                data = self.sock.recv(RECV_SIZE)
+            except OSError as e:
+                self._fail(f"Socket error: {e}")
+                return
+            if not data:
+                self._fail("Server closed the connection")
+                return
+            arrivedAt = time.perf_counter()
+            try:
+                items = self._decode(data, arrivedAt)
+            except ProtocolError as e:
+                self._fail(f"Error communicating with server: {e}")
+                return
+            if items:
+                with self.inboxLock:
+                    self.inbox.extend(items)
+
+    def _decode(self, data: bytes, arrivedAt: float) -> list:
+        if self.decoder is None:
+            # Server sends: opponent's paddle Y, authoritative ball position, scores, and sync counter
+            parts = data.decode(errors="replace").split(',')
+            # Validate we received all 6 expected fields
+            if len(parts) != 6:
+                return []
+            try:
+                return [(float(parts[0]), float(parts[1]), float(parts[2]),
+                         int(parts[3]), int(parts[4]), int(parts[5]))]
+            except ValueError:
+                return []
+
+        return self._decodeFrames(self.decoder.feed(data), arrivedAt)
+
+    def _decodeFrames(self, frames: list, arrivedAt: float) -> list:
+        items = []
+        for msgType, payload in frames:
+            if msgType == MSG_SNAPSHOT or msgType == MSG_DELTA:
+                # None when a delta's baseline is missing; the next INPUT asks for a keyframe
+                try:
+                    state = self.tracker.apply(msgType, payload)
+                except struct.error:
+                    continue
+                if state is not None:
+                    items.append((state[0], state[1], arrivedAt))
+            elif msgType == MSG_PONG:
+                self._observePong(payload, arrivedAt)
+            elif msgType == MSG_LOCKSTEP:
+                # The opponent's input in a lockstep match; the game loop feeds it to its RollbackSession
+                try:
+                    items.append(decodeLockstep(payload))
+                except (struct.error, KeyError):
+                    continue
+        return items
+
+    def _observePong(self, payload: bytes, arrivedAt: float) -> None:
+        # One PING/PONG exchange for the clock; PONGs from a server without a tick clock are ignored
+        clock = self.clock
+        try:
+            tickClock = decodePongClock(payload)
+            if clock is not None and tickClock is not None:
+                clock.observe(decodePong(payload), arrivedAt, tickClock)
+        except struct.error:
+            pass
+
+    def _writeLoop(self) -> None:
+        # Writer thread: send queued messages in order, merging whatever piled up into one send
+        while True:
+            data = self.outbox.get()
+            if data is None:
+                return
+            chunks = [data]
+            stop = False
+            while not self.outbox.empty():
+                more = self.outbox.get()
+                if more is None:
+                    stop = True     # after sending what was queued before it, such as a goodbye
+                    break
+                chunks.append(more)
+            try:
+                self.sock.sendall(b"".join(chunks))
+            except OSError as e:
+                self._fail(f"Socket error: {e}")
+                return
+            if stop:
+                return
+
+    def _fail(self, message: str) -> None:
+        # Keep the first error; later ones are usually consequences of it
+        if self.error is None:
+            self.error = message
+
+
+class UdpClientNetwork(ClientNetwork):
+    # The same interface over UDP. Snapshots and inputs travel unreliably, so a lost datagram delays nothing
+    # behind it; the handshake, score changes and the goodbye go through the channel's ack/retransmit path.
+    def __init__(self, address: tuple) -> None:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # A connected UDP socket only receives from the server and reports an unreachable port as an error
+        sock.connect(address)
+        super().__init__(sock, FrameDecoder(1))
+        self.lossy = True
+        self.channel = ReliableChannel(time.monotonic())
+        self.channelLock = threading.Lock()     # the reader and writer threads both use the channel
+        self.goodbye = True
+
+    def handshake(self, role: int = ROLE_PLAYER, timeout: float = UDP_TIMEOUT, rating: int | None = None,
+                  region: int = 0, session: tuple | None = None, name: str | None = None) -> tuple[int, int, str, int]:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Send HELLO and wait for the server's WELCOME, before the threads start
+        # Pre:              The server was started with --udp; role is ROLE_PLAYER or ROLE_SPECTATOR; rating and
+        #                   region are for the server's matchmaking lobby (None: the server's default rating),
+        #                   name is the player name results are saved under
+        # Post:             Returns (screenWidth, screenHeight, playerSide, tickRate) and adopts the negotiated
+        #                   version; HELLO is resent until answered. Raises ConnectionError after timeout seconds
+        #                   without an answer. Once the server acknowledged the HELLO the player is in its lobby,
+        #                   and the wait for an opponent is kept alive with an ack every RESEND_INTERVAL.
+        #                   With role ROLE_RESUME, session is the (matchId, token) to resume; a refusal raises
+        #                   SessionExpired
+        self.sock.settimeout(RESEND_INTERVAL)
+        matchId, token = session if session is not None else (0, None)
+        hello = encodeHello(role=role, matchId=matchId, rating=rating, region=region, token=token, name=name)
+        self.sock.send(self.channel.packReliable(hello, time.monotonic()))
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                datagram = self.sock.recv(MAX_DATAGRAM)
+            except socket.timeout:
+                for resend in self.channel.due(time.monotonic()):
+                    self.sock.send(resend)
+                if not self.channel.pending:
+                    self.sock.send(self.channel.packAck())
+                    deadline = time.monotonic() + timeout
+                continue
+            try:
+                payloads, reliable = self.channel.unpack(datagram, time.monotonic())
+            except struct.error:
+                continue
+            for payload in payloads:
+                if isFrameStart(payload) and HEADER.unpack_from(payload)[2] == MSG_BYE:
+                    raise SessionExpired("the server no longer holds this session")
+                if isFrameStart(payload) and HEADER.unpack_from(payload)[2] == MSG_WELCOME:
+                    self.decoder = FrameDecoder(version=HEADER.unpack_from(payload)[1])
+                    msgType, welcome = self.decoder.feed(payload)[0]
+                    self.sock.send(self.channel.packAck())
+                    self.session = decodeWelcomeSession(welcome)
+                    return decodeWelcome(welcome)
+        raise ConnectionError("no answer from the server over UDP (is it running with --udp?)")
+
+    def close(self, goodbye: bool = True) -> None:
+        # Tell the server we are leaving (unless goodbye is off), then stop both threads. The writer sends what
+        # was queued, then the goodbye over the reliable channel, waiting up to GOODBYE_WAIT for its ack
+        self.goodbye = goodbye
+        self.outbox.put(None)
+        if self.writer.is_alive():
+            self.writer.join(0.5)
+        self.sock.close()
+
+    def _readLoop(self) -> None:
+        # Reader thread: one datagram per recv(), each holding whole frames
+        self.sock.settimeout(UDP_TIMEOUT)
+        while True:
+            try:
+                datagram = self.sock.recv(MAX_DATAGRAM)
+            except socket.timeout:
+                self._fail("Server stopped responding")
+                return
+            except OSError as e:
+                self._fail(f"Socket error: {e}")
+                return
+            arrivedAt = time.perf_counter()
+            with self.channelLock:
+                try:
+                    payloads, reliable = self.channel.unpack(datagram, time.monotonic())
+                except struct.error:
+                    continue
+                if reliable:
+                    self._sendDatagram(self.channel.packAck())
+
+            items = []
+            for payload in payloads:
+                try:
+                    frames = self.decoder.feed(payload)
+                except ProtocolError:
+                    # A datagram holds whole frames, so only this one is lost
+                    self.decoder.buffer.clear()
+                    continue
+                for msgType, body in frames:
+                    if msgType == MSG_BYE:
+                        self._fail("Server closed the connection")
+                        return
+                    if msgType == MSG_SCORE and len(body) == SCORE.size:
+                        tick, lScore, rScore = decodeScore(body)
+                        self.scores = (lScore, rScore)
+                    elif msgType == MSG_PONG:
+                        self._observePong(body, arrivedAt)
+                    elif msgType == MSG_SNAPSHOT or msgType == MSG_DELTA:
+                        try:
+                            state = self.tracker.apply(msgType, body)
+                        except struct.error:
+                            continue
+                        if state is not None:
+                            items.append((state[0], state[1], arrivedAt))
+            if items:
+                with self.inboxLock:
+                    self.inbox.extend(items)
+
+    def _writeLoop(self) -> None:
+        # Writer thread: one unreliable datagram per batch of queued frames, plus reliable resends when due
+        while True:
+            try:
+                data = self.outbox.get(timeout=RESEND_INTERVAL)
+            except queue.Empty:
+                data = b""
+            if data is None:
+                break
+            chunks = [data]
+            stop = False
+            while not self.outbox.empty():
+                more = self.outbox.get()
+                if more is None:
+                    stop = True     # after sending what was queued before it, such as the last INPUT
+                    break
+                chunks.append(more)
+            with self.channelLock:
+                frames = b"".join(chunks)
+                if frames:
+                    self._sendDatagram(self.channel.packUnreliable(frames))
+                for datagram in self.channel.due(time.monotonic()):
+                    self._sendDatagram(datagram)
+            if stop:
+                break
+
+        if not self.goodbye or self.error is not None:
+            return
+        # The goodbye is reliable: resent until the server acknowledges it, or answers with its own BYE (which the
+        # reader takes as the connection closing), for GOODBYE_WAIT at most
+        with self.channelLock:
+            self._sendDatagram(self.channel.packReliable(encodeBye(self.decoder.version), time.monotonic()))
+        deadline = time.monotonic() + GOODBYE_WAIT
+        while time.monotonic() < deadline and self.error is None:
+            with self.channelLock:
+                if not self.channel.pending:
+                    return
+                for datagram in self.channel.due(time.monotonic()):
+                    self._sendDatagram(datagram)
+            time.sleep(0.01)
+
+    def _sendDatagram(self, datagram: bytes) -> None:
+        try:
+            self.sock.send(datagram)
+        except OSError as e:
+            self._fail(f"Socket error: {e}")
@@ -0,0 +1,321 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Headless Pong physics. Holds the Paddle and Ball entities and the match rules
+#                           (wall and paddle collisions, scoring, paddle movement) that used to run in
+#                           the left client's playGame loop, so the server can run them at a fixed tick.
+# Misc:                     Does not import pygame. Rect mirrors the integer pygame.Rect attributes the
+#                           game uses, and Ball/Paddle accept either kind of rect, so the client keeps
+#                           drawing them with pygame while the server simulates them without a display.
+#                           Every quantity is an integer (pixel positions, velocities, the // in hitPaddle), so a
+#                           Simulation fed the same inputs steps identically on every machine; lockstep mode
+#                           (assets/code/rollback.py) relies on that, and on snapshot()/restore().
+#                           The ball moves by swept collision: each step finds the exact time the ball meets a
+#                           wall, a paddle face or a goal line (as an integer fraction of the step), bounces
+#                           there and sweeps the rest of the step, so a fast ball or a long tick can bounce
+#                           several times in one step and never passes through a paddle. That lets a match run
+#                           at 20-30 ticks per second with the same game speed as at 60.
+# =================================================================================================
+
+from math import gcd
+
+# Default playfield, matching the client window
+SCREEN_WIDTH = 640
+SCREEN_HEIGHT = 480
+PADDLE_WIDTH = 10
+PADDLE_HEIGHT = 50
+BALL_SIZE = 5
+PADDLE_SPEED = 5
+WINNING_SCORE = 5
+
+# Default Simulation.step() calls per second. Velocities and PADDLE_SPEED are per frame of the original
+# 60 FPS client loop, so at this rate one tick is one frame; a Simulation at a lower rate covers several
+# frames per tick and the game plays at the same speed
+TICK_RATE = 60
+
+# Most collisions resolved in one step; more can only come from a ball trapped between obstacles
+MAX_BOUNCES = 16
+
+# Bits of the event mask returned by Simulation.step(), used by clients to play sounds
+EVENT_BOUNCE = 1
+EVENT_POINT = 2
+
+
+class Rect:
+    # The subset of pygame.Rect used by the game. Coordinates are whole pixels, like pygame's
+    __slots__ = ("x", "y", "w", "h")
+
+    def __init__(self, x: float, y: float, w: int, h: int) -> None:
+        self.x = int(x)
+        self.y = int(y)
+        self.w = int(w)
+        self.h = int(h)
+
+    @property
+    def left(self) -> int:
+        return self.x
+
+    @left.setter
+    def left(self, value: int) -> None:
+        self.x = value
+
+    @property
+    def right(self) -> int:
+        return self.x + self.w
+
+    @right.setter
+    def right(self, value: int) -> None:
+        self.x = value - self.w
+
+    @property
+    def top(self) -> int:
+        return self.y
+
+    @top.setter
+    def top(self, value: int) -> None:
+        self.y = value
+
+    @property
+    def bottom(self) -> int:
+        return self.y + self.h
+
+    @bottom.setter
+    def bottom(self, value: int) -> None:
+        self.y = value - self.h
+
+    @property
+    def centery(self) -> int:
+        return self.y + self.h // 2
+
+    @property
+    def center(self) -> tuple[int, int]:
+        return (self.x + self.w // 2, self.y + self.h // 2)
+
+    @property
+    def topleft(self) -> tuple[int, int]:
+        return (self.x, self.y)
+
+    @property
+    def bottomleft(self) -> tuple[int, int]:
+        return (self.x, self.y + self.h)
+
+    def colliderect(self, other: "Rect") -> bool:
+        # Same test as pygame: touching edges do not count as a collision
+        return (self.x < other.x + other.w and other.x < self.x + self.w and
+                self.y < other.y + other.h and other.y < self.y + self.h)
+
+
+class Paddle:
+    def __init__(self, rect: Rect) -> None:
+        self.rect = rect
+        self.moving = ""
+        self.speed = PADDLE_SPEED
+
+class Ball:
+    def __init__(self, rect:Rect, startXvel:int, startYvel:int) -> None:
+        self.rect = rect
+        self.xVel = startXvel
+        self.yVel = startYvel
+        self.startXpos = rect.x
+        self.startYpos = rect.y
+
+    def updatePos(self) -> None:
+        self.rect.x += self.xVel
+        self.rect.y += self.yVel
+
+    def hitPaddle(self, paddleCenter:int) -> None:
+        self.xVel *= -1
+        self.yVel = (self.rect.center[1] - paddleCenter)//2
+
+    def hitWall(self) -> None:
+        self.yVel *= -1
+
+    def reset(self, nowGoing:str) -> None:
+        # nowGoing  The direction the ball should be going after the reset
+        self.rect.x = self.startXpos
+        self.rect.y = self.startYpos
+        self.xVel = -5 if nowGoing == "left" else 5
+        self.yVel = 0
+
+
+def movePaddle(paddle: Paddle, screenHeight: int) -> None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Move one paddle a step according to its movement state
+    # Pre:              paddle.moving is "up", "down" or ""
+    # Post:             paddle.rect.y moved by paddle.speed unless it already reached the wall
+    #                   (leave 10px margin for each wall)
+    if paddle.moving == "down":
+        if paddle.rect.bottomleft[1] < screenHeight-10:
+            paddle.rect.y += paddle.speed
+    elif paddle.moving == "up":
+        if paddle.rect.topleft[1] > 10:
+            paddle.rect.y -= paddle.speed
+
+
+def frameSpan(tick: int, tickRate: int) -> int:
+    # Whole frames of the 60 FPS loop that end during tick `tick` at tickRate steps per second (the paddles
+    # move once per frame). Over any second the spans add up to TICK_RATE, also when tickRate does not divide it
+    return (TICK_RATE * (tick + 1)) // tickRate - (TICK_RATE * tick) // tickRate
+
+
+class Simulation:
+    # One match's physics. step() advances the game by 1/tickRate of a second, that is TICK_RATE/tickRate
+    # frames of the original 60 FPS client loop, so calling it at tickRate per second makes the game speed
+    # independent of both the server's tick rate and any client's frame rate.
+    def __init__(self, screenWidth: int = SCREEN_WIDTH, screenHeight: int = SCREEN_HEIGHT,
+                 tickRate: int = TICK_RATE) -> None:
+        self.screenWidth = screenWidth
+        self.screenHeight = screenHeight
+        self.tickRate = tickRate
+        self.topWall = Rect(-10, 0, screenWidth+20, 10)
+        self.bottomWall = Rect(-10, screenHeight-10, screenWidth+20, 10)
+
+        paddleStartPosY = (screenHeight/2)-(PADDLE_HEIGHT/2)
+        self.leftPaddle = Paddle(Rect(10, paddleStartPosY, PADDLE_WIDTH, PADDLE_HEIGHT))
+        self.rightPaddle = Paddle(Rect(screenWidth-20, paddleStartPosY, PADDLE_WIDTH, PADDLE_HEIGHT))
+        self.ball = Ball(Rect(screenWidth/2, screenHeight/2, BALL_SIZE, BALL_SIZE), -5, 0)
+
+        self.lScore = 0
+        self.rScore = 0
+        self.tick = 0
+
+    def isOver(self) -> bool:
+        return self.lScore >= WINNING_SCORE or self.rScore >= WINNING_SCORE
+
+    def snapshot(self) -> tuple:
+        # Everything step() changes, as one flat tuple: cheap to take every tick and to keep a few dozen of.
+        # Paddle movement states are inputs, not state, and are set before every step
+        ball = self.ball.rect
+        return (self.tick, self.lScore, self.rScore, ball.x, ball.y, self.ball.xVel, self.ball.yVel,
+                self.leftPaddle.rect.y, self.rightPaddle.rect.y)
+
+    def restore(self, state: tuple) -> None:
+        # Put the match back exactly as it was when snapshot() returned state
+        ball = self.ball.rect
+        (self.tick, self.lScore, self.rScore, ball.x, ball.y, self.ball.xVel, self.ball.yVel,
+         self.leftPaddle.rect.y, self.rightPaddle.rect.y) = state
+
+    def step(self) -> int:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Advance the match by one tick
+        # Pre:              Paddle movement states hold the latest player inputs
+        # Post:             Ball swept through the tick's frames with every bounce on the way, scores updated,
+        #                   paddles moved once per frame, tick incremented.
+        #                   Returns a mask of EVENT_BOUNCE / EVENT_POINT for what happened this tick
+        events = 0
+        if not self.isOver():
+            events = self.sweepBall(TICK_RATE, self.tickRate)
+
+        for _ in range(frameSpan(self.tick, self.tickRate)):
+            movePaddle(self.leftPaddle, self.screenHeight)
+            movePaddle(self.rightPaddle, self.screenHeight)
+        self.tick += 1
+        return events
+
+    def sweepBall(self, frames: int, per: int = 1) -> int:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Move the ball frames/per frames ahead, resolving collisions at their exact time
+        # Pre:              The paddles are where they stand for this step (they move after the ball)
+        # Post:             The ball bounced off each wall or paddle face it reached, in time order, and a goal
+        #                   line reached scored and reset the ball, which moves on from the next whole frame
+        #                   unless that won the game. Times are fractions
+        #                   num/den of a frame and every position is rounded down the same way, so the result
+        #                   is identical on every machine. Returns the EVENT_* mask
+        ball = self.ball
+        rect = ball.rect
+        top = self.topWall.bottom
+        bottom = self.bottomWall.top - rect.h
+        leftFace = self.leftPaddle.rect.right
+        rightFace = self.rightPaddle.rect.left - rect.w
+        goal = self.screenWidth - rect.w
+        remNum, remDen = frames, per    # time left in this step, in frames
+        events = 0
+        # Distance to the nearest wall and paddle face (or the goal line behind a paddle already passed)
+        # along each axis of travel; out of reach of both, the ball just moves
+        xVel, yVel = ball.xVel, ball.yVel
+        yGap = rect.y - top if yVel < 0 else bottom - rect.y
+        xGap = rect.x - leftFace if xVel < 0 else rightFace - rect.x
+        reach = yGap * per <= abs(yVel) * frames and yVel != 0 or xGap * per <= abs(xVel) * frames
+        if not reach:
+            # Nothing within reach this step (the usual case): no collision to resolve
+            rect.x += xVel * frames // per
+            rect.y += yVel * frames // per
+            return events
+        for _ in range(MAX_BOUNCES):
+            x, y, xVel, yVel = rect.x, rect.y, ball.xVel, ball.yVel
+            # Earliest collision as (num, den, what): ties go to the earlier entry, in the order of the old
+            # discrete checks (walls, left paddle, right paddle, goals)
+            hit = None
+            if yVel < 0:
+                hit = self._earlier(hit, max(y - top, 0), -yVel, "top")
+            elif yVel > 0:
+                hit = self._earlier(hit, max(bottom - y, 0), yVel, "bottom")
+            if xVel < 0:
+                if x >= leftFace:
+                    hit = self._earlier(hit, x - leftFace, -xVel, "left", self.leftPaddle.rect, y, yVel)
+                hit = self._earlier(hit, max(x, 0), -xVel, "leftGoal")
+            elif xVel > 0:
+                if x <= rightFace:
+                    hit = self._earlier(hit, rightFace - x, xVel, "right", self.rightPaddle.rect, y, yVel)
+                hit = self._earlier(hit, max(goal - x, 0), xVel, "rightGoal")
+            if hit is None or hit[0] * remDen > remNum * hit[1]:
+                # Nothing reached before the step ends
+                rect.x = x + xVel * remNum // remDen
+                rect.y = y + yVel * remNum // remDen
+                return events
+            num, den, what = hit
+            rect.x = x + xVel * num // den
+            rect.y = y + yVel * num // den
+            remNum, remDen = remNum * den - num * remDen, remDen * den
+            divisor = gcd(remNum, remDen)
+            remNum, remDen = remNum // divisor, remDen // divisor
+
+            if what == "top":
+                rect.top = self.topWall.bottom  # Exactly at the wall, not through it
+                ball.hitWall()  # Reverse vertical velocity
+                events |= EVENT_BOUNCE
+            elif what == "bottom":
+                rect.bottom = self.bottomWall.top
+                ball.hitWall()
+                events |= EVENT_BOUNCE
+            elif what == "left":
+                rect.left = self.leftPaddle.rect.right  # Position ball at paddle edge
+                ball.hitPaddle(self.leftPaddle.rect.centery)  # Bounce with angle based on hit position
+                events |= EVENT_BOUNCE
+            elif what == "right":
+                rect.right = self.rightPaddle.rect.left
+                ball.hitPaddle(self.rightPaddle.rect.centery)
+                events |= EVENT_BOUNCE
+            else:
+                if what == "leftGoal":
+                    # Left side scoring (right player scores)
+                    self.rScore += 1
+                    ball.reset("right")  # Reset ball to move toward right player
+                else:
+                    # Right side scoring (left player scores)
+                    self.lScore += 1
+                    ball.reset("left")  # Reset ball to move toward left player
+                events |= EVENT_POINT
+                if self.isOver():
+                    return events
+                # The reset ball starts moving with the next whole frame, as it did when every tick was one frame
+                elapsedNum, elapsedDen = frames * remDen - remNum * per, per * remDen
+                frame = -(-elapsedNum // elapsedDen)
+                remNum, remDen = frames - frame * per, per
+                if remNum <= 0:
+                    return events
+        return events
+
+    @staticmethod
+    def _earlier(hit: tuple | None, num: int, den: int, what: str, paddle: Rect | None = None,
+                 y: int = 0, yVel: int = 0) -> tuple | None:
+        # hit or the collision num/den frames from now, whichever is first. A paddle face only counts
+        # when the ball overlaps it vertically at that moment (the colliderect test, at the time of contact)
+        if hit is not None and hit[0] * den <= num * hit[1]:
+            return hit
+        if paddle is not None:
+            contact = y + yVel * num // den
+            if not (contact < paddle.y + paddle.h and paddle.y < contact + BALL_SIZE):
+                return hit
+        return (num, den, what)
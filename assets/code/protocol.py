@@ -0,0 +1,438 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Binary wire protocol shared by pongClient and pongServer. Every message is a
+#                           length-prefixed frame with a fixed-layout, struct-packed payload, and
+#                           FrameDecoder reassembles frames from arbitrarily split or merged TCP reads.
+#                           FrameReader does the same for the server without copying: it receives into a
+#                           preallocated buffer and frames are decoded where they lie, and the pack* functions
+#                           write replies into a preallocated buffer instead of building bytes.
+# Misc:                     Frame layout (network byte order):
+#                               length   uint16  bytes that follow the length field (version + type + payload)
+#                               version  uint8   negotiated protocol version
+#                               type     uint8   one of the MSG_* constants below
+#                               payload  ...     fixed layout per message type
+#                           Handshake: the client sends HELLO as soon as it connects. A server that speaks
+#                           the binary protocol answers with WELCOME (the binary form of "640,480,left",
+#                           plus the server's tick rate so clients can place snapshots in time).
+#                           A client that gets a plain "640,480,left" string back is talking to a CSV-only
+#                           server, and a server that gets no HELLO is talking to a CSV-only client.
+#                           A HELLO may also ask to watch instead of play (ROLE_SPECTATOR); spectators get
+#                           WELCOME with side "spectator" and then a full SNAPSHOT every tick, and send nothing.
+#                           Players may add their rating and region (HELLO_RATING) for the server's matchmaking
+#                           lobby; the WELCOME then comes once an opponent near that rating is found. A player
+#                           name (HELLO_NAME) may follow the rating; the server files match results under it.
+#                           Lockstep players (ROLE_LOCKSTEP) run the match simulation themselves: after WELCOME
+#                           they only exchange LOCKSTEP input messages, which the server relays to the opponent.
+#                           A player's WELCOME also carries a session (match id and token). A player whose
+#                           connection dropped reconnects with a HELLO of role ROLE_RESUME and that session within
+#                           SESSION_GRACE seconds, and gets its seat back: WELCOME, then a SNAPSHOT keyframe.
+# =================================================================================================
+
+import struct
+
+PROTOCOL_VERSION = 1
+
+# Largest frame either side will accept; anything bigger means the stream is corrupt
+MAX_FRAME = 1024
+
+# Bytes of a FrameReader's buffer; a read takes whatever fits after the unparsed bytes, and at least one
+# whole frame always fits
+READ_BUFFER = 4096
+
+HEADER = struct.Struct("!HBB")
+
+# Message types
+MSG_HELLO = 1    # client -> server, first bytes on the wire
+MSG_WELCOME = 2  # server -> client, answer to HELLO
+MSG_STATE = 3    # both directions, the binary form of the CSV game state message
+MSG_INPUT = 4    # client -> server, the player's paddle input
+MSG_SNAPSHOT = 5 # server -> client, the authoritative match state after a server tick
+MSG_PING = 6     # client -> server, round-trip time probe
+MSG_PONG = 7     # server -> client, the PING payload echoed back, then the server's tick clock (PONG_CLOCK)
+MSG_DELTA = 8    # server -> client, a SNAPSHOT encoded against an acknowledged one (assets/code/delta.py)
+MSG_SCORE = 9    # server -> client, the new score after a point; sent reliably over UDP (assets/code/udp.py)
+MSG_BYE = 10     # both directions, the sender is leaving; over TCP only a player quitting sends it, to give up
+                 # its seat at once instead of keeping it for a resume
+MSG_LOCKSTEP = 11   # both directions, a lockstep player's input from a tick on (relayed to the opponent)
+
+# HELLO: highest protocol version the client speaks, optionally followed by HELLO_ROLE
+HELLO = struct.Struct("!B")
+# HELLO_ROLE: role, match to watch (0 = any match in progress); players may leave it out
+HELLO_ROLE = struct.Struct("!BI")
+ROLE_PLAYER = 0
+ROLE_SPECTATOR = 1
+ROLE_LOCKSTEP = 2   # a player in deterministic lockstep mode; TCP only, paired with lockstep players only
+ROLE_RESUME = 3     # a player returning to its seat; the match id is the session's, HELLO_TOKEN follows
+# HELLO_RATING: the player's rating and region for matchmaking; follows HELLO_ROLE, may be left out
+HELLO_RATING = struct.Struct("!HB")
+RATING_DEFAULT = 0xFFFF     # rating field of a HELLO that only carries it to reach HELLO_NAME: the server's default
+# HELLO_NAME: name length, then that many bytes of UTF-8; follows HELLO_RATING, may be left out
+HELLO_NAME = struct.Struct("!B")
+MAX_NAME = 24   # bytes
+# HELLO_TOKEN: the session token from the WELCOME; follows HELLO_ROLE instead of HELLO_RATING for ROLE_RESUME
+HELLO_TOKEN = struct.Struct("!Q")
+# WELCOME: screenWidth, screenHeight, side (0 = left, 1 = right, 2 = spectator), server ticks per second
+WELCOME = struct.Struct("!HHBH")
+# WELCOME_SESSION: match id and session token; follows WELCOME for players that can resume, left out otherwise
+WELCOME_SESSION = struct.Struct("!IQ")
+
+# Seconds the server holds a disconnected player's seat (and pauses its match) for a ROLE_RESUME HELLO
+SESSION_GRACE = 10.0
+# STATE: paddleY, ballX, ballY, lScore, rScore, sync
+# (client -> server carries the sender's paddle, server -> client carries the opponent's paddle)
+STATE = struct.Struct("!hhhBBI")
+# INPUT: mask, input sequence number, then only the fields whose mask bit is set, in bit order.
+# Like snapshots, inputs are deltas: a client sends a direction only when it changes.
+INPUT = struct.Struct("!BH")
+# Sequence numbers wrap at 15 bits so the echo in SNAPSHOT fits the int16 delta encoding
+INPUT_SEQ_MASK = 0x7FFF
+INPUT_MOVE = 1    # paddle direction, int8 (-1 = up, 0 = still, 1 = down)
+INPUT_ACK = 2     # uint16, low bits of the newest snapshot tick the client holds (a usable delta baseline)
+INPUT_RESYNC = 4  # no value: the client cannot decode deltas and needs a full SNAPSHOT
+INPUT_LAG = 8     # uint8, the player's view lag in ticks, for lag compensation (assets/code/lagcomp.py)
+INPUT_DIRECTION = struct.Struct("!b")
+INPUT_TICK = struct.Struct("!H")
+INPUT_VIEW_LAG = struct.Struct("!B")
+# SNAPSHOT: tick, leftPaddleY, rightPaddleY, ballX, ballY, lScore, rScore, events (physics EVENT_* mask),
+# inputAck (sequence number of the receiving client's newest INPUT the server has applied)
+SNAPSHOT = struct.Struct("!IhhhhBBBh")
+# PING / PONG: the client's send time (opaque to the server, which only echoes it)
+PING = struct.Struct("!d")
+# PONG_CLOCK: follows the echo in a PONG; the match's tick clock when the server answered (ticks stepped plus
+# the fraction of the next one elapsed), for the client's NTP-style clock estimate
+PONG_CLOCK = struct.Struct("!d")
+# SCORE: tick of the point, lScore, rScore
+SCORE = struct.Struct("!IBB")
+# LOCKSTEP: tick, paddle direction (-1 = up, 0 = still, 1 = down). The direction holds from that tick on;
+# the ticks since the sender's previous LOCKSTEP kept the previous direction. Sent on every change and at
+# least every few ticks, so it also tells the receiver how far the sender's inputs are known
+LOCKSTEP = struct.Struct("!Ib")
+
+SIDES = ("left", "right", "spectator")
+
+# Paddle.moving values <-> INPUT direction
+MOVES = {"up": -1, "": 0, "down": 1}
+MOVING = {-1: "up", 0: "", 1: "down"}
+
+
+class ProtocolError(ValueError):
+    # Raised when the byte stream can no longer be split into frames
+    pass
+
+
+def encodeFrame(msgType: int, payload: bytes, version: int = PROTOCOL_VERSION) -> bytes:
+    return HEADER.pack(len(payload) + 2, version, msgType) + payload
+
+
+def encodeHello(version: int = PROTOCOL_VERSION, role: int = ROLE_PLAYER, matchId: int = 0,
+                rating: int | None = None, region: int = 0, token: int | None = None, name: str | None = None) -> bytes:
+    # HELLO is always framed as version 1 so a server of any version can read it; the payload
+    # carries the highest version the client speaks and the server answers with the one it picked.
+    # token is only for ROLE_RESUME; a name longer than MAX_NAME bytes is cut short
+    payload = HELLO.pack(version)
+    if name is not None and rating is None:
+        rating = RATING_DEFAULT
+    if role != ROLE_PLAYER or rating is not None:
+        payload += HELLO_ROLE.pack(role, matchId)
+    if role == ROLE_RESUME:
+        payload += HELLO_TOKEN.pack(token)
+    elif rating is not None:
+        payload += HELLO_RATING.pack(rating, region)
+        if name is not None:
+            encoded = name.encode("utf-8")[:MAX_NAME].decode("utf-8", "ignore").encode("utf-8")
+            payload += HELLO_NAME.pack(len(encoded)) + encoded
+    return encodeFrame(MSG_HELLO, payload, 1)
+
+
+def decodeHello(payload: bytes) -> tuple[int, int, int]:
+    # Returns (version, role, matchId); a bare HELLO is a player
+    (version,) = HELLO.unpack_from(payload)
+    if len(payload) < HELLO.size + HELLO_ROLE.size:
+        return version, ROLE_PLAYER, 0
+    role, matchId = HELLO_ROLE.unpack_from(payload, HELLO.size)
+    return version, role, matchId
+
+
+def decodeHelloRating(payload: bytes) -> tuple[int, int] | None:
+    # Returns (rating, region), or None when the HELLO does not carry them; the rating may be RATING_DEFAULT
+    if len(payload) < HELLO.size + HELLO_ROLE.size + HELLO_RATING.size or decodeHello(payload)[1] == ROLE_RESUME:
+        return None
+    return HELLO_RATING.unpack_from(payload, HELLO.size + HELLO_ROLE.size)
+
+
+def decodeHelloToken(payload: bytes) -> int | None:
+    # Returns the session token of a ROLE_RESUME HELLO, or None when the HELLO does not carry one
+    if len(payload) < HELLO.size + HELLO_ROLE.size + HELLO_TOKEN.size or decodeHello(payload)[1] != ROLE_RESUME:
+        return None
+    return HELLO_TOKEN.unpack_from(payload, HELLO.size + HELLO_ROLE.size)[0]
+
+
+def decodeHelloName(payload: bytes) -> str | None:
+    # Returns the player name, or None when the HELLO does not carry one (or it is empty or cut short)
+    offset = HELLO.size + HELLO_ROLE.size + HELLO_RATING.size
+    if len(payload) < offset + HELLO_NAME.size or decodeHello(payload)[1] == ROLE_RESUME:
+        return None
+    (length,) = HELLO_NAME.unpack_from(payload, offset)
+    offset += HELLO_NAME.size
+    if length == 0 or length > MAX_NAME or len(payload) < offset + length:
+        return None
+    return payload[offset:offset + length].decode("utf-8", "replace")
+
+
+def encodeWelcome(screenWidth: int, screenHeight: int, side: str, tickRate: int,
+                  version: int = PROTOCOL_VERSION, session: tuple | None = None) -> bytes:
+    # session is (matchId, token) for a player that may resume, None otherwise
+    payload = WELCOME.pack(screenWidth, screenHeight, SIDES.index(side), tickRate)
+    if session is not None:
+        payload += WELCOME_SESSION.pack(*session)
+    return encodeFrame(MSG_WELCOME, payload, version)
+
+
+def decodeWelcome(payload: bytes) -> tuple[int, int, str, int]:
+    screenWidth, screenHeight, side, tickRate = WELCOME.unpack_from(payload)
+    return screenWidth, screenHeight, SIDES[side], tickRate
+
+
+def decodeWelcomeSession(payload: bytes) -> tuple[int, int] | None:
+    # Returns (matchId, token), or None when the WELCOME offers no session
+    if len(payload) < WELCOME.size + WELCOME_SESSION.size:
+        return None
+    return WELCOME_SESSION.unpack_from(payload, WELCOME.size)
+
+
+def encodeState(paddleY: float, ballX: float, ballY: float, lScore: int, rScore: int, sync: int,
+                version: int = PROTOCOL_VERSION) -> bytes:
+    # Positions are whole pixels on both ends (pygame.Rect stores ints), so int16 loses nothing
+    return encodeFrame(MSG_STATE, STATE.pack(int(paddleY), int(ballX), int(ballY), lScore, rScore, sync), version)
+
+
+def decodeState(payload: bytes) -> tuple[int, int, int, int, int, int]:
+    return STATE.unpack(payload)
+
+
+def packState(buffer: memoryview, offset: int, paddleY: float, ballX: float, ballY: float, lScore: int,
+              rScore: int, sync: int, version: int = PROTOCOL_VERSION) -> int:
+    # encodeState() written into buffer at offset; returns the offset after the frame
+    end = offset + HEADER.size + STATE.size
+    HEADER.pack_into(buffer, offset, end - offset - 2, version, MSG_STATE)
+    STATE.pack_into(buffer, offset + HEADER.size, int(paddleY), int(ballX), int(ballY), lScore, rScore, sync)
+    return end
+
+
+def encodeInput(seq: int, moving: str | None = None, ackTick: int | None = None, resync: bool = False,
+                version: int = PROTOCOL_VERSION, viewLag: int | None = None) -> bytes:
+    # moving None = direction unchanged, ackTick None = nothing new to acknowledge, viewLag None = unchanged
+    mask = 0
+    fields = b""
+    if moving is not None:
+        mask |= INPUT_MOVE
+        fields += INPUT_DIRECTION.pack(MOVES[moving])
+    if ackTick is not None:
+        mask |= INPUT_ACK
+        fields += INPUT_TICK.pack(ackTick & 0xFFFF)
+    if resync:
+        mask |= INPUT_RESYNC
+    if viewLag is not None:
+        mask |= INPUT_LAG
+        fields += INPUT_VIEW_LAG.pack(min(viewLag, 255))
+    return encodeFrame(MSG_INPUT, INPUT.pack(mask, seq & INPUT_SEQ_MASK) + fields, version)
+
+
+def decodeInput(payload: bytes, offset: int = 0,
+                end: int | None = None) -> tuple[int, str | None, int | None, bool, int | None]:
+    # Returns (seq, moving, ackTick, resync, viewLag) with None for fields that were not sent;
+    # unknown directions are treated as standing still. The INPUT may also be read from a larger buffer
+    # (a FrameReader's) at offset, up to end
+    mask, seq = INPUT.unpack_from(payload, offset)
+    offset += INPUT.size
+    moving = None
+    ackTick = None
+    viewLag = None
+    if mask & INPUT_MOVE:
+        moving = MOVING.get(INPUT_DIRECTION.unpack_from(payload, offset)[0], "")
+        offset += INPUT_DIRECTION.size
+    if mask & INPUT_ACK:
+        (ackTick,) = INPUT_TICK.unpack_from(payload, offset)
+        offset += INPUT_TICK.size
+    if mask & INPUT_LAG:
+        (viewLag,) = INPUT_VIEW_LAG.unpack_from(payload, offset)
+        offset += INPUT_VIEW_LAG.size
+    if end is not None and offset > end:
+        raise struct.error("INPUT shorter than its fields")
+    return seq, moving, ackTick, bool(mask & INPUT_RESYNC), viewLag
+
+
+def encodeSnapshot(tick: int, leftPaddleY: int, rightPaddleY: int, ballX: int, ballY: int, lScore: int,
+                   rScore: int, events: int, inputAck: int, version: int = PROTOCOL_VERSION) -> bytes:
+    return encodeFrame(MSG_SNAPSHOT, SNAPSHOT.pack(tick, leftPaddleY, rightPaddleY, ballX, ballY, lScore, rScore,
+                                                   events, inputAck), version)
+
+
+def decodeSnapshot(payload: bytes) -> tuple[int, int, int, int, int, int, int, int, int]:
+    return SNAPSHOT.unpack(payload)
+
+
+def encodePing(sentAt: float, version: int = PROTOCOL_VERSION) -> bytes:
+    return encodeFrame(MSG_PING, PING.pack(sentAt), version)
+
+
+def encodePong(ping: bytes, tickClock: float, version: int = PROTOCOL_VERSION) -> bytes:
+    # ping is the PING payload to echo
+    return encodeFrame(MSG_PONG, ping + PONG_CLOCK.pack(tickClock), version)
+
+
+def packPong(buffer: memoryview, offset: int, sentAt: float, tickClock: float, version: int = PROTOCOL_VERSION) -> int:
+    # encodePong() written into buffer at offset, echoing the PING's sentAt; returns the offset after the frame
+    end = offset + HEADER.size + PING.size + PONG_CLOCK.size
+    HEADER.pack_into(buffer, offset, end - offset - 2, version, MSG_PONG)
+    PING.pack_into(buffer, offset + HEADER.size, sentAt)
+    PONG_CLOCK.pack_into(buffer, end - PONG_CLOCK.size, tickClock)
+    return end
+
+
+def decodePong(payload: bytes) -> float:
+    # Returns the send time the matching PING carried
+    return PING.unpack_from(payload)[0]
+
+
+def decodePongClock(payload: bytes) -> float | None:
+    # Returns the server's tick clock, or None when the PONG does not carry it
+    if len(payload) < PING.size + PONG_CLOCK.size:
+        return None
+    return PONG_CLOCK.unpack_from(payload, PING.size)[0]
+
+
+def encodeScore(tick: int, lScore: int, rScore: int, version: int = PROTOCOL_VERSION) -> bytes:
+    return encodeFrame(MSG_SCORE, SCORE.pack(tick, lScore, rScore), version)
+
+
+def decodeScore(payload: bytes) -> tuple[int, int, int]:
+    return SCORE.unpack(payload)
+
+
+def encodeBye(version: int = PROTOCOL_VERSION) -> bytes:
+    return encodeFrame(MSG_BYE, b"", version)
+
+
+def encodeLockstep(tick: int, moving: str, version: int = PROTOCOL_VERSION) -> bytes:
+    return encodeFrame(MSG_LOCKSTEP, LOCKSTEP.pack(tick, MOVES[moving]), version)
+
+
+def decodeLockstep(payload: bytes) -> tuple[int, str]:
+    # Returns (tick, paddle movement state); raises struct.error or KeyError on a malformed payload
+    tick, direction = LOCKSTEP.unpack(payload)
+    return tick, MOVING[direction]
+
+
+def isFrameStart(data: bytes) -> bool:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Tell a binary frame apart from a CSV string at the start of a stream
+    # Pre:              data holds at least the first HEADER.size bytes received
+    # Post:             Returns True when the bytes form a plausible frame header. CSV text always starts with an
+    #                   ASCII digit or '-', which as a length is far above MAX_FRAME, so the two cannot be confused
+    if len(data) < HEADER.size:
+        return False
+    length, version, msgType = HEADER.unpack_from(data)
+    return 2 <= length <= MAX_FRAME and 1 <= version <= PROTOCOL_VERSION
+
+
+class FrameDecoder:
+    # Streaming decoder: feed it whatever recv() returned and it hands back every frame that is now
+    # complete, keeping any trailing partial frame for the next call. TCP does not preserve message
+    # boundaries, so one read may hold half a frame or several frames at once.
+    def __init__(self, version: int = PROTOCOL_VERSION) -> None:
+        self.version = version
+        self.buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[tuple[int, bytes]]:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Append received bytes and extract complete frames
+        # Pre:              data is the next chunk of the stream (may be empty)
+        # Post:             Returns [(msgType, payload), ...] in arrival order; raises ProtocolError if a header
+        #                   is invalid, since the framing of the rest of the stream cannot be trusted after that
+        buffer = self.buffer
+        buffer += data
+        frames = []
+        offset = 0
+        end = len(buffer)
+        while end - offset >= HEADER.size:
+            length, version, msgType = HEADER.unpack_from(buffer, offset)
+            if length < 2 or length > MAX_FRAME or version != self.version:
+                raise ProtocolError(f"bad frame header (length={length}, version={version})")
+            frameEnd = offset + 2 + length
+            if frameEnd > end:
+                break
+            frames.append((msgType, bytes(buffer[offset + HEADER.size:frameEnd])))
+            offset = frameEnd
+        if offset:
+            del buffer[:offset]
+        return frames
+
+
+class FrameReader:
+    # Server side of a connection, without copies. readFrom() receives a stream straight into a preallocated
+    # buffer (load() takes a datagram's frames instead), and next() steps through the frames where they lie: it
+    # returns each frame's type and leaves its payload's bounds in payload/payloadEnd, so handlers unpack_from()
+    # the buffer and nothing is built per frame. The buffer is reused from the front once it has been parsed to
+    # the end; a partial frame left near the end is moved to the front first (at most one frame's bytes)
+    def __init__(self, version: int = PROTOCOL_VERSION, capacity: int = READ_BUFFER) -> None:
+        self.version = version
+        self.buffer = bytearray(capacity)
+        self.view = memoryview(self.buffer)
+        self.start = 0  # first byte not parsed yet
+        self.end = 0    # end of the bytes received
+        self.payload = 0        # the current frame's payload is buffer[payload:payloadEnd]
+        self.payloadEnd = 0
+
+    def readFrom(self, sock) -> int:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Receive the next chunk of the stream into the buffer
+        # Pre:              sock is a connected stream socket
+        # Post:             Returns the bytes received (0 when the peer closed); raises whatever recv_into() raises
+        if self.start == self.end:
+            self.start = self.end = 0
+        elif len(self.buffer) - self.end < MAX_FRAME + 2:
+            pending = self.end - self.start
+            self.view[:pending] = self.view[self.start:self.end]
+            self.start, self.end = 0, pending
+        received = sock.recv_into(self.view[self.end:])
+        self.end += received
+        return received
+
+    def load(self, data: bytes) -> None:
+        # Take the frames of one datagram (at most READ_BUFFER bytes); a datagram holds whole frames, so whatever
+        # was left of the last one is dropped
+        self.view[:len(data)] = data
+        self.start = 0
+        self.end = len(data)
+
+    def next(self) -> int | None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Step to the next complete frame
+        # Pre:              None
+        # Post:             Returns its message type with payload/payloadEnd set, or None when no whole frame is left
+        #                   (a partial one waits for more bytes); raises ProtocolError if the header is invalid
+        start = self.start
+        if self.end - start < HEADER.size:
+            return None
+        length, version, msgType = HEADER.unpack_from(self.buffer, start)
+        if length < 2 or length > MAX_FRAME or version != self.version:
+            raise ProtocolError(f"bad frame header (length={length}, version={version})")
+        frameEnd = start + 2 + length
+        if frameEnd > self.end:
+            return None
+        self.payload = start + HEADER.size
+        self.payloadEnd = frameEnd
+        self.start = frameEnd
+        return msgType
+
+    def skip(self) -> None:
+        # Step past every complete frame without looking at it
+        while self.next() is not None:
+            pass
+
+    def payloadBytes(self) -> bytes:
+        # A copy of the current payload, for frames that are kept or are rare enough not to matter
+        return bytes(self.view[self.payload:self.payloadEnd])
@@ -0,0 +1,117 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Match recording and replay. MatchRecorder appends one fixed-size record per server
+#                           tick to a log file, plus a small sidecar index; Recording memory-maps a log and
+#                           reads any tick directly, which is what the client's replay mode plays from.
+# Misc:                     Log layout (network byte order): a FILE_HEADER, then one RECORD per tick with no
+#                           gaps, so tick t lives at FILE_HEADER.size + (t - firstTick) * RECORD.size.
+#                           A match's ticks only advance while both players are in, so they are consecutive.
+#                           Index layout: INDEX entries (kind, tick, log offset), one per second of play and
+#                           one per point scored, so a player can list the points without scanning the log.
+#                           15 bytes per tick is about 3.2 MB per hour of play at 60 Hz.
+# =================================================================================================
+
+import mmap
+import os
+import struct
+
+from assets.code.physics import *
+
+RECORDING_MAGIC = b"PREC"
+RECORDING_VERSION = 1
+
+# FILE_HEADER: magic, format version, screenWidth, screenHeight, tick rate, match id, first tick
+FILE_HEADER = struct.Struct("!4sBHHHII")
+# RECORD: tick, leftPaddleY, rightPaddleY, ballX, ballY, lScore, rScore, events (physics EVENT_* mask)
+RECORD = struct.Struct("!IhhhhBBB")
+# INDEX: kind, tick, offset of the tick's record in the log
+INDEX = struct.Struct("!BII")
+INDEX_SECOND = 0
+INDEX_POINT = 1
+
+LOG_SUFFIX = ".pongrec"
+INDEX_SUFFIX = ".pongidx"
+
+# Records buffered in memory before they reach the file; the buffer is also flushed with every
+# once-per-second index entry, so a crash loses at most about a second of play
+WRITE_BUFFER = 64 * 1024
+
+
+class MatchRecorder:
+    # Writer for one match, owned by the server loop. write() is one struct pack into a buffered file,
+    # so recording costs the tick next to nothing; the disk only sees a write every few seconds.
+    def __init__(self, basePath: str, matchId: int, firstTick: int, screenWidth: int = SCREEN_WIDTH,
+                 screenHeight: int = SCREEN_HEIGHT, tickRate: int = TICK_RATE) -> None:
+        self.path = basePath + LOG_SUFFIX
+        self.log = open(self.path, "xb", buffering=WRITE_BUFFER)
+        self.index = open(basePath + INDEX_SUFFIX, "xb", buffering=WRITE_BUFFER)
+        self.log.write(FILE_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, screenWidth, screenHeight, tickRate,
+                                        matchId, firstTick))
+        self.tickRate = tickRate
+        self.offset = FILE_HEADER.size
+
+    def write(self, tick: int, leftY: int, rightY: int, ballX: int, ballY: int, lScore: int, rScore: int,
+              events: int) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Append the state after one tick
+        # Pre:              tick is one more than the previous call's (or the recorder's firstTick)
+        # Post:             The record is buffered; an index entry is added on every point and every second
+        if events & EVENT_POINT:
+            self.index.write(INDEX.pack(INDEX_POINT, tick, self.offset))
+        if tick % self.tickRate == 0:
+            self.index.write(INDEX.pack(INDEX_SECOND, tick, self.offset))
+            self.log.flush()
+            self.index.flush()
+        self.log.write(RECORD.pack(tick, leftY, rightY, ballX, ballY, lScore, rScore, events))
+        self.offset += RECORD.size
+
+    def close(self) -> None:
+        self.log.close()
+        self.index.close()
+
+
+class Recording:
+    # Read-only view of a recorded match. The log is memory-mapped, so opening an hour-long recording
+    # reads nothing up front and seeking to any tick is one offset computation.
+    def __init__(self, path: str) -> None:
+        if path.endswith(INDEX_SUFFIX):
+            path = path[:-len(INDEX_SUFFIX)] + LOG_SUFFIX
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < FILE_HEADER.size:
+            raise ValueError(f"{path} is not a match recording")
+        magic, version, self.screenWidth, self.screenHeight, self.tickRate, self.matchId, self.firstTick = \
+            FILE_HEADER.unpack_from(self.data)
+        if magic != RECORDING_MAGIC or version != RECORDING_VERSION:
+            raise ValueError(f"{path} is not a match recording")
+        # A server that was killed may have left half a record at the end
+        self.count = (len(self.data) - FILE_HEADER.size) // RECORD.size
+        if self.count == 0:
+            raise ValueError(f"{path} holds no ticks")
+        self.lastTick = self.firstTick + self.count - 1
+
+        # Point ticks from the index; without an index, seeking still works but there are no points to list
+        self.points = []
+        indexPath = os.path.splitext(path)[0] + INDEX_SUFFIX
+        if os.path.exists(indexPath):
+            with open(indexPath, "rb") as file:
+                entries = file.read()
+            entries = entries[:len(entries) - len(entries) % INDEX.size]
+            for kind, tick, offset in INDEX.iter_unpack(entries):
+                if kind == INDEX_POINT and tick <= self.lastTick:
+                    self.points.append(tick)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, tick: int) -> tuple[int, int, int, int, int, int, int, int]:
+        # Returns (tick, leftY, rightY, ballX, ballY, lScore, rScore, events) for a tick within the recording,
+        # clamped to the first or last one otherwise
+        tick = min(max(tick, self.firstTick), self.lastTick)
+        return RECORD.unpack_from(self.data, FILE_HEADER.size + (tick - self.firstTick) * RECORD.size)
+
+    def close(self) -> None:
+        self.data.close()
+
@@ -0,0 +1,101 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Frame renderer for the pygame client. The walls and center line never change, so
+#                           they are drawn once onto a background surface; each frame only the areas the ball,
+#                           paddles and texts covered last frame are restored from it before drawing them at
+#                           their new positions. Score and win texts are rendered once per distinct value.
+# Misc:                     draw() returns the dirty rects for pygame.display.update(): every area that changed,
+#                           both where objects were and where they are now, so nothing leaves a trail.
+#                           Works under SDL's dummy video driver (SDL_VIDEODRIVER=dummy) for headless runs.
+# =================================================================================================
+
+import pygame
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+
+
+class Renderer:
+    def __init__(self, screen: pygame.Surface, staticRects: list, scoreFont: pygame.font.Font,
+                 winFont: pygame.font.Font, color: tuple[int, int, int] = WHITE) -> None:
+        self.screen = screen
+        self.scoreFont = scoreFont
+        self.winFont = winFont
+        self.color = color
+
+        # Walls, center line: drawn once
+        self.background = pygame.Surface(screen.get_size()).convert()
+        self.background.fill(BLACK)
+        for rect in staticRects:
+            pygame.draw.rect(self.background, color, rect)
+
+        self.scoreCache = {}    # (lScore, rScore) -> (surface, rect)
+        self.winCache = {}      # text -> (surface, rect)
+        self.drawn = None       # rects covered by the previous frame; None until the first frame
+        self.shownScore = None
+
+    def scoreSurface(self, lScore: int, rScore: int) -> tuple[pygame.Surface, pygame.Rect]:
+        # Same text and placement as helperCode.updateScore, rendered once per score
+        key = (lScore, rScore)
+        cached = self.scoreCache.get(key)
+        if cached is None:
+            surface = self.scoreFont.render(f"{lScore}   {rScore}", False, self.color)
+            rect = surface.get_rect()
+            rect.center = ((self.screen.get_width()/2)+5, 50)
+            cached = self.scoreCache[key] = (surface, rect)
+        return cached
+
+    def winSurface(self, text: str) -> tuple[pygame.Surface, pygame.Rect]:
+        cached = self.winCache.get(text)
+        if cached is None:
+            surface = self.winFont.render(text, False, self.color, BLACK)
+            rect = surface.get_rect()
+            rect.center = ((self.screen.get_width()/2), self.screen.get_height()/2)
+            cached = self.winCache[text] = (surface, rect)
+        return cached
+
+    def draw(self, movingRects: list, lScore: int, rScore: int, winText: str | None = None) -> list:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Draw one frame
+        # Pre:              movingRects are the rects of the objects to draw this frame (ball, paddles);
+        #                   winText is the game over message, or None while the game is on
+        # Post:             The screen shows the new frame. Returns the dirty rects: the whole screen on the first
+        #                   frame, then the previous and current area of every moving object plus texts that changed
+        screen = self.screen
+        dirty = []
+        if self.drawn is None:
+            screen.blit(self.background, (0, 0))
+            dirty.append(screen.get_rect())
+        else:
+            # Restore what was under last frame's objects
+            for rect in self.drawn:
+                screen.blit(self.background, rect, rect)
+                dirty.append(rect)
+
+        drawn = []
+        surface, scoreRect = self.scoreSurface(lScore, rScore)
+        if self.shownScore != (lScore, rScore):
+            # The old text may be wider than the new one
+            if self.shownScore is not None:
+                oldRect = self.scoreSurface(*self.shownScore)[1]
+                screen.blit(self.background, oldRect, oldRect)
+                dirty.append(oldRect)
+            dirty.append(scoreRect)
+            self.shownScore = (lScore, rScore)
+        # Drawn every frame (a cached blit) since a restored area may have overlapped it
+        screen.blit(surface, scoreRect)
+
+        if winText is not None:
+            surface, winRect = self.winSurface(winText)
+            screen.blit(surface, winRect)
+            drawn.append(winRect)
+
+        for rect in movingRects:
+            pygame.draw.rect(screen, self.color, rect)
+            drawn.append(pygame.Rect(rect))
+
+        dirty.extend(drawn)
+        self.drawn = drawn
+        return dirty
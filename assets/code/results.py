@@ -0,0 +1,224 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Persistent match results. ResultsStore takes finished games from the server loop
+#                           through a queue and writes them to a SQLite database on its own thread, many per
+#                           transaction, so the loop never waits on the disk. leaderboard(), playerRank() and
+#                           playerHistory() answer from indexes on any connection openResults() returns.
+# Misc:                     The database runs in WAL mode, so readers (a leaderboard query, the sqlite3 shell)
+#                           never block the writer and the writer never blocks them. Every result also updates
+#                           the winner's and the loser's row in players, which is what the leaderboard reads;
+#                           unnamed players appear in results only. Ranks count the players with more wins,
+#                           so players with equal wins share a rank.
+# =================================================================================================
+
+import queue
+import sqlite3
+import threading
+import time
+
+# Results written per transaction at most. Every commit writes out the index pages it dirtied, so a backlog
+# is cheapest committed in large batches; an idle server commits each result within BATCH_WAIT anyway
+BATCH_SIZE = 5000
+
+# Seconds the writer waits for more results to join a batch once it has one
+BATCH_WAIT = 0.25
+
+# Page cache of the writer's connection, in KiB. Results land on random pages of the per-player indexes, so a
+# cache that holds them saves a read for most writes once the database outgrows SQLite's 2 MiB default
+WRITER_CACHE = 64 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    ended_at REAL NOT NULL,         -- Unix time the game ended
+    match_id INTEGER NOT NULL,
+    duration REAL NOT NULL,         -- seconds of play, paused time excluded
+    left_player TEXT,               -- player names from the HELLO, NULL for unnamed players
+    right_player TEXT,
+    left_score INTEGER NOT NULL,
+    right_score INTEGER NOT NULL,
+    winner TEXT NOT NULL,           -- 'left' or 'right'
+    forfeit TEXT,                   -- the side that left before the end, NULL for a game played out
+    left_drift REAL,                -- mean sync gap of each player's connection in ticks, NULL if never sampled
+    right_drift REAL
+);
+CREATE INDEX IF NOT EXISTS results_by_left ON results (left_player, ended_at) WHERE left_player IS NOT NULL;
+CREATE INDEX IF NOT EXISTS results_by_right ON results (right_player, ended_at) WHERE right_player IS NOT NULL;
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    points_for INTEGER NOT NULL,
+    points_against INTEGER NOT NULL,
+    last_played REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS players_by_wins ON players (wins DESC, losses, name);
+-- How many players have each number of wins, kept by the triggers below: a rank sums the few rows above a
+-- player's wins instead of counting every player ahead of them
+CREATE TABLE IF NOT EXISTS win_counts (
+    wins INTEGER PRIMARY KEY,
+    players INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS player_added AFTER INSERT ON players BEGIN
+    INSERT INTO win_counts VALUES (new.wins, 1) ON CONFLICT (wins) DO UPDATE SET players = players + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS player_won AFTER UPDATE OF wins ON players WHEN new.wins != old.wins BEGIN
+    UPDATE win_counts SET players = players - 1 WHERE wins = old.wins;
+    INSERT INTO win_counts VALUES (new.wins, 1) ON CONFLICT (wins) DO UPDATE SET players = players + 1;
+END;
+"""
+
+INSERT_RESULT = ("INSERT INTO results (ended_at, match_id, duration, left_player, right_player, left_score, "
+                 "right_score, winner, forfeit, left_drift, right_drift) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+UPDATE_PLAYER = ("INSERT INTO players (name, wins, losses, points_for, points_against, last_played) "
+                 "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (name) DO UPDATE SET wins = wins + excluded.wins, "
+                 "losses = losses + excluded.losses, points_for = points_for + excluded.points_for, "
+                 "points_against = points_against + excluded.points_against, last_played = excluded.last_played")
+
+
+class MatchResult:
+    # One finished game, as the server hands it to ResultsStore.record()
+    __slots__ = ("endedAt", "matchId", "duration", "leftPlayer", "rightPlayer", "leftScore", "rightScore",
+                 "winner", "forfeit", "leftDrift", "rightDrift")
+
+    def __init__(self, endedAt: float, matchId: int, duration: float, leftPlayer: str | None,
+                 rightPlayer: str | None, leftScore: int, rightScore: int, winner: str, forfeit: str | None = None,
+                 leftDrift: float | None = None, rightDrift: float | None = None) -> None:
+        self.endedAt = endedAt
+        self.matchId = matchId
+        self.duration = duration
+        self.leftPlayer = leftPlayer
+        self.rightPlayer = rightPlayer
+        self.leftScore = leftScore
+        self.rightScore = rightScore
+        self.winner = winner
+        self.forfeit = forfeit
+        self.leftDrift = leftDrift
+        self.rightDrift = rightDrift
+
+    def row(self) -> tuple:
+        return (self.endedAt, self.matchId, self.duration, self.leftPlayer, self.rightPlayer, self.leftScore,
+                self.rightScore, self.winner, self.forfeit, self.leftDrift, self.rightDrift)
+
+    def playerRows(self) -> list:
+        # The players update for each named player: (name, wins, losses, points for, points against, last played)
+        rows = []
+        for side, name, scored, conceded in (("left", self.leftPlayer, self.leftScore, self.rightScore),
+                                             ("right", self.rightPlayer, self.rightScore, self.leftScore)):
+            if name is not None:
+                won = self.winner == side
+                rows.append((name, int(won), int(not won), scored, conceded, self.endedAt))
+        return rows
+
+
+def openResults(path: str) -> sqlite3.Connection:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Open (creating if needed) a results database
+    # Pre:              path is a file path; its directory exists
+    # Post:             Returns a connection for the calling thread with the schema in place and WAL mode on.
+    #                   synchronous=NORMAL: a power cut can lose the last commits, never corrupt the file
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(SCHEMA)
+    return db
+
+
+def leaderboard(db: sqlite3.Connection, limit: int = 10) -> list[tuple[int, str, int, int]]:
+    # The top `limit` players as (rank, name, wins, losses), most wins first, then fewest losses;
+    # read in index order, so it costs the same for any number of players
+    rows = db.execute("SELECT name, wins, losses FROM players ORDER BY wins DESC, losses, name LIMIT ?",
+                      (limit,)).fetchall()
+    board = []
+    for index, (name, wins, losses) in enumerate(rows):
+        rank = board[-1][0] if board and board[-1][2] == wins else index + 1
+        board.append((rank, name, wins, losses))
+    return board
+
+
+def playerRank(db: sqlite3.Connection, name: str) -> tuple[int, int, int] | None:
+    # (rank, wins, losses) of a player, or None if they never finished a game; the players ahead are summed from
+    # win_counts, one row per distinct number of wins, so it costs the same for any number of players
+    row = db.execute("SELECT wins, losses FROM players WHERE name = ?", (name,)).fetchone()
+    if row is None:
+        return None
+    wins, losses = row
+    (ahead,) = db.execute("SELECT TOTAL(players) FROM win_counts WHERE wins > ?", (wins,)).fetchone()
+    return int(ahead) + 1, wins, losses
+
+
+def playerHistory(db: sqlite3.Connection, name: str, limit: int = 20) -> list[tuple]:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          A player's most recent games
+    # Pre:              None
+    # Post:             Returns up to limit rows of (ended_at, match_id, side, opponent, own score, opponent's
+    #                   score, won, forfeit, duration), newest first. Each side is read from its own index, newest
+    #                   first, so only about limit rows of each are touched however long the history is
+    return db.execute(
+        "SELECT * FROM ("
+        " SELECT * FROM (SELECT ended_at, match_id, 'left', right_player, left_score, right_score,"
+        "  winner = 'left', forfeit, duration FROM results WHERE left_player = ?1 ORDER BY ended_at DESC LIMIT ?2)"
+        " UNION ALL"
+        " SELECT * FROM (SELECT ended_at, match_id, 'right', left_player, right_score, left_score,"
+        "  winner = 'right', forfeit, duration FROM results WHERE right_player = ?1 ORDER BY ended_at DESC LIMIT ?2)"
+        ") ORDER BY ended_at DESC LIMIT ?2", (name, limit)).fetchall()
+
+
+class ResultsStore:
+    # Server side: record() queues a result and returns at once; a writer thread commits them in batches of up to
+    # BATCH_SIZE, waiting up to BATCH_WAIT for a batch to fill. close() writes whatever is queued and stops it
+    def __init__(self, path: str) -> None:
+        self.path = path
+        openResults(path).close()   # create the schema now, so a bad path fails at startup
+        self.queue = queue.SimpleQueue()
+        self.written = 0        # results committed so far
+        self.batches = 0        # transactions committed so far
+        self.error = None       # the last write error; that batch is lost, later ones are still tried
+        self.thread = threading.Thread(target=self._writeLoop, name="pong-results", daemon=True)
+        self.thread.start()
+
+    def record(self, result: MatchResult) -> None:
+        # Never blocks: the queue is unbounded and the writer catches up between games
+        self.queue.put(result)
+
+    def close(self) -> None:
+        self.queue.put(None)
+        self.thread.join()
+
+    def _writeLoop(self) -> None:
+        # Writer thread: block for the next result, gather whatever follows within BATCH_WAIT, commit it at once
+        db = openResults(self.path)
+        db.execute(f"PRAGMA cache_size=-{WRITER_CACHE}")
+        stop = False
+        while not stop:
+            result = self.queue.get()
+            if result is None:
+                break
+            batch = [result]
+            deadline = time.monotonic() + BATCH_WAIT
+            while len(batch) < BATCH_SIZE:
+                try:
+                    result = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if result is None:
+                    stop = True
+                    break
+                batch.append(result)
+            self._write(db, batch)
+        db.close()
+
+    def _write(self, db: sqlite3.Connection, batch: list) -> None:
+        try:
+            with db:
+                db.executemany(INSERT_RESULT, [result.row() for result in batch])
+                db.executemany(UPDATE_PLAYER, [row for result in batch for row in result.playerRows()])
+        except sqlite3.Error as e:
+            self.error = e
+            print(f"Could not save {len(batch)} match results to {self.path}: {e}")
+            return
+        self.written += len(batch)
+        self.batches += 1
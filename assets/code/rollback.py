@@ -0,0 +1,128 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Deterministic lockstep with rollback. Each lockstep client runs the match's
+#                           Simulation itself, from the same start, fed with both players' inputs per tick.
+#                           Its own input applies at once; the opponent's is predicted (the last direction
+#                           received continues) and, when a LOCKSTEP message shows the prediction was wrong
+#                           for ticks already simulated, the client restores the snapshot taken before the
+#                           first wrong tick and simulates forward again with the real input.
+# Misc:                     The physics is integer-only, so both clients (and the server, which steps its own
+#                           copy only as far as both players' inputs are known) reach identical states.
+#                           Only direction changes and a heartbeat every LOCKSTEP_HEARTBEAT ticks go on the
+#                           wire. A client never runs more than MAX_ROLLBACK ticks ahead of the newest
+#                           opponent input it holds; past that it waits, which bounds every rollback.
+# =================================================================================================
+
+from bisect import bisect_right
+
+from assets.code.physics import *
+from assets.code.protocol import *
+
+# Most ticks a client simulates past the opponent's newest known input (half a second at 60 Hz)
+MAX_ROLLBACK = 30
+
+# A player's input is confirmed at least this often, even while the direction does not change
+LOCKSTEP_HEARTBEAT = 6
+
+
+class InputLog:
+    # One player's paddle direction per tick, stored as the ticks where it changed. confirmed is the last
+    # tick the direction is known for; any later tick is predicted to keep the newest direction.
+    __slots__ = ("ticks", "moves", "confirmed")
+
+    def __init__(self) -> None:
+        self.ticks = [0]
+        self.moves = [""]
+        self.confirmed = -1
+
+    def move(self, tick: int) -> str:
+        return self.moves[bisect_right(self.ticks, tick) - 1]
+
+    def add(self, tick: int, moving: str) -> int | None:
+        # Record a LOCKSTEP message: `moving` from tick on, the previous direction up to it. Returns tick when
+        # this changes what was predicted for it (and every tick after), else None
+        if tick <= self.confirmed:
+            return None     # already known; messages arrive in order, so only a duplicate gets here
+        self.confirmed = tick
+        if moving == self.moves[-1]:
+            return None
+        self.ticks.append(tick)
+        self.moves.append(moving)
+        return tick
+
+    def trim(self, tick: int) -> None:
+        # Forget changes that no tick from `tick` on can look up
+        keep = bisect_right(self.ticks, tick) - 1
+        if keep > 0:
+            del self.ticks[:keep]
+            del self.moves[:keep]
+
+
+class RollbackSession:
+    # One lockstep client's view of its match. The game loop calls receive() for every opponent
+    # LOCKSTEP message and advance() once per frame, and draws self.sim.
+    def __init__(self, side: str, screenWidth: int = SCREEN_WIDTH, screenHeight: int = SCREEN_HEIGHT,
+                 tickRate: int = TICK_RATE, maxRollback: int = MAX_ROLLBACK) -> None:
+        self.sim = Simulation(screenWidth, screenHeight, tickRate)
+        self.side = side
+        self.maxRollback = maxRollback
+        self.local = InputLog()
+        self.remote = InputLog()
+        # Snapshot taken before each recent tick was simulated, by tick % len(history)
+        self.history = [None] * (maxRollback + 2)
+        self.lastSent = -LOCKSTEP_HEARTBEAT
+        self.rollbackFrom = None    # first tick simulated with a wrong prediction, until advance() redoes it
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.stalls = 0
+
+    def receive(self, tick: int, moving: str) -> None:
+        changed = self.remote.add(tick, moving)
+        if changed is not None and changed < self.sim.tick:
+            self.rollbackFrom = changed if self.rollbackFrom is None else min(self.rollbackFrom, changed)
+
+    def advance(self, targetTick: int, moving: str, version: int = PROTOCOL_VERSION) -> tuple[int, bytes]:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Correct any misprediction, then simulate up to targetTick
+        # Pre:              moving is the local player's paddle direction now; targetTick is the tick the local
+        #                   clock has reached (ticks since the match started, plus one)
+        # Post:             self.sim is at targetTick, or MAX_ROLLBACK ticks past the opponent's newest known input
+        #                   if that is earlier. Returns (events, frames): the EVENT_* mask of the ticks simulated
+        #                   for the first time, and the LOCKSTEP frames to send (empty when nothing is due)
+        sim = self.sim
+        if self.rollbackFrom is not None:
+            end = sim.tick
+            sim.restore(self.history[self.rollbackFrom % len(self.history)])
+            while sim.tick < end:
+                self._step()
+            self.rollbacks += 1
+            self.resimulated += end - self.rollbackFrom
+            self.rollbackFrom = None
+
+        events = 0
+        frames = bytearray()
+        limit = min(targetTick, self.remote.confirmed + 1 + self.maxRollback)
+        if limit < targetTick:
+            self.stalls += 1
+        while sim.tick < limit:
+            tick = sim.tick
+            if moving != self.local.moves[-1] or tick - self.lastSent >= LOCKSTEP_HEARTBEAT:
+                self.local.add(tick, moving)
+                frames += encodeLockstep(tick, moving, version)
+                self.lastSent = tick
+            events |= self._step()
+
+        oldest = sim.tick - len(self.history)
+        self.local.trim(oldest)
+        self.remote.trim(oldest)
+        return events, bytes(frames)
+
+    def _step(self) -> int:
+        sim = self.sim
+        tick = sim.tick
+        self.history[tick % len(self.history)] = sim.snapshot()
+        local, remote = self.local.move(tick), self.remote.move(tick)
+        sim.leftPaddle.moving, sim.rightPaddle.moving = (local, remote) if self.side == "left" else (remote, local)
+        return sim.step()
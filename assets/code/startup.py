@@ -0,0 +1,98 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Client cold start. AssetLoader imports pygame and loads the fonts and sounds on a
+#                           background thread while the main thread connects to the server, and StartupTimer
+#                           reports how long each stage of a launch took.
+# Misc:                     pygame is only imported inside loadAssets(), so importing this module stays cheap.
+#                           Only the font and mixer modules are initialized off the main thread; the display is
+#                           left to playGame's pygame.init() on the main thread, as some platforms require.
+# =================================================================================================
+
+import threading
+import time
+
+
+class SilentSound:
+    # Stands in for pygame.mixer.Sound when audio is off
+    def play(self) -> None:
+        pass
+
+
+class GameAssets:
+    __slots__ = ("scoreFont", "winFont", "pointSound", "bounceSound", "loadSeconds")
+
+    def __init__(self, scoreFont, winFont, pointSound, bounceSound, loadSeconds: float) -> None:
+        self.scoreFont = scoreFont
+        self.winFont = winFont
+        self.pointSound = pointSound
+        self.bounceSound = bounceSound
+        self.loadSeconds = loadSeconds  # time spent importing pygame and loading everything
+
+
+def loadAssets(audio: bool = True) -> GameAssets:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Import pygame and load the game's fonts and sounds
+    # Pre:              The working directory is the repository root (the asset paths are relative)
+    # Post:             Returns the loaded GameAssets; with audio off (or no audio device) the sounds are silent
+    #                   and the mixer is never started
+    start = time.perf_counter()
+    import pygame
+
+    pygame.font.init()
+    scoreFont = pygame.font.Font("./assets/fonts/pong-score.ttf", 32)
+    winFont = pygame.font.Font("./assets/fonts/visitor.ttf", 48)
+    pointSound = bounceSound = SilentSound()
+    if audio:
+        try:
+            pygame.mixer.pre_init(44100, -16, 2, 2048)
+            pygame.mixer.init()
+            pointSound = pygame.mixer.Sound("./assets/sounds/point.wav")
+            bounceSound = pygame.mixer.Sound("./assets/sounds/bounce.wav")
+        except pygame.error:
+            pass    # no audio device; play silently
+    return GameAssets(scoreFont, winFont, pointSound, bounceSound, time.perf_counter() - start)
+
+
+class AssetLoader:
+    # Runs loadAssets() on a thread started at construction; result() waits for it
+    def __init__(self, audio: bool = True) -> None:
+        self.assets = None
+        self.error = None
+        self.thread = threading.Thread(target=self._load, args=(audio,), daemon=True)
+        self.thread.start()
+
+    def _load(self, audio: bool) -> None:
+        try:
+            self.assets = loadAssets(audio)
+        except Exception as e:
+            self.error = e
+
+    def result(self) -> GameAssets:
+        # The loaded assets; re-raises whatever made loading fail
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.assets
+
+
+class StartupTimer:
+    # Milliseconds from the start of the launch to each stage, recorded the first time the stage is reached.
+    # report() prints them once every stage in `stages` is in, as one "[startup]" line
+    def __init__(self, startedAt: float, stages: tuple = ("connected", "assets", "first frame", "first state")) -> None:
+        self.startedAt = startedAt
+        self.stages = stages
+        self.marks = {}
+        self.reported = False
+
+    def mark(self, stage: str) -> None:
+        if stage not in self.marks:
+            self.marks[stage] = (time.perf_counter() - self.startedAt) * 1000
+            if not self.reported and all(name in self.marks for name in self.stages):
+                self.report()
+
+    def report(self) -> None:
+        self.reported = True
+        print("[startup] " + ", ".join(f"{name} {self.marks[name]:.1f} ms" for name in self.stages
+                                      if name in self.marks), flush=True)
@@ -0,0 +1,122 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  UDP transport for the binary protocol. Over TCP one lost packet holds back every
+#                           later snapshot until it is retransmitted; over UDP each datagram stands alone.
+#                           Snapshots, inputs and pings travel unreliably and the newest one wins, while the
+#                           few messages that must arrive (handshake, score changes, disconnects) go through a
+#                           small ack/retransmit channel. ReliableChannel is used by both ends.
+# Misc:                     Datagram layout (network byte order):
+#                               kind     uint8   KIND_UNRELIABLE, KIND_RELIABLE or KIND_ACK
+#                               seq      uint16  unreliable counter, or reliable message number (from 1)
+#                               ack      uint16  newest reliable message received in order from the peer
+#                               frames   ...     protocol.py frames, exactly as on TCP
+#                           Every datagram acknowledges, so acks are free whenever there is traffic.
+# =================================================================================================
+
+import struct
+
+DATAGRAM = struct.Struct("!BHH")
+
+KIND_UNRELIABLE = 0
+KIND_RELIABLE = 1
+KIND_ACK = 2    # acknowledgement only, no frames
+
+SEQ_MASK = 0xFFFF
+
+# Largest datagram either side reads; a datagram holds a handful of frames at most
+MAX_DATAGRAM = 2048
+
+# Unacknowledged reliable messages are sent again this often (seconds)
+RESEND_INTERVAL = 0.1
+
+# A peer that sent nothing for this long is gone, and so is one that never acknowledges a reliable message
+UDP_TIMEOUT = 5.0
+
+# Reliable messages that arrive ahead of a missing one are held until the gap is filled, up to this many
+MAX_OUT_OF_ORDER = 64
+
+
+def seqNewer(a: int, b: int) -> bool:
+    # True when sequence number a comes after b, allowing for 16-bit wraparound
+    diff = (a - b) & SEQ_MASK
+    return 0 < diff < 0x8000
+
+
+class ReliableChannel:
+    # Sequencing state for one peer. Unreliable datagrams are numbered so stale or duplicated ones can be
+    # dropped (newest wins). Reliable messages are numbered separately, delivered in order exactly once,
+    # and kept by the sender until the peer's cumulative ack covers them.
+    def __init__(self, now: float) -> None:
+        self.sendSeq = 0        # last unreliable datagram number sent
+        self.reliableSeq = 0    # last reliable message number sent
+        self.pending = {}       # reliable seq -> [frames, last send time, first send time]
+        self.received = 0       # newest reliable message received in order (our ack)
+        self.outOfOrder = {}    # reliable seq -> frames, received ahead of a gap
+        self.newest = None      # newest unreliable datagram number received
+        self.lastHeard = now
+
+    def packUnreliable(self, frames: bytes) -> bytes:
+        self.sendSeq = (self.sendSeq + 1) & SEQ_MASK
+        return DATAGRAM.pack(KIND_UNRELIABLE, self.sendSeq, self.received) + frames
+
+    def packReliable(self, frames: bytes, now: float) -> bytes:
+        # The message is remembered and resent by due() until acknowledged
+        self.reliableSeq = (self.reliableSeq + 1) & SEQ_MASK
+        self.pending[self.reliableSeq] = [frames, now, now]
+        return DATAGRAM.pack(KIND_RELIABLE, self.reliableSeq, self.received) + frames
+
+    def packAck(self) -> bytes:
+        return DATAGRAM.pack(KIND_ACK, 0, self.received)
+
+    def unpack(self, datagram: bytes, now: float) -> tuple[list, bool]:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Process one datagram from the peer
+        # Pre:              datagram is everything recvfrom() returned
+        # Post:             Returns (payloads, reliable): the frame bytes now ready for the protocol, in order, and
+        #                   whether a reliable message arrived (the caller should acknowledge it right away).
+        #                   Acknowledged messages leave pending; stale unreliable datagrams and duplicate
+        #                   reliable messages yield nothing. Raises struct.error on a truncated header
+        kind, seq, ack = DATAGRAM.unpack_from(datagram)
+        self.lastHeard = now
+        for pendingSeq in [s for s in self.pending if s == ack or seqNewer(ack, s)]:
+            del self.pending[pendingSeq]
+        frames = datagram[DATAGRAM.size:]
+
+        if kind == KIND_UNRELIABLE:
+            if self.newest is not None and not seqNewer(seq, self.newest):
+                return [], False
+            self.newest = seq
+            return [frames], False
+        if kind != KIND_RELIABLE:
+            return [], False
+
+        ready = []
+        expected = (self.received + 1) & SEQ_MASK
+        if seq == expected:
+            ready.append(frames)
+            self.received = seq
+            # The gap is filled; release whatever was waiting behind it
+            while (self.received + 1) & SEQ_MASK in self.outOfOrder:
+                self.received = (self.received + 1) & SEQ_MASK
+                ready.append(self.outOfOrder.pop(self.received))
+        elif seqNewer(seq, expected) and len(self.outOfOrder) < MAX_OUT_OF_ORDER:
+            self.outOfOrder[seq] = frames
+        return ready, True
+
+    def due(self, now: float) -> list[bytes]:
+        # Datagrams to send again: every reliable message unacknowledged for RESEND_INTERVAL, carrying the
+        # current ack
+        datagrams = []
+        for seq, entry in self.pending.items():
+            if now - entry[1] >= RESEND_INTERVAL:
+                entry[1] = now
+                datagrams.append(DATAGRAM.pack(KIND_RELIABLE, seq, self.received) + entry[0])
+        return datagrams
+
+    def expired(self, now: float) -> bool:
+        # The peer went silent, or has ignored a reliable message for too long
+        if now - self.lastHeard > UDP_TIMEOUT:
+            return True
+        return any(now - entry[2] > UDP_TIMEOUT for entry in self.pending.values())
@@ -0,0 +1,113 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Throughput benchmark for the NumPy batch simulator (match-steps per second),
+#                           compared with stepping scalar physics.Simulation objects one at a time.
+#                           Before timing, it replays the same inputs through both engines and checks
+#                           that every match matches the scalar Ball/Paddle logic at every step.
+# Misc:                     Run from the repository root:  python3 -m benchmarks.benchBatchSim --matches 10000
+#                           Exits with status 1 if the batch and scalar engines ever disagree.
+# =================================================================================================
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from assets.code.batchSim import *
+from assets.code.physics import *
+
+
+def random_inputs(batch: BatchSimulation, rng: np.random.Generator, noise: float) -> None:
+    # Ball-tracking players with a fraction of random moves, so rallies, paddle hits at every
+    # angle, misses and finished games all show up
+    batch.trackBall()
+    for move in (batch.leftMove, batch.rightMove):
+        replace = rng.random(batch.count) < noise
+        move[replace] = rng.integers(-1, 2, size=int(replace.sum()))
+
+
+def track_ball(sim: Simulation, deadZone: int = 5) -> None:
+    # Scalar version of BatchSimulation.trackBall()
+    ballCenter = sim.ball.rect.y + BALL_SIZE // 2
+    for paddle in (sim.leftPaddle, sim.rightPaddle):
+        offset = ballCenter - (paddle.rect.y + PADDLE_HEIGHT // 2)
+        paddle.moving = "down" if offset > deadZone else "up" if offset < -deadZone else ""
+
+
+def check_against_scalar(count: int, steps: int, seed: int, tickRate: int = TICK_RATE) -> bool:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Verify the batch engine reproduces Simulation.step() exactly
+    # Pre:              count scalar simulations are cheap enough to step `steps` times
+    # Post:             Returns True when positions, velocities, scores and events agree for every match at every
+    #                   step; prints the first mismatch otherwise
+    rng = np.random.default_rng(seed)
+    batch = BatchSimulation(count, tickRate=tickRate)
+    sims = [Simulation(tickRate=tickRate) for _ in range(count)]
+    reversals = 0
+    for step in range(steps):
+        random_inputs(batch, rng, noise=0.3)
+        for i, sim in enumerate(sims):
+            sim.leftPaddle.moving = DIRECTIONS[int(batch.leftMove[i])]
+            sim.rightPaddle.moving = DIRECTIONS[int(batch.rightMove[i])]
+        xVelBefore = batch.xVel.copy()
+        events = batch.step()
+        reversals += int((np.sign(batch.xVel) == -np.sign(xVelBefore)).sum())
+        for i, sim in enumerate(sims):
+            scalarEvents = sim.step()
+            if batch.matchState(i) != scalarState(sim) or int(events[i]) != scalarEvents:
+                print(f"MISMATCH at step {step}, match {i}:")
+                print(f"  batch  {batch.matchState(i)} events={int(events[i])}")
+                print(f"  scalar {scalarState(sim)} events={scalarEvents}")
+                return False
+    finished = int(batch.isOver().sum())
+    print(f"check:               {count} matches x {steps} steps at {tickRate} Hz identical to Simulation "
+          f"({reversals} ball reversals, {finished} finished games)")
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batch simulator throughput benchmark")
+    parser.add_argument("--matches", type=int, default=10000, help="matches in the batch (default: 10000)")
+    parser.add_argument("--steps", type=int, default=1000, help="steps to time (default: 1000)")
+    parser.add_argument("--check", type=int, default=64,
+                        help="matches to verify against the scalar engine first, 0 to skip (default: 64)")
+    parser.add_argument("--check-steps", type=int, default=3000, help="steps for the verification (default: 3000)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default: 1)")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE,
+                        help=f"steps per second of game time; lower rates sweep more frames per step (default: {TICK_RATE})")
+    args = parser.parse_args()
+
+    if args.check and not check_against_scalar(args.check, args.check_steps, args.seed, args.tick_rate):
+        sys.exit(1)
+
+    # Both engines run ball-tracking players so rallies last and no match finishes early
+    batch = BatchSimulation(args.matches, tickRate=args.tick_rate)
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        batch.trackBall()
+        batch.step()
+    batchSeconds = time.perf_counter() - start
+    batchRate = args.matches * args.steps / batchSeconds
+
+    # Scalar reference: the same work with one Simulation object per match
+    scalarCount = min(args.matches, 200)
+    sims = [Simulation(tickRate=args.tick_rate) for _ in range(scalarCount)]
+    scalarSteps = max(1, args.steps // 4)
+    start = time.perf_counter()
+    for _ in range(scalarSteps):
+        for sim in sims:
+            track_ball(sim)
+            sim.step()
+    scalarSeconds = time.perf_counter() - start
+    scalarRate = scalarCount * scalarSteps / scalarSeconds
+
+    print(f"batch:               {args.matches} matches x {args.steps} steps in {batchSeconds:.2f}s")
+    print(f"batch match-steps/s: {batchRate:,.0f}")
+    print(f"scalar match-steps/s:{scalarRate:,.0f}")
+    print(f"speedup:             {batchRate / scalarRate:.1f}x")
+
+if __name__ == "__main__":
+    main()
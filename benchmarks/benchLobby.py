@@ -0,0 +1,85 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Matchmaking lobby benchmark. Fills a Lobby with a large synthetic queue, then times
+#                           the decisions the server makes against it: queueing a player, pairing a newcomer
+#                           on arrival, and the pairs that come due as everyone's rating window widens.
+# Misc:                     Run from the repository root:  python3 -m benchmarks.benchLobby --players 50000
+#                           The clock is simulated, so the queue fills at one instant and stays full: queued
+#                           ratings are distinct within a region and the lobby starts with a zero base gap,
+#                           so nobody in the fill pairs until the clock moves on.
+# =================================================================================================
+
+import argparse
+import random
+import time
+
+from assets.code.lobby import *
+
+
+def percentile(samples: list, fraction: float) -> float:
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def report(label: str, times: list) -> None:
+    times.sort()
+    print(f"{label:22s} mean {sum(times) / len(times) * 1e6:7.2f} us  p50 {percentile(times, 0.50) * 1e6:7.2f} us  "
+          f"p99 {percentile(times, 0.99) * 1e6:7.2f} us  max {times[-1] * 1e6:8.2f} us  ({len(times)} samples)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Matchmaking lobby benchmark")
+    parser.add_argument("--players", type=int, default=50000, help="players queued before timing (default: 50000)")
+    parser.add_argument("--regions", type=int, default=8, help="regions the players spread over (default: 8)")
+    parser.add_argument("--arrivals", type=int, default=10000,
+                        help="newcomers timed against the full queue (default: 10000)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    lobby = Lobby(baseGap=0)
+    # Distinct ratings within each region, spread around DEFAULT_RATING, in random arrival order
+    perRegion = -(-args.players // args.regions)
+    ratings = [rng.sample(range(max(0, DEFAULT_RATING - perRegion), DEFAULT_RATING + perRegion), perRegion)
+               for region in range(args.regions)]
+    joinTimes = []
+    for player in range(args.players):
+        region = player % args.regions
+        rating = ratings[region][player // args.regions]
+        start = time.perf_counter()
+        lobby.join(("filler", player), rating, region, 0.0)
+        joinTimes.append(time.perf_counter() - start)
+    print(f"queued {len(lobby)} players in {args.regions} regions")
+    report("join (queue fills)", joinTimes)
+
+    # Newcomers with a queued player's exact rating pair on arrival, each taking that player out of the queue
+    queued = [(lobby.players[key].rating, lobby.players[key].region) for key in list(lobby.players)[:args.arrivals]]
+    pairTimes = []
+    for arrival, (rating, region) in enumerate(queued):
+        start = time.perf_counter()
+        pairs = lobby.join(("arrival", arrival), rating, region, 0.0)
+        pairTimes.append(time.perf_counter() - start)
+        assert len(pairs) == 1, "a newcomer with a queued rating must pair at once"
+    report("join + pair", pairTimes)
+    print(f"queue after arrivals: {len(lobby)}")
+
+    # Let the clock run: every window widens and the queue drains pair by pair
+    pollTimes = []
+    made = 0
+    now = 0.0
+    start = time.perf_counter()
+    while len(lobby) > args.regions:
+        now += 1.0 / 60
+        began = time.perf_counter()
+        pairs = lobby.poll(now)
+        if pairs:
+            pollTimes.append((time.perf_counter() - began) / len(pairs))
+            made += len(pairs)
+    elapsed = time.perf_counter() - start
+    report("poll, per pair", pollTimes)
+    print(f"drained: {made} pairs over {now:.1f} simulated seconds, {made / elapsed:,.0f} pairs/s of CPU")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Frame time benchmark for the client renderer. Plays a scripted match through
+#                           physics.Simulation and times each rendered frame (drawing plus display update), with
+#                           the cached Renderer and with the old full redraw it replaced.
+# Misc:                     Run from the repository root:  python3 -m benchmarks.benchRender --frames 3000
+#                           Uses SDL's dummy video driver unless SDL_VIDEODRIVER is already set, so it needs
+#                           no display. No frame rate cap: the numbers are pure rendering cost.
+# =================================================================================================
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from assets.code.helperCode import updateScore
+from assets.code.physics import *
+from assets.code.renderer import *
+
+
+def track_ball(sim: Simulation) -> None:
+    # Both players follow the ball, so rallies run long and points are still scored now and then
+    ballCenter = sim.ball.rect.y + BALL_SIZE // 2
+    for paddle in (sim.leftPaddle, sim.rightPaddle):
+        offset = ballCenter - (paddle.rect.y + PADDLE_HEIGHT // 2)
+        paddle.moving = "down" if offset > 3 else "up" if offset < -3 else ""
+
+
+def percentile(samples: list, fraction: float) -> float:
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def run(mode: str, frames: int, screen: pygame.Surface, scoreFont: pygame.font.Font,
+        winFont: pygame.font.Font) -> list:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Render `frames` frames of a scripted match in the given mode
+    # Pre:              pygame is initialized and screen is the display surface
+    # Post:             Returns the per-frame render times in seconds. "cached" uses Renderer, "full" repeats the
+    #                   old loop: clear the screen, draw every static rect, render the score text, update
+    screenWidth, screenHeight = screen.get_size()
+    topWall = pygame.Rect(-10, 0, screenWidth+20, 10)
+    bottomWall = pygame.Rect(-10, screenHeight-10, screenWidth+20, 10)
+    centerLine = [pygame.Rect((screenWidth/2)-5, i, 5, 5) for i in range(0, screenHeight, 10)]
+    renderer = Renderer(screen, [topWall, bottomWall] + centerLine, scoreFont, winFont)
+
+    sim = Simulation(screenWidth, screenHeight)
+    times = []
+    for _ in range(frames):
+        track_ball(sim)
+        sim.step()
+        ball, left, right = sim.ball.rect, sim.leftPaddle.rect, sim.rightPaddle.rect
+        ballRect = pygame.Rect(ball.x, ball.y, ball.w, ball.h)
+        leftRect = pygame.Rect(left.x, left.y, left.w, left.h)
+        rightRect = pygame.Rect(right.x, right.y, right.w, right.h)
+
+        start = time.perf_counter()
+        if mode == "cached":
+            pygame.display.update(renderer.draw([leftRect, rightRect, ballRect], sim.lScore, sim.rScore))
+        else:
+            screen.fill(BLACK)
+            pygame.draw.rect(screen, WHITE, ballRect)
+            for rect in centerLine:
+                pygame.draw.rect(screen, WHITE, rect)
+            pygame.draw.rect(screen, WHITE, leftRect)
+            pygame.draw.rect(screen, WHITE, rightRect)
+            pygame.draw.rect(screen, WHITE, topWall)
+            pygame.draw.rect(screen, WHITE, bottomWall)
+            scoreRect = updateScore(sim.lScore, sim.rScore, screen, WHITE, scoreFont)
+            pygame.display.update([topWall, bottomWall, ballRect, leftRect, rightRect, scoreRect])
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Client renderer frame time benchmark")
+    parser.add_argument("--frames", type=int, default=3000, help="frames per mode (default: 3000)")
+    parser.add_argument("--width", type=int, default=SCREEN_WIDTH, help=f"window width (default: {SCREEN_WIDTH})")
+    parser.add_argument("--height", type=int, default=SCREEN_HEIGHT,
+                        help=f"window height (default: {SCREEN_HEIGHT})")
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((args.width, args.height))
+    scoreFont = pygame.font.Font("./assets/fonts/pong-score.ttf", 32)
+    winFont = pygame.font.Font("./assets/fonts/visitor.ttf", 48)
+
+    print(f"video driver: {pygame.display.get_driver()}, {args.width}x{args.height}, {args.frames} frames per mode")
+    results = {}
+    for mode in ("full", "cached"):
+        times = sorted(run(mode, args.frames, screen, scoreFont, winFont))
+        results[mode] = sum(times) / len(times)
+        print(f"{mode:7s} frame ms: mean {results[mode] * 1000:.4f}  p50 {percentile(times, 0.50) * 1000:.4f}  "
+              f"p99 {percentile(times, 0.99) * 1000:.4f}  max {times[-1] * 1000:.4f}")
+    print(f"speedup: {results['full'] / results['cached']:.1f}x")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Match results store benchmark. Records a large number of synthetic results through
+#                           ResultsStore the way the server does, timing record() (the only part the server loop
+#                           pays for) and how fast the writer thread commits them, then times the leaderboard,
+#                           rank and history queries against the full database.
+# Misc:                     Run from the repository root:  python3 -m benchmarks.benchResults --results 1000000
+#                           The database goes to a temporary directory unless --db names a file. --rate paces
+#                           the results like a busy server would; by default they are recorded back to back.
+# =================================================================================================
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from assets.code.results import *
+
+
+def percentile(samples: list, fraction: float) -> float:
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def report(label: str, times: list) -> None:
+    times.sort()
+    print(f"{label:22s} mean {sum(times) / len(times) * 1e6:8.2f} us  p50 {percentile(times, 0.50) * 1e6:8.2f} us  "
+          f"p99 {percentile(times, 0.99) * 1e6:8.2f} us  max {times[-1] * 1e6:9.2f} us  ({len(times)} samples)")
+
+
+def synthetic(rng: random.Random, players: int, matchId: int, endedAt: float) -> MatchResult:
+    # A random pairing and a game won 5 to 0-4 in 30-180 seconds, one in twenty forfeited
+    left, right = rng.sample(range(players), 2)
+    winner = rng.choice(("left", "right"))
+    forfeit = None
+    if rng.random() < 0.05:
+        forfeit = "right" if winner == "left" else "left"
+        scores = (rng.randrange(5), rng.randrange(5))
+    else:
+        scores = (5, rng.randrange(5)) if winner == "left" else (rng.randrange(5), 5)
+    return MatchResult(endedAt, matchId, rng.uniform(30, 180), f"player{left}", f"player{right}", *scores,
+                       winner, forfeit, rng.uniform(0, 4), rng.uniform(0, 4))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Match results store benchmark")
+    parser.add_argument("--results", type=int, default=1000000, help="results to record (default: 1000000)")
+    parser.add_argument("--players", type=int, default=100000, help="distinct player names (default: 100000)")
+    parser.add_argument("--rate", type=float, help="results per second to record at (default: as fast as possible)")
+    parser.add_argument("--queries", type=int, default=2000, help="samples of each query (default: 2000)")
+    parser.add_argument("--db", help="database file to use (default: a temporary one, removed afterwards)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    tmp = None
+    path = args.db
+    if path is None:
+        tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp.name, "results.db")
+
+    # Build the results first, so only record() itself is timed
+    base = time.time()
+    results = [synthetic(rng, args.players, index + 1, base + index * 0.001) for index in range(args.results)]
+    store = ResultsStore(path)
+    recordTimes = []
+    start = time.perf_counter()
+    for index, result in enumerate(results):
+        if args.rate:
+            delay = start + index / args.rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        began = time.perf_counter()
+        store.record(result)
+        recordTimes.append(time.perf_counter() - began)
+    queued = time.perf_counter() - start
+    store.close()
+    elapsed = time.perf_counter() - start
+    del results
+    print(f"recorded {args.results} results for {args.players} players in {queued:.2f} s")
+    report("record()", recordTimes)
+    print(f"committed {store.written} results in {store.batches} transactions in {elapsed:.2f} s: "
+          f"{store.written / elapsed:,.0f} results/s" + (f", error {store.error}" if store.error else ""))
+
+    db = openResults(path)
+    names = [f"player{rng.randrange(args.players)}" for _ in range(args.queries)]
+    for label, query in (("leaderboard top 10", lambda name: leaderboard(db, 10)),
+                         ("leaderboard top 100", lambda name: leaderboard(db, 100)),
+                         ("player rank", lambda name: playerRank(db, name)),
+                         ("player history (20)", lambda name: playerHistory(db, name, 20))):
+        times = []
+        for name in names:
+            began = time.perf_counter()
+            query(name)
+            times.append(time.perf_counter() - began)
+        report(label, times)
+    print(f"top 3: {leaderboard(db, 3)}")
+    db.close()
+    print(f"database size: {os.path.getsize(path) / 2**20:.1f} MiB")
+    if tmp is not None:
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Measures how many concurrent matches and messages per second one pongServer
+#                           process (one core), or a Supervisor with --workers processes, can sustain. Simulated clients speak the same handshake
+#                           and per-frame protocol as pongClient.
+# Misc:                     Run from the repository root:  python3 -m benchmarks.benchServer --matches 1000
+#                           The server runs in its own process so its CPU time can be reported separately
+#                           from the load generators; with --workers it includes every worker process.
+# =================================================================================================
+
+import argparse
+import multiprocessing
+import os
+import resource
+import selectors
+import socket
+import sys
+import time
+
+from assets.code.delta import *
+from assets.code.protocol import *
+from pongServer import GameServer, Supervisor, TICK_RATE
+
+
+def raise_fd_limit() -> None:
+    # Thousands of sockets need more descriptors than the usual soft limit of 1024
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def run_server(ready: multiprocessing.Queue, stop: multiprocessing.Event, workers: int) -> None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Child process body: run a GameServer, or a Supervisor with `workers` workers, on an
+    #                   ephemeral port
+    # Pre:              ready/stop are shared with the parent
+    # Post:             Puts the bound port on ready, serves until stop is set, then puts its CPU seconds on ready
+    #                   (the workers' included: they are joined first, so the OS accounts them to this process)
+    raise_fd_limit()
+    sys.stdout = open(os.devnull, "w")  # per-connection prints would dominate the measurement
+    start = os.times()
+    server = GameServer("127.0.0.1", 0) if workers <= 1 else Supervisor("127.0.0.1", 0, workers)
+    ready.put(server.address[1])
+    while not stop.is_set():
+        server.run_once(0.1)
+    if workers > 1:
+        server.close()
+    end = os.times()
+    ready.put(sum(end[:4]) - sum(start[:4]))
+
+
+def run_clients(port: int, matches: int, rate: float, duration: float, binary: bool,
+                results: multiprocessing.Queue) -> None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Child process body: drive `matches` matches (two sockets each) against the server
+    # Pre:              The server is listening on 127.0.0.1:port
+    # Post:             Puts (connected sockets, messages sent, messages received, malformed, bytes received)
+    #                   on results. Binary clients send an INPUT frame `rate` times per second (flat out for rate 0)
+    #                   that also acknowledges their newest snapshot, and read the SNAPSHOT or DELTA the server
+    #                   pushes every tick. CSV clients send one state message and wait for the reply before
+    #                   sending the next, like pongClient does against a CSV-only server
+    raise_fd_limit()
+    selector = selectors.DefaultSelector()
+    socks = []
+    for _ in range(matches * 2):
+        sock = socket.create_connection(("127.0.0.1", port))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if binary:
+            sock.send(encodeHello())
+        socks.append(sock)
+
+    # Read every handshake only after all connections are open, so CSV clients wait out the
+    # server's HELLO grace period together instead of one after another
+    clients = []
+    for sock in socks:
+        decoder = None
+        if binary:
+            decoder = FrameDecoder()
+            while not decoder.feed(sock.recv(1024)):
+                pass
+        else:
+            sock.recv(1024)  # "640,480,left" or "640,480,right"
+        sock.setblocking(False)
+        state = {"sock": sock, "decoder": decoder, "tracker": SnapshotTracker(), "seq": 0, "due": 0.0,
+                 "waiting": False}
+        clients.append(state)
+        selector.register(sock, selectors.EVENT_READ, state)
+
+    interval = 1.0 / rate if rate > 0 else 0.0
+    sent = 0
+    received = 0
+    malformed = 0
+    received_bytes = 0
+    moves = ("up", "", "down")
+    end = time.perf_counter() + duration
+    while True:
+        now = time.perf_counter()
+        if now >= end:
+            break
+        for state in clients:
+            if not state["waiting"] and now >= state["due"]:
+                state["seq"] += 1
+                if binary:
+                    # Scripted paddle: sweep up, hold, sweep down; every input acks the newest snapshot
+                    tracker = state["tracker"]
+                    state["sock"].send(encodeInput(state["seq"], moves[(state["seq"] // 30) % 3],
+                                                   tracker.latestTick, tracker.needsResync))
+                else:
+                    # Format: paddleY,ballX,ballY,lScore,rScore,sync
+                    state["sock"].send(f"215,320,240,0,0,{state['seq']}".encode())
+                    state["waiting"] = True
+                sent += 1
+                state["due"] = now + interval
+        for key, _ in selector.select(timeout=0.001):
+            state = key.data
+            data = state["sock"].recv(65536)
+            received_bytes += len(data)
+            if binary:
+                try:
+                    for msgType, payload in state["decoder"].feed(data):
+                        received += 1
+                        if msgType == MSG_SNAPSHOT or msgType == MSG_DELTA:
+                            state["tracker"].apply(msgType, payload)
+                except ProtocolError:
+                    malformed += 1
+            elif len(data.decode().split(',')) == 6:
+                received += 1
+            else:
+                malformed += 1
+            state["waiting"] = False
+
+    for state in clients:
+        state["sock"].close()
+    results.put((len(clients), sent, received, malformed, received_bytes))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="pongServer capacity benchmark")
+    parser.add_argument("--matches", type=int, default=500, help="total concurrent matches (default: 500)")
+    parser.add_argument("--rate", type=float, default=60.0,
+                        help="messages per second per client, 0 for max throughput (default: 60)")
+    parser.add_argument("--duration", type=float, default=10.0, help="measurement seconds (default: 10)")
+    parser.add_argument("--procs", type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                        help="load generator processes (default: cores - 1)")
+    parser.add_argument("--protocol", choices=("binary", "csv"), default="binary",
+                        help="wire protocol the simulated clients speak (default: binary)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="server worker processes, as pongServer --workers (default: 1)")
+    args = parser.parse_args()
+
+    ready = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    server = multiprocessing.Process(target=run_server, args=(ready, stop, args.workers))
+    server.start()
+    port = ready.get()
+
+    results = multiprocessing.Queue()
+    per_proc = [args.matches // args.procs + (1 if i < args.matches % args.procs else 0) for i in range(args.procs)]
+    binary = args.protocol == "binary"
+    loaders = [multiprocessing.Process(target=run_clients,
+                                       args=(port, n, args.rate, args.duration, binary, results))
+               for n in per_proc if n]
+    started = time.perf_counter()
+    for proc in loaders:
+        proc.start()
+    totals = [results.get() for _ in loaders]
+    elapsed = time.perf_counter() - started
+    for proc in loaders:
+        proc.join()
+
+    stop.set()
+    server_cpu = ready.get()
+    server.join()
+
+    sockets = sum(t[0] for t in totals)
+    sent = sum(t[1] for t in totals)
+    received = sum(t[2] for t in totals)
+    malformed = sum(t[3] for t in totals)
+    received_bytes = sum(t[4] for t in totals)
+    messages = sent + received
+    print(f"matches:             {sockets // 2}")
+    print(f"clients:             {sockets} ({args.protocol})")
+    print(f"client send rate:    {'max' if args.rate <= 0 else f'{args.rate:g} msg/s per client'}")
+    print(f"messages in/out:     {sent} / {received} ({malformed} malformed)")
+    print(f"messages/sec:        {messages / args.duration:,.0f}")
+    if sockets:
+        print(f"bytes in/sec:        {received_bytes / args.duration:,.0f} "
+              f"({received_bytes / args.duration / sockets:,.0f} per client)")
+    print(f"server CPU seconds:  {server_cpu:.2f} over {elapsed:.2f}s wall"
+          + (f" ({args.workers} workers)" if args.workers > 1 else ""))
+    if server_cpu > 0:
+        print(f"messages/CPU-second: {messages / server_cpu:,.0f}")
+    if binary and sockets:
+        # Every client should get one snapshot per server tick
+        print(f"snapshots delivered: {received / (args.duration * sockets * TICK_RATE):.1%} of {TICK_RATE} Hz")
+    elif args.rate > 0 and sockets:
+        print(f"achieved/target:     {received / (args.duration * sockets * args.rate):.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,449 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Regression benchmark suite for the hot paths: CSV and binary message parse/format
+#                           cost, the server's receive path with and without copies, physics steps per second,
+#                           server round trips per second over loopback, headless frame render time, and the
+#                           cold start of a headless pongClient. Results can be saved as JSON and compared with an
+#                           earlier run, so a change to the protocol, Ball/Paddle physics, the server loop or
+#                           the renderer shows up as a number that moved.
+# Misc:                     Run from the repository root:  python3 -m benchmarks.benchSuite --json results.json
+#                           Compare with a saved run:       python3 -m benchmarks.benchSuite --compare results.json
+#                           --profile DIR runs every case under cProfile, writes DIR/<case>.prof (the server
+#                           case profiles the server process) and prints the top functions. Metric names end in
+#                           their unit; "_per_s" metrics are better higher, "_us"/"_ms"/"_bytes" ones better lower.
+#                           The render case needs pygame and is skipped without it.
+# =================================================================================================
+
+import argparse
+import cProfile
+import io
+import json
+import multiprocessing
+import os
+import platform
+import pstats
+import selectors
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from assets.code.delta import *
+from assets.code.physics import *
+from assets.code.protocol import *
+from pongServer import GameServer, parse_csv_state
+
+CASES = ("protocol", "receive", "physics", "server", "render", "startup")
+
+# Frames per read in the receive case: an INPUT and a PING, this many times over
+RECEIVE_BATCH = 16
+
+# Stages of the "[startup]" line pongClient prints, in milliseconds from its start
+STARTUP_STAGES = ("connected", "assets", "first frame", "first state")
+
+# Metric suffixes where a larger number is better; every other metric is a time (smaller is better)
+HIGHER_IS_BETTER = ("_per_s",)
+
+
+def percentile(samples: list, fraction: float) -> float:
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def rate(function, seconds: float, repeat: int = 3) -> float:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Measure how many calls of function() run per second
+    # Pre:              function takes no arguments and has no lasting side effects worth undoing
+    # Post:             Returns calls per second from the best of `repeat` runs of about seconds/repeat each
+    #                   (the best run is the one least disturbed by the rest of the machine)
+    batch = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(batch):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= 0.01:
+            break
+        batch *= 4
+    best = 0.0
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        end = start + seconds / repeat
+        while time.perf_counter() < end:
+            for _ in range(batch):
+                function()
+            calls += batch
+        best = max(best, calls / (time.perf_counter() - start))
+    return best
+
+
+def track_ball(sim: Simulation) -> None:
+    # Both players follow the ball, so rallies run long and every paddle angle shows up
+    ballCenter = sim.ball.rect.y + BALL_SIZE // 2
+    for paddle in (sim.leftPaddle, sim.rightPaddle):
+        offset = ballCenter - (paddle.rect.y + PADDLE_HEIGHT // 2)
+        paddle.moving = "down" if offset > 5 else "up" if offset < -5 else ""
+
+
+def bench_protocol(args: argparse.Namespace) -> dict:
+    # Message parse and format cost: the CSV exchange as the server and pongClient run it, and the binary frames
+    state = b"215,320,240,0,0,1234"
+    reply = (215, 320, 240, 0, 0, 1234)
+    fields = (215, 230, 320, 240, 1, 2, 0)
+    snapshot = encodeSnapshot(1234, *fields, 7)
+    stream = snapshot * 64
+    decoder = FrameDecoder()
+    delta = DeltaEncoder()
+    delta.encode(1, fields + (7,))
+    delta.ack(1)
+    moved = (220,) + fields[1:]
+    seconds = args.seconds
+    return {
+        "csv_parse_per_s": rate(lambda: parse_csv_state(state), seconds),
+        "csv_format_per_s": rate(lambda: ",".join(str(value) for value in reply).encode(), seconds),
+        "csv_client_format_per_s": rate(lambda: f"{215},{320},{240},{0},{0},{1234}".encode(), seconds),
+        "snapshot_encode_per_s": rate(lambda: encodeSnapshot(1234, *fields, 7), seconds),
+        "snapshot_decode_per_s": rate(lambda: decodeSnapshot(snapshot[HEADER.size:]), seconds),
+        "delta_encode_per_s": rate(lambda: delta.encode(2, moved + (7,)), seconds),
+        "frame_feed_per_s": rate(lambda: decoder.feed(stream), seconds) * 64,
+    }
+
+
+def bench_receive(args: argparse.Namespace) -> dict:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          The server's per-read work for a binary client, over a socketpair: receive a batch of
+    #                   INPUT and PING frames, parse them and build the PONG replies. "copy" is the path the server
+    #                   used to take (recv() into new bytes, FrameDecoder copying out every payload, each reply
+    #                   built as bytes); "inplace" is FrameReader decoding in its buffer with packed replies, as
+    #                   handle_frames() does now
+    # Pre:              None
+    # Post:             Returns frames handled per second by each path, and the most memory each allocates at once
+    #                   while handling one read (tracemalloc), which is what the garbage collector has to clean up
+    sender, receiver = socket.socketpair()
+    batch = (encodeInput(1, "up", 1234, False) + encodePing(1.0)) * RECEIVE_BATCH
+    decoder = FrameDecoder()
+    reader = FrameReader()
+    replies = memoryview(bytearray(2 * READ_BUFFER))
+
+    def copy() -> bytes:
+        sender.send(batch)
+        out = bytearray()
+        for msgType, payload in decoder.feed(receiver.recv(READ_BUFFER)):
+            if msgType == MSG_INPUT:
+                decodeInput(payload)
+            elif msgType == MSG_PING:
+                out += encodePong(payload, 1234.5)
+        return bytes(out)
+
+    def inplace() -> memoryview:
+        sender.send(batch)
+        reader.readFrom(receiver)
+        replied = 0
+        msgType = reader.next()
+        while msgType is not None:
+            if msgType == MSG_INPUT:
+                decodeInput(reader.buffer, reader.payload, reader.payloadEnd)
+            elif msgType == MSG_PING:
+                replied = packPong(replies, replied, PING.unpack_from(reader.buffer, reader.payload)[0], 1234.5)
+            msgType = reader.next()
+        return replies[:replied]
+
+    results = {}
+    for name, function in (("copy", copy), ("inplace", inplace)):
+        if bytes(function()) != encodePong(PING.pack(1.0), 1234.5) * RECEIVE_BATCH:
+            raise AssertionError(f"the {name} path answered wrongly")
+        results[f"recv_{name}_frames_per_s"] = rate(function, args.seconds) * 2 * RECEIVE_BATCH
+        tracemalloc.start()
+        peaks = []
+        for _ in range(100):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            function()
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        tracemalloc.stop()
+        results[f"recv_{name}_peak_alloc_bytes"] = float(sum(peaks) / len(peaks))
+    sender.close()
+    receiver.close()
+    return results
+
+
+def bench_physics(args: argparse.Namespace) -> dict:
+    # Steps per second of one Simulation with ball-tracking players (rallies, paddle hits, the odd point),
+    # at the default tick rate and at 20 Hz, plus the two Ball methods every collision calls
+    results = {}
+    for tickRate in (TICK_RATE, 20):
+        sim = Simulation(tickRate=tickRate)
+
+        def step() -> None:
+            track_ball(sim)
+            sim.step()
+            if sim.isOver():
+                sim.lScore = sim.rScore = 0
+        results[f"sim_step_{tickRate}hz_per_s"] = rate(step, args.seconds)
+    ball = Ball(Rect(320, 240, BALL_SIZE, BALL_SIZE), -5, 0)
+    results["ball_hit_paddle_per_s"] = rate(lambda: ball.hitPaddle(240), args.seconds)
+    results["ball_update_pos_per_s"] = rate(ball.updatePos, args.seconds)
+    return results
+
+
+def serve(ready: multiprocessing.Queue, stop: multiprocessing.Event, profilePath: str | None) -> None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Child process body: run a GameServer on an ephemeral port, under cProfile if asked
+    # Pre:              ready/stop are shared with the parent
+    # Post:             Puts the bound port on ready and serves until stop is set; the profile, if any, is
+    #                   written to profilePath before the process exits
+    sys.stdout = open(os.devnull, "w")  # per-connection prints would dominate the measurement
+    server = GameServer("127.0.0.1", 0)
+    ready.put(server.address[1])
+    profiler = cProfile.Profile() if profilePath else None
+    if profiler is not None:
+        profiler.enable()
+    while not stop.is_set():
+        server.run_once(0.1)
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(profilePath)
+
+
+def bench_server(args: argparse.Namespace) -> dict:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Closed-loop round trips against a real server over loopback
+    # Pre:              Nothing else needs the server process's core for the duration
+    # Post:             Returns round trips per second and RTT percentiles of --pairs pairs of CSV clients
+    #                   (send a state message, wait for the reply, repeat) and of as many binary clients doing
+    #                   PING/PONG, which also read every snapshot the server pushes in between
+    ready = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    profilePath = os.path.join(args.profile, "server.prof") if args.profile else None
+    server = multiprocessing.Process(target=serve, args=(ready, stop, profilePath))
+    server.start()
+    port = ready.get()
+    results = {}
+    try:
+        for binary in (False, True):
+            results.update(round_trips(port, args.pairs, args.seconds, binary))
+    finally:
+        stop.set()
+        server.join()
+    return results
+
+
+def round_trips(port: int, pairs: int, seconds: float, binary: bool) -> dict:
+    # One closed-loop run: every client keeps exactly one request in flight
+    socks = []
+    for _ in range(pairs * 2):
+        sock = socket.create_connection(("127.0.0.1", port))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if binary:
+            sock.send(encodeHello())
+        socks.append(sock)
+    selector = selectors.DefaultSelector()
+    clients = []
+    for sock in socks:
+        decoder = None
+        if binary:
+            decoder = FrameDecoder()
+            while not decoder.feed(sock.recv(1024)):
+                pass
+        else:
+            sock.recv(1024)  # "640,480,left" or "640,480,right", after the server's HELLO grace period
+        sock.setblocking(False)
+        state = {"sock": sock, "decoder": decoder, "sentAt": 0.0, "seq": 0}
+        clients.append(state)
+        selector.register(sock, selectors.EVENT_READ, state)
+
+    def send(state: dict) -> None:
+        state["seq"] += 1
+        state["sentAt"] = time.perf_counter()
+        if binary:
+            state["sock"].send(encodePing(state["sentAt"]))
+        else:
+            # Format: paddleY,ballX,ballY,lScore,rScore,sync
+            state["sock"].send(f"215,320,240,0,0,{state['seq']}".encode())
+
+    rtts = []
+    for state in clients:
+        send(state)
+    start = time.perf_counter()
+    end = start + seconds
+    while time.perf_counter() < end:
+        for key, _ in selector.select(timeout=0.01):
+            state = key.data
+            data = state["sock"].recv(65536)
+            if binary:
+                answered = any(msgType == MSG_PONG for msgType, payload in state["decoder"].feed(data))
+            else:
+                answered = bool(data)
+            if answered:
+                rtts.append(time.perf_counter() - state["sentAt"])
+                send(state)
+    elapsed = time.perf_counter() - start
+    for state in clients:
+        selector.unregister(state["sock"])
+        state["sock"].close()
+
+    rtts.sort()
+    name = "binary_ping" if binary else "csv"
+    return {f"{name}_round_trips_per_s": len(rtts) / elapsed,
+            f"{name}_rtt_p50_ms": percentile(rtts, 0.50) * 1000,
+            f"{name}_rtt_p99_ms": percentile(rtts, 0.99) * 1000}
+
+
+def bench_render(args: argparse.Namespace) -> dict:
+    # Headless frame time of the playGame renderer, plus the score text it redraws after each point
+    try:
+        from benchmarks.benchRender import pygame, run, updateScore
+    except ImportError as error:
+        return {"skipped": f"pygame is not available ({error})"}
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    scoreFont = pygame.font.Font("./assets/fonts/pong-score.ttf", 32)
+    winFont = pygame.font.Font("./assets/fonts/visitor.ttf", 48)
+    results = {}
+    for mode in ("cached", "full"):
+        times = sorted(run(mode, args.frames, screen, scoreFont, winFont))
+        results[f"frame_{mode}_mean_us"] = sum(times) / len(times) * 1e6
+        results[f"frame_{mode}_p99_us"] = percentile(times, 0.99) * 1e6
+    results["update_score_per_s"] = rate(lambda: updateScore(3, 4, screen, (255, 255, 255), scoreFont), args.seconds)
+    pygame.quit()
+    return results
+
+
+def bench_startup(args: argparse.Namespace) -> dict:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Cold start of the command-line client: launch two headless pongClients against a fresh
+    #                   server (so they pair at once) and read the stage times each prints
+    # Pre:              Run from the repository root, with pygame installed
+    # Post:             Returns the mean over --launches pairs of clients of every stage, plus "process" (from
+    #                   spawning the interpreter to the startup line, interpreter start included); the clients
+    #                   are killed as soon as they have reported
+    ready = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    server = multiprocessing.Process(target=serve, args=(ready, stop, None))
+    server.start()
+    port = ready.get()
+    samples = {stage: [] for stage in STARTUP_STAGES + ("process",)}
+    try:
+        for _ in range(args.launches):
+            clients = []
+            for _ in range(2):
+                spawnedAt = time.perf_counter()
+                clients.append((spawnedAt, subprocess.Popen(
+                    [sys.executable, "pongClient.py", "--headless", "--port", str(port)],
+                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)))
+            for spawnedAt, client in clients:
+                for line in client.stdout:
+                    if line.startswith("[startup]"):
+                        samples["process"].append((time.perf_counter() - spawnedAt) * 1000)
+                        for part in line[len("[startup]"):].split(","):
+                            stage, value = part.strip().rsplit(" ", 2)[:2]
+                            samples[stage].append(float(value))
+                        break
+            for spawnedAt, client in clients:
+                client.kill()
+                client.wait()
+    finally:
+        stop.set()
+        server.join()
+    return {f"{stage.replace(' ', '_')}_ms": sum(values) / len(values) for stage, values in samples.items() if values}
+
+
+def run_case(name: str, args: argparse.Namespace) -> dict:
+    # Run one case, under cProfile when --profile is given (the server case profiles its server process instead,
+    # and the startup case, which only waits on other processes, is not profiled)
+    function = globals()[f"bench_{name}"]
+    if not args.profile or name in ("server", "startup"):
+        results = function(args)
+    else:
+        profiler = cProfile.Profile()
+        results = profiler.runcall(function, args)
+        profiler.dump_stats(os.path.join(args.profile, f"{name}.prof"))
+    if args.profile and os.path.exists(os.path.join(args.profile, f"{name}.prof")):
+        text = io.StringIO()
+        pstats.Stats(os.path.join(args.profile, f"{name}.prof"), stream=text).sort_stats("tottime").print_stats(10)
+        print(text.getvalue().rstrip())
+    return results
+
+
+def environment() -> dict:
+    # What the numbers were measured on, so runs from different machines are not compared by mistake
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": commit, "python": platform.python_version(),
+            "implementation": platform.python_implementation(), "platform": platform.platform(),
+            "machine": platform.machine(), "cpus": os.cpu_count()}
+
+
+def compare(baseline: dict, results: dict, tolerance: float) -> bool:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Print every metric next to the same metric of an earlier run
+    # Pre:              baseline and results are the "results" sections of two JSON files
+    # Post:             Returns False when some metric got worse by more than tolerance (a fraction)
+    ok = True
+    for case, metrics in results.items():
+        old = baseline.get(case, {})
+        for metric, value in metrics.items():
+            if not isinstance(value, (int, float)) or not isinstance(old.get(metric), (int, float)):
+                continue
+            before = old[metric]
+            change = (value - before) / before if before else 0.0
+            worse = -change if metric.endswith(HIGHER_IS_BETTER) else change
+            flag = ""
+            if worse > tolerance:
+                flag = "  REGRESSION"
+                ok = False
+            print(f"{case}.{metric:32s} {before:14,.2f} -> {value:14,.2f}  {change:+7.1%}{flag}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark suite for the protocol, physics, server and renderer")
+    parser.add_argument("cases", nargs="*", metavar="CASE",
+                        help=f"cases to run, any of {', '.join(CASES)} (default: all)")
+    parser.add_argument("--seconds", type=float, default=1.0,
+                        help="time per measurement; longer is steadier (default: 1.0)")
+    parser.add_argument("--pairs", type=int, default=10, help="client pairs for the server case (default: 10)")
+    parser.add_argument("--frames", type=int, default=1000, help="frames per render mode (default: 1000)")
+    parser.add_argument("--launches", type=int, default=3,
+                        help="pairs of clients launched by the startup case (default: 3)")
+    parser.add_argument("--json", metavar="FILE", help="save the results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="compare with a JSON file saved by an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="change counted as a regression by --compare, as a fraction (default: 0.10)")
+    parser.add_argument("--profile", metavar="DIR",
+                        help="run every case under cProfile, saving DIR/<case>.prof; the profiler slows every "
+                             "number down, so do not save or compare profiled runs")
+    args = parser.parse_args()
+    for name in args.cases:
+        if name not in CASES:
+            parser.error(f"unknown case {name!r} (choose from {', '.join(CASES)})")
+    if args.profile:
+        os.makedirs(args.profile, exist_ok=True)
+
+    results = {}
+    for name in args.cases or CASES:
+        print(f"== {name}")
+        results[name] = run_case(name, args)
+        for metric, value in results[name].items():
+            print(f"{metric:34s} {value:14,.2f}" if isinstance(value, float) else f"{metric:34s} {value}")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"environment": environment(), "arguments": vars(args), "results": results}, file, indent=2)
+        print(f"saved {args.json}")
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        print(f"== compared with {args.compare} (commit {baseline['environment'].get('commit')})")
+        if not compare(baseline["results"], results, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+# =================================================================================================
+# Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
+# Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
+# Date:                     Nov 25, 2025
+# Purpose:                  Headless load generator for pongServer. Opens hundreds to thousands of simulated
+#                           players from one process, each speaking the same handshake and per-tick protocol
+#                           as pongClient, and reports round-trip time percentiles, message throughput and
+#                           dropped or malformed frames so server saturation points can be found locally.
+# Misc:                     Uses asyncio, so every bot is a coroutine rather than a thread. Needs neither
+#                           pygame nor a display. Binary bots measure RTT with PING/PONG frames; CSV bots
+#                           measure the request/response time of each state message.
+#                           --spectators adds read-only viewers (binary protocol) to the matches in progress.
+#                           --rating-spread gives binary bots random ratings, so the server's lobby has to
+#                           pair them by rating instead of in arrival order.
+#                           Example:  python3 pongBot.py --clients 1000 --duration 30
+#                                     python3 pongBot.py --clients 2 --spectators 500
+# =================================================================================================
+
+import argparse
+import asyncio
+import random
+import resource
+import socket
+import struct
+import time
+
+from assets.code.delta import *
+from assets.code.lobby import DEFAULT_RATING
+from assets.code.physics import *
+from assets.code.protocol import *
+
+
+# Spectators wait this long after the last player connected, so the server has seated everyone
+HANDSHAKE_WAIT = 0.5
+
+# Longest a player waits for its WELCOME, which the server's lobby holds back until it finds an opponent
+HANDSHAKE_TIMEOUT = 10.0
+
+
+class BotStats:
+    # Counters shared by every bot in the process (asyncio runs them on one thread, so no locking)
+    def __init__(self) -> None:
+        self.connected = 0
+        self.connectFailures = 0
+        self.disconnects = 0
+        self.sent = 0
+        self.received = 0
+        self.snapshots = 0
+        self.deltas = 0
+        self.bytesReceived = 0
+        self.dropped = 0
+        self.malformed = 0
+        self.rtts = []
+        self.handshakes = []
+        self.watching = 0
+        self.spectatorSnapshots = 0
+        self.spectatorSkipped = 0
+        self.spectatorBytes = 0
+        self.elapsed = 0.0
+
+
+def percentile(samples: list, fraction: float) -> float:
+    # Nearest-rank percentile of an already sorted list
+    if not samples:
+        return float("nan")
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def scriptedMove(paddleY: int, ballY: int) -> str:
+    # Scripted paddle: follow the ball's height with a small dead zone
+    offset = (ballY + BALL_SIZE // 2) - (paddleY + PADDLE_HEIGHT // 2)
+    if offset > 5:
+        return "down"
+    if offset < -5:
+        return "up"
+    return ""
+
+
+async def handshake(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, binary: bool,
+                    role: int = ROLE_PLAYER, matchId: int = 0, rating: int | None = None) -> tuple[str, FrameDecoder | None]:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Perform the same handshake as pongClient.joinServer
+    # Pre:              The connection is open
+    # Post:             Returns (side, decoder); decoder is None when the session runs the CSV protocol
+    if binary:
+        writer.write(encodeHello(role=role, matchId=matchId, rating=rating))
+    data = await reader.read(1024)
+    while len(data) < HEADER.size:
+        chunk = await reader.read(1024)
+        if not chunk:
+            raise ConnectionError("server closed the connection during the handshake")
+        data += chunk
+
+    if binary and isFrameStart(data):
+        decoder = FrameDecoder(version=HEADER.unpack_from(data)[1])
+        frames = decoder.feed(data)
+        while not frames:
+            frames = decoder.feed(await reader.read(1024))
+        screenWidth, screenHeight, side, tickRate = decodeWelcome(frames[0][1])
+        return side, decoder
+    # "screenWidth,screenHeight,playerSide"
+    return data.decode().split(',')[2], None
+
+
+async def playBinary(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, side: str,
+                     decoder: FrameDecoder, args: argparse.Namespace, stats: BotStats, stopAt: float) -> None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Play as a binary client: send INPUT frames and PINGs, read pushed SNAPSHOT/DELTA
+    #                   frames and PONGs
+    # Pre:              The handshake negotiated the binary protocol
+    # Post:             Runs until stopAt or until the server disconnects; updates stats throughout.
+    #                   A gap in snapshot ticks counts as dropped frames
+    view = {"paddleY": 215, "ballY": 240}
+    tracker = SnapshotTracker()
+    inputs = InputEncoder()
+
+    async def sender() -> None:
+        # Checks the scripted move input_rate times per second, but like pongClient only sends
+        # direction changes, snapshot acks, resync requests and a heartbeat
+        count = 0
+        interval = 1.0 / args.input_rate
+        pingEvery = max(1, round(args.input_rate / args.ping_rate))
+        while True:
+            count += 1
+            frame = inputs.encode(scriptedMove(view["paddleY"], view["ballY"]), tracker, decoder.version,
+                                  time.perf_counter())
+            if frame is not None:
+                writer.write(frame)
+                stats.sent += 1
+            if count % pingEvery == 0:
+                writer.write(encodePing(time.perf_counter(), decoder.version))
+                stats.sent += 1
+            await asyncio.sleep(interval)
+
+    senderTask = asyncio.create_task(sender())
+    lastTick = None
+    try:
+        while True:
+            remaining = stopAt - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                data = await asyncio.wait_for(reader.read(65536), remaining)
+            except asyncio.TimeoutError:
+                break
+            if not data:
+                stats.disconnects += 1
+                break
+            stats.bytesReceived += len(data)
+            try:
+                frames = decoder.feed(data)
+            except ProtocolError:
+                stats.malformed += 1
+                stats.disconnects += 1
+                break
+            for msgType, payload in frames:
+                stats.received += 1
+                try:
+                    if msgType == MSG_SNAPSHOT or msgType == MSG_DELTA:
+                        snapshot = tracker.apply(msgType, payload)
+                        if snapshot is None:
+                            # Delta against a baseline this bot does not hold; the sender asks for a keyframe
+                            stats.dropped += 1
+                            continue
+                        tick, (leftY, rightY, ballX, ballY, lScore, rScore, events, inputAck) = snapshot
+                        stats.snapshots += 1
+                        if msgType == MSG_DELTA:
+                            stats.deltas += 1
+                        if lastTick is not None and tick > lastTick + 1:
+                            stats.dropped += tick - lastTick - 1
+                        lastTick = tick
+                        view["paddleY"] = leftY if side == "left" else rightY
+                        view["ballY"] = ballY
+                    elif msgType == MSG_PONG:
+                        stats.rtts.append(time.perf_counter() - decodePong(payload))
+                    else:
+                        stats.malformed += 1
+                except struct.error:
+                    stats.malformed += 1
+    finally:
+        senderTask.cancel()
+        # Quitting, not dropping: the server frees the seat at once instead of holding it for a resume
+        if not writer.is_closing():
+            writer.write(encodeBye(decoder.version))
+
+
+async def watchBinary(reader: asyncio.StreamReader, decoder: FrameDecoder, args: argparse.Namespace,
+                      stats: BotStats, stopAt: float) -> None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Watch as a spectator: read the SNAPSHOT keyframes the server pushes, send nothing
+    # Pre:              The handshake attached this bot as a spectator
+    # Post:             Runs until stopAt or until the server disconnects. A gap in snapshot ticks counts as
+    #                   skipped frames; args.spectator_delay makes the bot read slowly on purpose
+    lastTick = None
+    while True:
+        remaining = stopAt - time.perf_counter()
+        if remaining <= 0:
+            break
+        try:
+            data = await asyncio.wait_for(reader.read(65536), remaining)
+        except asyncio.TimeoutError:
+            break
+        if not data:
+            stats.disconnects += 1
+            break
+        stats.spectatorBytes += len(data)
+        try:
+            frames = decoder.feed(data)
+        except ProtocolError:
+            stats.malformed += 1
+            stats.disconnects += 1
+            break
+        for msgType, payload in frames:
+            if msgType != MSG_SNAPSHOT or len(payload) != SNAPSHOT.size:
+                stats.malformed += 1
+                continue
+            tick = decodeSnapshot(payload)[0]
+            stats.spectatorSnapshots += 1
+            if lastTick is not None and tick > lastTick + 1:
+                stats.spectatorSkipped += tick - lastTick - 1
+            lastTick = tick
+        if args.spectator_delay:
+            await asyncio.sleep(args.spectator_delay)
+
+
+async def playCsv(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, args: argparse.Namespace,
+                  stats: BotStats, stopAt: float) -> None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Play as a CSV client: send one state message, wait for the reply, repeat
+    # Pre:              The handshake fell back to the CSV protocol
+    # Post:             Runs until stopAt or until the server disconnects. Every reply is an RTT sample;
+    #                   a reply that never comes within one second counts as dropped
+    interval = 1.0 / args.input_rate
+    paddleY = 215
+    step = PADDLE_SPEED
+    sync = 0
+    while time.perf_counter() < stopAt:
+        # Scripted paddle: sweep between the walls
+        if not 10 < paddleY + step < SCREEN_HEIGHT - 10 - PADDLE_HEIGHT:
+            step = -step
+        paddleY += step
+        sync += 1
+        sentAt = time.perf_counter()
+        # Format: paddleY,ballX,ballY,lScore,rScore,sync
+        writer.write(f"{paddleY},320,240,0,0,{sync}".encode())
+        stats.sent += 1
+        try:
+            data = await asyncio.wait_for(reader.read(1024), 1.0)
+        except asyncio.TimeoutError:
+            stats.dropped += 1
+            continue
+        if not data:
+            stats.disconnects += 1
+            return
+        stats.received += 1
+        if len(data.decode(errors="replace").split(',')) == 6:
+            stats.rtts.append(time.perf_counter() - sentAt)
+        else:
+            stats.malformed += 1
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - sentAt)))
+
+
+async def runBot(args: argparse.Namespace, stats: BotStats, stopAt: float, spectator: bool = False) -> None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Connect one simulated player (or spectator) and play (or watch) until stopAt
+    # Pre:              The server is reachable at args.host:args.port
+    # Post:             The connection is closed; connect failures and disconnects are counted in stats
+    startedAt = time.perf_counter()
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(args.host, args.port), 5.0)
+    except (OSError, asyncio.TimeoutError):
+        stats.connectFailures += 1
+        return
+    writer.get_extra_info("socket").setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    try:
+        if spectator:
+            side, decoder = await asyncio.wait_for(
+                handshake(reader, writer, True, ROLE_SPECTATOR, args.spectate_match), 5.0)
+            if decoder is None or side != "spectator":
+                raise ConnectionError("the server does not support spectators")
+            stats.watching += 1
+            await watchBinary(reader, decoder, args, stats, stopAt)
+            return
+        rating = DEFAULT_RATING + random.randint(-args.rating_spread, args.rating_spread) if args.rating_spread else None
+        side, decoder = await asyncio.wait_for(handshake(reader, writer, args.protocol == "binary", rating=rating),
+                                               HANDSHAKE_TIMEOUT)
+        stats.connected += 1
+        stats.handshakes.append(time.perf_counter() - startedAt)
+        if decoder is not None:
+            await playBinary(reader, writer, side, decoder, args, stats, stopAt)
+        else:
+            await playCsv(reader, writer, args, stats, stopAt)
+    except (OSError, ConnectionError, asyncio.TimeoutError, ProtocolError, IndexError):
+        stats.connectFailures += 1
+    finally:
+        writer.close()
+
+
+async def runFleet(args: argparse.Namespace) -> BotStats:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Start args.clients bots, ramping connections up at args.ramp per second
+    # Pre:              args is the parsed command line
+    # Post:             Returns the combined statistics once every bot has finished
+    stats = BotStats()
+    rampSeconds = args.clients / args.ramp + (HANDSHAKE_WAIT + args.spectators / args.ramp if args.spectators else 0)
+    stopAt = time.perf_counter() + rampSeconds + args.duration
+    bots = []
+    for index in range(args.clients):
+        bots.append(asyncio.create_task(runBot(args, stats, stopAt)))
+        # Connect in pairs so every bot gets an opponent and its match starts right away
+        if index % 2 == 1:
+            await asyncio.sleep(2.0 / args.ramp)
+    # Spectators join once the players are seated, so there are matches in progress to watch
+    await asyncio.sleep(HANDSHAKE_WAIT)
+    for index in range(args.spectators):
+        bots.append(asyncio.create_task(runBot(args, stats, stopAt, spectator=True)))
+        await asyncio.sleep(1.0 / args.ramp)
+    await asyncio.gather(*bots)
+    stats.elapsed = rampSeconds + args.duration
+    return stats
+
+
+def report(args: argparse.Namespace, stats: BotStats) -> None:
+    rtts = sorted(stats.rtts)
+    handshakes = sorted(stats.handshakes)
+    print(f"clients:          {stats.connected} connected / {args.clients} requested ({args.protocol})")
+    print(f"connect failures: {stats.connectFailures}, disconnects: {stats.disconnects}")
+    print(f"handshake ms:     p50 {percentile(handshakes, 0.50) * 1000:.2f}  p99 {percentile(handshakes, 0.99) * 1000:.2f}")
+    print(f"rtt ms:           p50 {percentile(rtts, 0.50) * 1000:.2f}  p95 {percentile(rtts, 0.95) * 1000:.2f}  "
+          f"p99 {percentile(rtts, 0.99) * 1000:.2f}  max {(rtts[-1] if rtts else float('nan')) * 1000:.2f}  "
+          f"({len(rtts)} samples)")
+    print(f"messages/sec:     {stats.sent / stats.elapsed:,.0f} out, {stats.received / stats.elapsed:,.0f} in")
+    if args.protocol == "binary":
+        print(f"snapshots:        {stats.snapshots} ({stats.deltas} deltas)")
+        print(f"bytes in/sec:     {stats.bytesReceived / stats.elapsed:,.0f} "
+              f"({stats.bytesReceived / max(1, stats.connected) / stats.elapsed:,.0f} per client)")
+    if args.spectators:
+        print(f"spectators:       {stats.watching} watching / {args.spectators} requested, "
+              f"{stats.spectatorSnapshots / max(1, stats.watching) / stats.elapsed:,.1f} snapshots/sec each, "
+              f"{stats.spectatorSkipped} skipped, {stats.spectatorBytes / stats.elapsed:,.0f} bytes/sec total")
+    print(f"dropped frames:   {stats.dropped}")
+    print(f"malformed frames: {stats.malformed}")
+
+
+def main() -> None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Parse the command line, run the bot fleet and print the report
+    # Pre:              A pongServer is running at --host/--port
+    # Post:             Statistics for the whole run are printed
+    parser = argparse.ArgumentParser(description="Headless load generator for pongServer")
+    parser.add_argument("--host", default="127.0.0.1", help="server address (default: localhost)")
+    parser.add_argument("--port", type=int, default=5555, help="server port (default: 5555)")
+    parser.add_argument("--clients", type=int, default=200, help="simulated players (default: 200)")
+    parser.add_argument("--duration", type=float, default=10.0,
+                        help="seconds to play once every bot is connected (default: 10)")
+    parser.add_argument("--protocol", choices=("binary", "csv"), default="binary",
+                        help="protocol the bots offer (default: binary)")
+    parser.add_argument("--input-rate", type=float, default=60.0,
+                        help="input updates per second per bot; binary bots only send changes (default: 60)")
+    parser.add_argument("--ping-rate", type=float, default=5.0,
+                        help="RTT probes per second per binary bot (default: 5)")
+    parser.add_argument("--ramp", type=float, default=500.0, help="new connections per second (default: 500)")
+    parser.add_argument("--spectators", type=int, default=0,
+                        help="read-only spectators to add once the players are seated (default: 0)")
+    parser.add_argument("--spectate-match", type=int, default=0,
+                        help="match the spectators watch (default: 0, the oldest match in progress)")
+    parser.add_argument("--spectator-delay", type=float, default=0.0,
+                        help="seconds each spectator pauses between reads, to simulate slow viewers (default: 0)")
+    parser.add_argument("--rating-spread", type=int, default=0,
+                        help="binary bots send a random rating up to this far from the default, so the server's "
+                             "lobby pairs them by rating (default: 0, no rating sent)")
+    args = parser.parse_args()
+
+    # Every bot needs a socket; raise the descriptor limit as far as the system allows
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    report(args, asyncio.run(runFleet(args)))
+
+if __name__ == "__main__":
+    main()
@@ -5,42 +5,93 @@
 # Purpose:                  This is the game client for multiplayer Pong. It connects to the server,
 #                           renders the game using pygame, handles user input, and synchronizes
 #                           game state with the server. The left player runs authoritative physics.
-# Misc:                     Uses non-blocking sockets (0.01s timeout) to prevent game freezing.
-#                           Tkinter GUI for initial connection. pygame for game rendering and audio.
+# Misc:                     Socket I/O runs on its own threads (assets/code/network.py), so the render loop
+#                           never waits on the network. Tkinter GUI for initial connection. pygame for game
+#                           rendering and audio.
+#                           Speaks the binary frame protocol (assets/code/protocol.py) when the server
+#                           supports it and falls back to the CSV protocol otherwise.
+#                           --replay FILE plays back a match recorded with pongServer.py --record instead.
+#                           --lockstep runs the match's simulation locally with rollback (assets/code/rollback.py)
+#                           and exchanges only inputs with the opponent.
+#                           A binary player PINGs the server every SYNC_INTERVAL to estimate its tick clock and
+#                           tells it its view lag, so a hit on the player's screen counts (assets/code/lagcomp.py).
+#                           --host/--port skip the Tk start screen: the client connects at once while pygame,
+#                           fonts and sounds load on another thread (assets/code/startup.py). tkinter is only
+#                           imported by the start screen and pygame only when a game starts, so a --headless
+#                           launch (no window, no audio, the paddle follows the ball) never loads tkinter.
+#                           The frame rate only caps drawing (--fps): whatever the client simulates itself steps at a
+#                           fixed rate (assets/code/interpolation.py FixedTimestep) and is drawn between steps.
 # =================================================================================================
 
-import pygame
-import tkinter as tk
+import time
+STARTED_AT = time.perf_counter()    # cold start timings count from here
+
+import argparse
+import os
 import sys
 import socket
+import threading
+
+from assets.code.delta import *
+from assets.code.interpolation import *
+from assets.code.lagcomp import *
+from assets.code.network import *
+from assets.code.physics import *
+from assets.code.protocol import *
+from assets.code.recording import *
+from assets.code.rollback import *
+from assets.code.startup import *
+
+# Seconds between attempts to reach the server again while resuming a dropped session
+RESUME_RETRY = 0.25
 
-from assets.code.helperCode import *
+# Frames drawn per second at most (--fps). The game runs at the same speed at any frame rate, so this only
+# trades smoother motion on high refresh rate displays for CPU time
+MAX_FPS = 120
 
 # This is the main game loop.  For the most part, you will not need to modify this.  The sections
 # where you should add to the code are marked.  Feel free to change any part of this project
 # to suit your needs.
-def playGame(screenWidth:int, screenHeight:int, playerPaddle:str, client:socket.socket) -> None:
+def playGame(screenWidth:int, screenHeight:int, playerPaddle:str, network:ClientNetwork,
+             tickRate:int = TICK_RATE, interpDelay:float = INTERP_DELAY, lockstep:bool = False,
+             assets:GameAssets | None = None, headless:bool = False, timer:StartupTimer | None = None,
+             fps:int = MAX_FPS) -> None:
+    # network owns the connection after the handshake (TCP or UDP); its decoder is None when the server
+    # only speaks the CSV protocol. playerPaddle is "spectator" when only watching a match. tickRate is
+    # the server's (from WELCOME) and interpDelay how far behind the newest snapshot the ball and
+    # opponent are drawn, in seconds. lockstep means the server paired us in lockstep mode: we simulate
+    # the match ourselves and only inputs cross the network. assets are loaded here unless an AssetLoader
+    # already did. headless means nobody is watching (SDL's dummy drivers): our paddle follows the ball
+    # and the game returns once it is won. timer records the first frame and first server state of a
+    # timed launch. fps caps the frame rate (0: none); anything simulated here steps at a fixed rate
+    # whatever it is, and is drawn interpolated between steps
+    import pygame
+    from assets.code.renderer import Renderer
+
+    decoder = network.decoder
     
     # Pygame inits
-    pygame.mixer.pre_init(44100, -16, 2, 2048)
+    if assets is None:
+        assets = loadAssets()
     pygame.init()
 
     # Constants
     WHITE = (255,255,255)
     clock = pygame.time.Clock()
-    scoreFont = pygame.font.Font("./assets/fonts/pong-score.ttf", 32)
-    winFont = pygame.font.Font("./assets/fonts/visitor.ttf", 48)
-    pointSound = pygame.mixer.Sound("./assets/sounds/point.wav")
-    bounceSound = pygame.mixer.Sound("./assets/sounds/bounce.wav")
+    scoreFont = assets.scoreFont
+    winFont = assets.winFont
+    pointSound = assets.pointSound
+    bounceSound = assets.bounceSound
 
     # Display objects
     screen = pygame.display.set_mode((screenWidth, screenHeight))
-    winMessage = pygame.Rect(0,0,0,0)
     topWall = pygame.Rect(-10,0,screenWidth+20, 10)
     bottomWall = pygame.Rect(-10, screenHeight-10, screenWidth+20, 10)
     centerLine = []
     for i in range(0, screenHeight, 10):
         centerLine.append(pygame.Rect((screenWidth/2)-5,i,5,5))
+    # The walls and center line never move, so the renderer draws them once
+    renderer = Renderer(screen, [topWall, bottomWall] + centerLine, scoreFont, winFont, WHITE)
 
     # Paddle properties and init
     paddleHeight = 50
@@ -51,10 +102,13 @@ def playGame(screenWidth:int, screenHeight:int, playerPaddle:str, client:socket.
 
     ball = Ball(pygame.Rect(screenWidth/2, screenHeight/2, 5, 5), -5, 0)
 
-    # Left player drives the core physics to give the server a single authority
-    isBallAuthority = playerPaddle == "left"
+    # A binary server runs the physics itself and the client only sends inputs. Against a CSV-only
+    # server the left player drives the core physics to give the server a single authority
+    isBallAuthority = playerPaddle == "left" and decoder is None
+    # Spectators send nothing and draw both paddles from the server's snapshots
+    spectating = playerPaddle == "spectator"
 
-    if playerPaddle == "left":
+    if playerPaddle in ("left", "spectator"):
         opponentPaddleObj = rightPaddle
         playerPaddleObj = leftPaddle
     else:
@@ -67,20 +121,43 @@ def playGame(screenWidth:int, screenHeight:int, playerPaddle:str, client:socket.
     sync = 0
     lastBallDX = 0
     lastBallDY = 0
-
-    # Set socket to non-blocking mode with a small timeout to prevent game freeze
-    client.settimeout(0.01)
+    # Binary protocol state: inputs sent, the interpolation buffer the ball and opponent are drawn from,
+    # and the prediction of our own paddle (the network threads track the snapshots received)
+    # (over UDP an input can be lost, so each one repeats the paddle direction)
+    inputs = InputEncoder(repeatMove=network.lossy)
+    snapshots = SnapshotBuffer(tickRate, interpDelay)
+    predictor = PaddlePredictor(playerPaddleObj, screenHeight)
+    playerField = 0 if playerPaddle == "left" else 1
+    # Lockstep mode: the match simulation, with the opponent's input predicted and corrected by rollback
+    session = RollbackSession(playerPaddle, screenWidth, screenHeight, tickRate) if lockstep else None
+    # Lag compensation: the server's tick clock, from PINGs, gives the view lag sent along with the inputs
+    compensated = decoder is not None and not spectating and not lockstep
+    network.clock = ClockSync(tickRate) if compensated else None
+    pingAt = None
+    events = 0
+    # CSV-only server: our local physics steps, and the positions before the last one, drawn between
+    timestep = FixedTimestep(TICK_RATE)
+    ballFrom = None
+    paddleFrom = playerPaddleObj.rect.y
+    lockstepClock = 0.0     # lockstep: ticks of the match clock elapsed, fractional
+    if headless:
+        fps = min(fps, TICK_RATE) if fps else TICK_RATE     # nobody watches, so one frame per tick is plenty
+
+    # Start the network threads; from here on the loop only queues and collects messages
+    network.start()
+    startedAt = time.perf_counter()     # tick 0 of a lockstep match
+    shownPoints = 0
+    csvPending = False
+    csvSentAt = 0.0
 
     while True:
-        # Wiping the screen
-        screen.fill((0,0,0))
-
         # Getting keypress events
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                network.close()
                 pygame.quit()
                 sys.exit()
-            elif event.type == pygame.KEYDOWN:
+            elif event.type == pygame.KEYDOWN and not spectating:
                 if event.key == pygame.K_DOWN:
                     playerPaddleObj.moving = "down"
 
@@ -90,217 +167,551 @@ def playGame(screenWidth:int, screenHeight:int, playerPaddle:str, client:socket.
             elif event.type == pygame.KEYUP:
                 playerPaddleObj.moving = ""
 
+        if headless and not spectating:
+            # No keyboard: follow the ball with a small dead zone, like pongBot's scripted players
+            offset = ball.rect.centery - playerPaddleObj.rect.centery
+            playerPaddleObj.moving = "down" if offset > 5 else "up" if offset < -5 else ""
+
         # ==================================================================================
         # AUTHORITATIVE PHYSICS SECTION (Left Player Only)
         # Only the left client runs this code to compute game physics
         # This prevents desync issues from multiple clients calculating different results
+        # Against a CSV-only server the physics and paddle movement run here in fixed steps of the 60 FPS game,
+        # as many as the time since the last frame holds (FixedTimestep), so the game plays at the same speed at
+        # any frame rate; a binary server runs them itself
         # ==================================================================================
-        if isBallAuthority and lScore <= 4 and rScore <= 4:
-            # Update ball position based on its velocity
-            ball.updatePos()
-            sync += 1  # Increment sync counter on every frame update
-
-            # Top wall collision detection
-            if ball.rect.top <= topWall.bottom:
-                ball.rect.top = topWall.bottom  # Prevent ball from going through wall
-                ball.hitWall()  # Reverse vertical velocity
-                bounceSound.play()
-                sync += 1  # Increment sync on collision event
-
-            # Bottom wall collision detection
-            if ball.rect.bottom >= bottomWall.top:
-                ball.rect.bottom = bottomWall.top
-                ball.hitWall()
-                bounceSound.play()
-                sync += 1
-
-            # Left paddle collision (check xVel < 0 to ensure ball is moving left)
-            if ball.rect.colliderect(leftPaddle.rect) and ball.xVel < 0:
-                ball.rect.left = leftPaddle.rect.right  # Position ball at paddle edge
-                ball.hitPaddle(leftPaddle.rect.centery)  # Bounce with angle based on hit position
-                bounceSound.play()
-                sync += 1
-
-            # Right paddle collision (check xVel > 0 to ensure ball is moving right)
-            if ball.rect.colliderect(rightPaddle.rect) and ball.xVel > 0:
-                ball.rect.right = rightPaddle.rect.left
-                ball.hitPaddle(rightPaddle.rect.centery)
-                bounceSound.play()
-                sync += 1
-
-            # Left side scoring (right player scores)
-            if ball.rect.left <= 0:
-                rScore += 1
-                pointSound.play()
-                ball.reset("right")  # Reset ball to move toward right player
-                lastBallDX = 0  # Reset delta tracking
-                lastBallDY = 0
-                sync += 1
-
-            # Right side scoring (left player scores)
-            if ball.rect.right >= screenWidth:
-                lScore += 1
-                pointSound.play()
-                ball.reset("left")  # Reset ball to move toward left player
-                lastBallDX = 0
-                lastBallDY = 0
-                sync += 1
-
-        # Store ball position before server update for delta calculation
-        # Used by right client to detect bounces for sound effects
-        oldBallX = ball.rect.x
-        oldBallY = ball.rect.y
+        for _ in range(timestep.advance(time.perf_counter()) if decoder is None else 0):
+            # Positions before the step, so frames drawn between steps can be drawn between the two
+            ballFrom = (ball.rect.x, ball.rect.y)
+            paddleFrom = playerPaddleObj.rect.y
+            if isBallAuthority and lScore <= 4 and rScore <= 4:
+                # Update ball position based on its velocity
+                ball.updatePos()
+                sync += 1  # Increment sync counter on every frame update
+
+                # Top wall collision detection
+                if ball.rect.top <= topWall.bottom:
+                    ball.rect.top = topWall.bottom  # Prevent ball from going through wall
+                    ball.hitWall()  # Reverse vertical velocity
+                    bounceSound.play()
+                    sync += 1  # Increment sync on collision event
+
+                # Bottom wall collision detection
+                if ball.rect.bottom >= bottomWall.top:
+                    ball.rect.bottom = bottomWall.top
+                    ball.hitWall()
+                    bounceSound.play()
+                    sync += 1
+
+                # Left paddle collision (check xVel < 0 to ensure ball is moving left)
+                if ball.rect.colliderect(leftPaddle.rect) and ball.xVel < 0:
+                    ball.rect.left = leftPaddle.rect.right  # Position ball at paddle edge
+                    ball.hitPaddle(leftPaddle.rect.centery)  # Bounce with angle based on hit position
+                    bounceSound.play()
+                    sync += 1
+
+                # Right paddle collision (check xVel > 0 to ensure ball is moving right)
+                if ball.rect.colliderect(rightPaddle.rect) and ball.xVel > 0:
+                    ball.rect.right = rightPaddle.rect.left
+                    ball.hitPaddle(rightPaddle.rect.centery)
+                    bounceSound.play()
+                    sync += 1
+
+                # Left side scoring (right player scores)
+                if ball.rect.left <= 0:
+                    rScore += 1
+                    pointSound.play()
+                    ball.reset("right")  # Reset ball to move toward right player
+                    ballFrom = (ball.rect.x, ball.rect.y)  # drawn at the center at once, not slid there
+                    lastBallDX = 0  # Reset delta tracking
+                    lastBallDY = 0
+                    sync += 1
+
+                # Right side scoring (left player scores)
+                if ball.rect.right >= screenWidth:
+                    lScore += 1
+                    pointSound.play()
+                    ball.reset("left")  # Reset ball to move toward left player
+                    ballFrom = (ball.rect.x, ball.rect.y)
+                    lastBallDX = 0
+                    lastBallDY = 0
+                    sync += 1
+
+            # Update paddle positions based on their movement state
+            # Boundary checking prevents paddles from moving off-screen
+            for paddle in [playerPaddleObj, opponentPaddleObj]:
+                movePaddle(paddle, screenHeight)
 
         # =========================================================================================
         # CLIENT-SERVER COMMUNICATION SECTION
-        # Send local state to server and receive authoritative game state
-        # Protocol: CSV format with 6 fields
+        # Binary server: send our paddle input, receive the SNAPSHOT or DELTA frame of every server tick
+        # Send: INPUT (seq, then only what changed: direction, snapshot ack, resync request)
+        # Receive: SNAPSHOT (tick, leftPaddleY, rightPaddleY, ballX, ballY, lScore, rScore, events, inputAck)
+        #          or DELTA (the same fields as changes against a snapshot we acknowledged)
+        # CSV-only server: send local state to server and receive the synchronized game state
         # Send: paddleY,ballX,ballY,lScore,rScore,sync
         # Receive: oppPaddleY,ballX,ballY,lScore,rScore,sync
         # =========================================================================================
         
-        try:
-            # ===== SEND TO SERVER =====
+        # ===== SEND TO SERVER =====
+        # Bytes are only queued here; the network thread sends them, so a slow link never stalls a frame
+        if session is not None:
+            # Lockstep: take in the opponent's inputs that arrived (a rollback follows if they contradict what
+            # was predicted), then simulate up to our clock. Only changes of our input, plus a heartbeat, go out
+            for tick, moving in network.receive():
+                session.receive(tick, moving)
+                if timer is not None:
+                    timer.mark("first state")
+            # A slow frame catches up on the match clock at most MAX_CATCHUP_STEPS ticks per frame; the clock is
+            # shared with the opponent, so the ticks are spread over the next frames rather than dropped
+            lockstepClock = (time.perf_counter() - startedAt) * tickRate
+            target = min(int(lockstepClock) + 1, session.sim.tick + MAX_CATCHUP_STEPS)
+            events, frame = session.advance(target, playerPaddleObj.moving, decoder.version)
+            if frame:
+                network.send(frame)
+        elif decoder is not None:
+            # Only the input is sent; the server moves our paddle on its next tick.
+            # Nothing goes out on frames where the direction is unchanged and no ack is due, apart from a
+            # heartbeat each INPUT_HEARTBEAT. Spectators get a full snapshot every tick, so they send nothing
+            now = time.perf_counter()
+            viewLag = None
+            if compensated:
+                if pingAt is None or now - pingAt >= SYNC_INTERVAL:
+                    network.send(encodePing(now, decoder.version))
+                    pingAt = now
+                if snapshots.renderTick is not None:
+                    viewLag = network.clock.viewLag(snapshots.renderTick, now)
+            frame = None if spectating else inputs.encode(playerPaddleObj.moving, network.tracker, decoder.version,
+                                                          now, viewLag)
+            if frame is not None:
+                network.send(frame)
+        elif not csvPending or time.perf_counter() - csvSentAt > CSV_REPLY_TIMEOUT:
             # Transmit our current game state to the server
             # The server will relay our paddle position to the opponent
-            # and synchronize the ball/score state across both clients
+            # and synchronize the ball/score state across both clients.
+            # CSV replies have no delimiter, so only one request is kept in flight at a time
             msg = f"{playerPaddleObj.rect.y},{ball.rect.x},{ball.rect.y},{lScore},{rScore},{sync}"
-            client.send(msg.encode())  # Encode string to bytes for transmission
-            
-            # ===== RECEIVE FROM SERVER =====
-            # Get the synchronized game state from the server
-            # Server sends: opponent's paddle Y, authoritative ball position, scores, and sync counter
-            try:
-                response = client.recv(1024).decode()  # Receive up to 1024 bytes and decode
-                parts = response.split(',')  # Parse CSV format
-                
-                # Validate we received all 6 expected fields
-                if len(parts) == 6:
-                    # Parse the server response into individual variables
-                    oppPaddleY = float(parts[0])      # Opponent's paddle Y position
-                    serverBallX = float(parts[1])     # Authoritative ball X position
-                    serverBallY = float(parts[2])     # Authoritative ball Y position
-                    serverLScore = int(parts[3])      # Left player score
-                    serverRScore = int(parts[4])      # Right player score
-                    serverSync = int(parts[5])        # Server's sync counter
-                    
-                    # ===== UPDATE LOCAL STATE FROM SERVER =====
-                    # Server is authoritative for all game state
-                    
-                    # Update opponent paddle position (server relays this from the other client)
-                    opponentPaddleObj.rect.y = oppPaddleY
-                    
-                    # Detect if a point was scored (for sound effect on right client)
-                    scored = serverLScore > lScore or serverRScore > rScore
-                    if scored and not isBallAuthority:
-                        pointSound.play()  # Right client plays point sound when score changes
-
-                    # Calculate ball movement delta for bounce detection
-                    newDX = serverBallX - oldBallX
-                    newDY = serverBallY - oldBallY
-
-                    # Update ball position to server's authoritative position
-                    ball.rect.x = serverBallX
-                    ball.rect.y = serverBallY
-
-                    # Right client: Detect bounces by checking for direction changes
-                    # (Left client already plays sounds when computing physics)
-                    if not isBallAuthority and not scored:
-                        # Detect horizontal direction change (paddle bounce)
-                        if (lastBallDX > 0 and newDX < 0) or (lastBallDX < 0 and newDX > 0):
-                            bounceSound.play()
-                        # Detect vertical direction change (wall bounce)
-                        elif (lastBallDY > 0 and newDY < 0) or (lastBallDY < 0 and newDY > 0):
-                            bounceSound.play()
-                        lastBallDX = newDX  # Store for next frame comparison
-                        lastBallDY = newDY
-                    else:
-                        # Reset delta tracking after scoring or if we're the authority
-                        lastBallDX = 0
-                        lastBallDY = 0
-
-                    # Update local scores and sync counter from server
-                    lScore = serverLScore
-                    rScore = serverRScore
-                    sync = serverSync
-            except socket.timeout:
-                # No data received this frame - continue with local state
-                # This is normal behavior due to non-blocking socket
-                pass
-            except socket.error as e:
-                # Socket error indicates connection problem - exit game loop
-                print(f"Socket error: {e}")
+            network.send(msg.encode())  # Encode string to bytes for transmission
+            csvPending = True
+            csvSentAt = time.perf_counter()
+
+        # ===== RECEIVE FROM SERVER =====
+        # Whatever the network thread decoded since the last frame; often nothing, which is fine
+        if network.error is not None:
+            print(network.error)
+            if network.session is None:
                 break
-                    
-        except Exception as e:
-            # Catch-all for unexpected errors during server communication
-            print(f"Error communicating with server: {e}")
-            break
-            
+            # The server holds our seat for a while: reconnect, and start over from the keyframe it sends.
+            # The attempts (up to SESSION_GRACE) run on another thread so the window still answers meanwhile
+            attempt = []
+            resumer = threading.Thread(target=lambda: attempt.append(resume(network)), name="pong-resume",
+                                       daemon=True)
+            resumer.start()
+            while resumer.is_alive():
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        pygame.quit()
+                        sys.exit()
+                clock.tick(fps or TICK_RATE)
+            if not attempt or attempt[0] is None:
+                print("Could not resume the game")
+                network = None  # resume() closed the old one
+                break
+            network = attempt[0]
+            print("Resumed the game")
+            decoder = network.decoder
+            inputs = InputEncoder(repeatMove=network.lossy)
+            snapshots = SnapshotBuffer(tickRate, interpDelay)
+            network.clock = ClockSync(tickRate)
+            pingAt = None
+        serverStates = network.receive()
+        if serverStates and timer is not None:
+            timer.mark("first state")
+        if decoder is not None:
+            # Every snapshot is buffered with its arrival time and drawn later (see below)
+            for tick, fields, arrivedAt in serverStates:
+                snapshots.add(tick, fields, arrivedAt)
+            if serverStates and not spectating:
+                fields = serverStates[-1][1]
+                predictor.reconcile(fields[playerField], fields[INPUT_ACK_FIELD], inputs)
+            serverStates = []
+        elif serverStates:
+            csvPending = False
+
+        # Each state: opponent's paddle Y, authoritative ball X/Y, left/right score, server's sync counter
+        for oppPaddleY, serverBallX, serverBallY, serverLScore, serverRScore, serverSync in serverStates:
+            # Store ball position before server update for delta calculation
+            # Used by right client to detect bounces for sound effects
+            oldBallX = ball.rect.x
+            oldBallY = ball.rect.y
+
+            # ===== UPDATE LOCAL STATE FROM SERVER =====
+            # Server is authoritative for all game state
+
+            # Update opponent paddle position (server relays this from the other client)
+            opponentPaddleObj.rect.y = oppPaddleY
+
+            # Detect if a point was scored (for sound effect on right client)
+            scored = serverLScore > lScore or serverRScore > rScore
+            if scored and not isBallAuthority:
+                pointSound.play()  # Right client plays point sound when score changes
+
+            # Calculate ball movement delta for bounce detection
+            newDX = serverBallX - oldBallX
+            newDY = serverBallY - oldBallY
+
+            # Update ball position to server's authoritative position
+            ball.rect.x = serverBallX
+            ball.rect.y = serverBallY
+            ballFrom = None
+
+            # Right client: Detect bounces by checking for direction changes
+            # (Left client already plays sounds when computing physics)
+            if not isBallAuthority and not scored:
+                # Detect horizontal direction change (paddle bounce)
+                if (lastBallDX > 0 and newDX < 0) or (lastBallDX < 0 and newDX > 0):
+                    bounceSound.play()
+                # Detect vertical direction change (wall bounce)
+                elif (lastBallDY > 0 and newDY < 0) or (lastBallDY < 0 and newDY > 0):
+                    bounceSound.play()
+                lastBallDX = newDX  # Store for next frame comparison
+                lastBallDY = newDY
+            else:
+                # Reset delta tracking after scoring or if we're the authority
+                lastBallDX = 0
+                lastBallDY = 0
+
+            # Update local scores and sync counter from server
+            lScore = serverLScore
+            rScore = serverRScore
+            sync = serverSync
         # =========================================================================================
 
         # ===== PADDLE MOVEMENT =====
-        # Update paddle positions based on their movement state
-        # Boundary checking prevents paddles from moving off-screen
-        for paddle in [playerPaddleObj, opponentPaddleObj]:
-            if paddle.moving == "down":
-                # Check bottom boundary (leave 10px margin for wall)
-                if paddle.rect.bottomleft[1] < screenHeight-10:
-                    paddle.rect.y += paddle.speed
-            elif paddle.moving == "up":
-                # Check top boundary (leave 10px margin for wall)
-                if paddle.rect.topleft[1] > 10:
-                    paddle.rect.y -= paddle.speed
+        # Against a CSV-only server the paddles moved with the physics steps above
+        if session is not None:
+            # Lockstep: draw our own simulation, which already holds our newest input, between the state before
+            # its last tick and the one after it, as far as the match clock is into that tick
+            sim = session.sim
+            lScore = sim.lScore
+            rScore = sim.rScore
+            before = session.history[(sim.tick - 1) % len(session.history)] if sim.tick else sim.snapshot()
+            alpha = min(1.0, max(0.0, lockstepClock - (sim.tick - 1)))
+            leftPaddle.rect.y = blend(before[7], sim.leftPaddle.rect.y, alpha)
+            rightPaddle.rect.y = blend(before[8], sim.rightPaddle.rect.y, alpha)
+            if before[1:3] == (lScore, rScore):
+                ball.rect.x = blend(before[3], sim.ball.rect.x, alpha)
+                ball.rect.y = blend(before[4], sim.ball.rect.y, alpha)
+            else:
+                # The ball was reset to the center; sliding it there across the field would look like play
+                ball.rect.x = sim.ball.rect.x
+                ball.rect.y = sim.ball.rect.y
+            if events & EVENT_POINT:
+                pointSound.play()
+            elif events & EVENT_BOUNCE:
+                bounceSound.play()
+        else:
+            # Binary server: our paddle is predicted locally so it answers the keys without a round trip.
+            # The ball and the opponent are drawn interpolated between buffered snapshots, interpDelay
+            # in the past, so late or missing snapshots do not make them stutter
+            now = time.perf_counter()
+            if not spectating:
+                predictor.predict(now)
+            sampled = snapshots.sample(now)
+            if sampled is not None:
+                (leftPaddleY, rightPaddleY, ballX, ballY, lScore, rScore), events = sampled[0][:6], sampled[1]
+                if spectating:
+                    leftPaddle.rect.y = round(leftPaddleY)
+                    rightPaddle.rect.y = round(rightPaddleY)
+                else:
+                    opponentPaddleObj.rect.y = round(rightPaddleY if playerPaddle == "left" else leftPaddleY)
+                ball.rect.x = round(ballX)
+                ball.rect.y = round(ballY)
+                if network.scores is not None:
+                    # Scores only go up; a reliable SCORE message can be ahead of the snapshots drawn so far
+                    lScore = max(lScore, network.scores[0])
+                    rScore = max(rScore, network.scores[1])
+                # The point sound follows the score, so it plays even when the snapshot of the point was lost
+                if lScore + rScore > shownPoints:
+                    pointSound.play()
+                elif events & EVENT_BOUNCE:
+                    bounceSound.play()
+                shownPoints = lScore + rScore
 
         # ===== GAME OVER CHECK =====
         # First player to reach 5 points wins
+        winText = None
         if lScore > 4 or rScore > 4:
             winText = "Player 1 Wins! " if lScore > 4 else "Player 2 Wins! "
-            textSurface = winFont.render(winText, False, WHITE, (0,0,0))
-            textRect = textSurface.get_rect()
-            textRect.center = ((screenWidth/2), screenHeight/2)
-            winMessage = screen.blit(textSurface, textRect)
-        else:
-            # ===== BALL RENDERING =====
-            # Ball position comes from server (authoritative)
-            # Left client: Renders its own computed position (which it sent to server)
-            # Right client: Renders the position received from server
-            # This ensures both clients display synchronized ball movement
-            pygame.draw.rect(screen, WHITE, ball)
 
         # ===== RENDER ALL GAME ELEMENTS =====
-        # Draw the dotted center line
-        for i in centerLine:
-            pygame.draw.rect(screen, WHITE, i)
-        
-        # Draw both paddles at their current positions
-        for paddle in [playerPaddleObj, opponentPaddleObj]:
-            pygame.draw.rect(screen, WHITE, paddle)
-
-        # Draw walls
-        pygame.draw.rect(screen, WHITE, topWall)
-        pygame.draw.rect(screen, WHITE, bottomWall)
-        
-        # Update score display
-        scoreRect = updateScore(lScore, rScore, screen, WHITE, scoreFont)
-        
-        # Update only the regions that changed (more efficient than full screen update)
-        pygame.display.update([topWall, bottomWall, ball, leftPaddle, rightPaddle, scoreRect, winMessage])
+        # Ball position comes from server (authoritative); it is hidden once the game is over.
+        # Left client: Renders its own computed position (which it sent to server)
+        # Right client: Renders the position received from server
+        # The renderer restores the background only where things were last frame and draws them at their
+        # new positions; the score text is rendered once per score
+        # What this client steps itself (our predicted paddle; against a CSV-only server our paddle and the ball
+        # it simulates) is drawn between its last two steps, so it moves smoothly at frame rates above the step rate
+        playerRect = playerPaddleObj.rect
+        ballRect = ball.rect
+        if decoder is None:
+            alpha = timestep.alpha()
+            playerRect = playerRect.copy()
+            playerRect.y = blend(paddleFrom, playerPaddleObj.rect.y, alpha)
+            if ballFrom is not None:
+                ballRect = ballRect.copy()
+                ballRect.topleft = (blend(ballFrom[0], ball.rect.x, alpha), blend(ballFrom[1], ball.rect.y, alpha))
+        elif session is None and not spectating:
+            playerRect = playerRect.copy()
+            playerRect.y = predictor.drawnY()
+        movingRects = [playerRect, opponentPaddleObj.rect]
+        if winText is None:
+            movingRects.append(ballRect)
+        dirtyRects = renderer.draw(movingRects, lScore, rScore, winText)
+
+        # Update only the regions that changed, old and new positions alike
+        pygame.display.update(dirtyRects)
+        if timer is not None:
+            timer.mark("first frame")
+        if headless and winText is not None:
+            break
         
-        # Cap framerate at 60 FPS for consistent game speed
-        clock.tick(60)
+        # Cap the frame rate; game speed does not depend on it
+        clock.tick(fps)
         # =========================================================================================
         # End of main game loop
 
+    # The loop ends when the connection failed, or when a headless game is over; stop the network threads with it
+    if network is not None:
+        network.close()
+    if headless:
+        pygame.quit()
+
+
+
+
+
+# Seconds skipped by the seek keys in replay mode
+REPLAY_SEEK = 5.0
+
+def replayGame(path:str, speed:float = 1.0, startAt:float = 0.0) -> None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Play back a match recorded by pongServer.py --record
+    # Pre:              path is a recording (.pongrec, or its .pongidx index); speed > 0; startAt is in seconds
+    # Post:             The recording was shown until the window was closed. Keys: SPACE pauses, LEFT/RIGHT seek
+    #                   REPLAY_SEEK seconds, UP/DOWN double or halve the speed, N/P jump to the next or previous
+    #                   point. Every seek reads the tick straight from the memory-mapped log
+    import pygame
+    from assets.code.renderer import Renderer
+
+    recording = Recording(path)
+    tickRate = recording.tickRate
+    screenWidth, screenHeight = recording.screenWidth, recording.screenHeight
+
+    assets = loadAssets()
+    pygame.init()
+    WHITE = (255,255,255)
+    clock = pygame.time.Clock()
+    scoreFont = assets.scoreFont
+    winFont = assets.winFont
+    pointSound = assets.pointSound
+    bounceSound = assets.bounceSound
+
+    screen = pygame.display.set_mode((screenWidth, screenHeight))
+    topWall = pygame.Rect(-10,0,screenWidth+20, 10)
+    bottomWall = pygame.Rect(-10, screenHeight-10, screenWidth+20, 10)
+    centerLine = [pygame.Rect((screenWidth/2)-5,i,5,5) for i in range(0, screenHeight, 10)]
+    renderer = Renderer(screen, [topWall, bottomWall] + centerLine, scoreFont, winFont, WHITE)
+
+    leftPaddle = pygame.Rect(10, 0, PADDLE_WIDTH, PADDLE_HEIGHT)
+    rightPaddle = pygame.Rect(screenWidth-20, 0, PADDLE_WIDTH, PADDLE_HEIGHT)
+    ball = pygame.Rect(0, 0, BALL_SIZE, BALL_SIZE)
+
+    # position is the tick on screen, fractional so slow motion moves smoothly between records
+    position = float(recording.firstTick + int(startAt * tickRate))
+    playedTick = int(position)
+    paused = False
+    caption = None
+    lastTime = time.perf_counter()
+
+    while True:
+        seek = None
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                recording.close()
+                pygame.quit()
+                return
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == pygame.K_SPACE:
+                paused = not paused
+            elif event.key == pygame.K_UP:
+                speed *= 2
+            elif event.key == pygame.K_DOWN:
+                speed /= 2
+            elif event.key == pygame.K_RIGHT:
+                seek = position + REPLAY_SEEK * tickRate
+            elif event.key == pygame.K_LEFT:
+                seek = position - REPLAY_SEEK * tickRate
+            elif event.key == pygame.K_n:
+                seek = next((tick for tick in recording.points if tick > position + 1), None)
+            elif event.key == pygame.K_p:
+                # The point before the one just shown, so pressing P repeatedly keeps going back
+                earlier = [tick for tick in recording.points if tick < position - tickRate]
+                seek = earlier[-1] if earlier else recording.firstTick
+
+        now = time.perf_counter()
+        if not paused:
+            position += (now - lastTime) * tickRate * speed
+        lastTime = now
+        if seek is not None:
+            position = seek
+        position = min(max(position, recording.firstTick), recording.lastTick)
+
+        tick = int(position)
+        older = recording.record(tick)
+        newer = recording.record(tick + 1)
+        fraction = position - tick
+        leftPaddle.y = round(older[1] + (newer[1] - older[1]) * fraction)
+        rightPaddle.y = round(older[2] + (newer[2] - older[2]) * fraction)
+        if newer[7] & EVENT_POINT:
+            # The ball was reset to the center; do not slide it there
+            ball.x, ball.y = older[3], older[4]
+        else:
+            ball.x = round(older[3] + (newer[3] - older[3]) * fraction)
+            ball.y = round(older[4] + (newer[4] - older[4]) * fraction)
+        lScore, rScore = older[5], older[6]
+
+        # Sounds for the ticks played since the last frame, but not for the ones a seek jumped over
+        if seek is None and 0 < tick - playedTick <= tickRate:
+            events = 0
+            for passed in range(playedTick + 1, tick + 1):
+                events |= recording.record(passed)[7]
+            if events & EVENT_POINT:
+                pointSound.play()
+            elif events & EVENT_BOUNCE:
+                bounceSound.play()
+        playedTick = tick
+
+        status = (f"Replay of match {recording.matchId}: {(tick - recording.firstTick) // tickRate}s / "
+                  f"{recording.count // tickRate}s  x{speed:g}" + ("  (paused)" if paused else ""))
+        if status != caption:
+            pygame.display.set_caption(status)
+            caption = status
+
+        winText = None
+        if lScore > 4 or rScore > 4:
+            winText = "Player 1 Wins! " if lScore > 4 else "Player 2 Wins! "
+        movingRects = [leftPaddle, rightPaddle]
+        if winText is None:
+            movingRects.append(ball)
+        pygame.display.update(renderer.draw(movingRects, lScore, rScore, winText))
+        clock.tick(60)
+
+
+def connect(ip:str, port:int, udp:bool = False, role:int = ROLE_PLAYER, rating:int | None = None,
+            region:int = 0, session:tuple | None = None, name:str | None = None) -> tuple:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Connect to the game server and complete the handshake
+    # Pre:              The server at ip:port is running and accepting connections; session is the (matchId, token)
+    #                   to take back when role is ROLE_RESUME; name is the player name for the server's results
+    # Post:             Returns (network, screenWidth, screenHeight, playerPaddle, tickRate), network not started
+    #                   yet. Raises ConnectionError (or another OSError) when the server cannot be reached or does
+    #                   not support what role asks for, and SessionExpired when it refuses to resume
+    if udp and role == ROLE_LOCKSTEP:
+        raise ConnectionError("lockstep mode needs TCP")
+    if udp:
+        # UDP: no connection to set up, the handshake itself establishes the session
+        network = UdpClientNetwork((ip, port))
+        network.address = (ip, port)
+        screenWidth, screenHeight, playerPaddle, tickRate = network.handshake(role, rating=rating, region=region,
+                                                                              session=session, name=name)
+        return network, screenWidth, screenHeight, playerPaddle, tickRate
+
+    # ===== SOCKET INITIALIZATION =====
+    # Create TCP socket (SOCK_STREAM) with IPv4 addressing (AF_INET)
+    # TCP is used for reliable, ordered delivery of game state
+    client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    client.connect((ip, port))  # Establish connection to server
+    # Inputs are tiny and should leave at once, not wait for Nagle's algorithm to batch them
+    client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    # ===== INITIAL HANDSHAKE =====
+    # Offer the binary protocol, then receive configuration from server to determine our role in the game
+    # Server assigns "left" or "right" based on connection order
+    matchId, token = session if session is not None else (0, None)
+    client.send(encodeHello(role=role, matchId=matchId, rating=rating, region=region, token=token, name=name))
+    data = client.recv(1024)
+    while len(data) < HEADER.size:
+        chunk = client.recv(1024)
+        if not chunk:
+            break
+        data += chunk
+    if not data and role == ROLE_RESUME:
+        client.close()
+        raise SessionExpired("the server no longer holds this session")
+
+    if isFrameStart(data):
+        # Binary server: the configuration arrives as a WELCOME frame in the negotiated version
+        decoder = FrameDecoder(version=HEADER.unpack_from(data)[1])
+        frames = decoder.feed(data)
+        while not frames:
+            frames = decoder.feed(client.recv(1024))
+        msgType, payload = frames[0]
+        screenWidth, screenHeight, playerPaddle, tickRate = decodeWelcome(payload)
+        # A resumed session's keyframe usually arrives in the same read as the WELCOME
+        network = ClientNetwork(client, decoder, frames[1:])
+        network.session = decodeWelcomeSession(payload)
+    else:
+        # CSV-only server: it ignored our HELLO and sent "screenWidth,screenHeight,playerSide"
+        decoder = None
+        tickRate = TICK_RATE
+        parts = data.decode().split(',')  # Parse CSV format: ["640", "480", "left"]
+
+        # Extract configuration values
+        screenWidth = int(parts[0])   # Game window width in pixels
+        screenHeight = int(parts[1])  # Game window height in pixels
+        playerPaddle = parts[2]       # Our assigned side: "left" or "right"
+        if role != ROLE_PLAYER:
+            # A CSV-only server has no spectators or lockstep and just gave us a seat; leave it for a real player
+            client.close()
+            raise ConnectionError("this server does not support "
+                                  f"{'spectators' if role == ROLE_SPECTATOR else 'lockstep'}")
+        network = ClientNetwork(client, decoder)
+    network.address = (ip, port)
+    return network, screenWidth, screenHeight, playerPaddle, tickRate
 
 
+def resume(network:ClientNetwork) -> ClientNetwork | None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Reconnect to our seat after the connection dropped
+    # Pre:              network failed (its error is set) and has a session from the server's WELCOME
+    # Post:             Returns a started network for the same seat, whose first message is a full snapshot of the
+    #                   match, or None once the server refused the session or SESSION_GRACE passed without
+    #                   reaching it. The old network is closed either way
+    network.close(goodbye=False)
+    host, port = network.address
+    deadline = time.monotonic() + SESSION_GRACE
+    while time.monotonic() < deadline:
+        try:
+            resumed = connect(host, port, network.lossy, ROLE_RESUME, session=network.session)[0]
+        except SessionExpired:
+            return None
+        except OSError:
+            time.sleep(RESUME_RETRY)    # the network is still down, or the server not back yet
+            continue
+        resumed.start()
+        return resumed
+    return None
 
 
 # This is where you will connect to the server to get the info required to call the game loop.  Mainly
 # the screen width, height and player paddle (either "left" or "right")
 # If you want to hard code the screen's dimensions into the code, that's fine, but you will need to know
 # which client is which
-def joinServer(ip:str, port:str, errorLabel:tk.Label, app:tk.Tk) -> None:
+def joinServer(ip:str, port:str, errorLabel:"tk.Label", app:"tk.Tk", udp:bool = False, spectate:bool = False,
+               rating:int | None = None, region:int = 0, lockstep:bool = False, name:str | None = None,
+               fps:int = MAX_FPS) -> None:
     # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
     # Purpose:          Connect to the game server, receive initial configuration, and launch the game
     # Pre:              ip and port are valid; server is running and accepting connections; tkinter app window is open
@@ -316,38 +727,38 @@ def joinServer(ip:str, port:str, errorLabel:tk.Label, app:tk.Tk) -> None:
         port (str): Port number the server is listening on (e.g., "5555")
         errorLabel (tk.Label): Tkinter label widget for displaying status/error messages
         app (tk.Tk): Tkinter window object to be closed once game starts
+        udp (bool): Use the UDP transport (the server must run with --udp) instead of TCP
+        spectate (bool): Watch a match in progress instead of taking a seat (binary servers only)
+        rating (int | None): Matchmaking rating to be paired by; None leaves it to the server's default
+        region (int): Matchmaking region; only players of the same region are paired
+        lockstep (bool): Play in deterministic lockstep mode against another lockstep player (TCP, binary servers)
+        name (str | None): Player name the server saves match results under; None plays unnamed
+        fps (int): Frames drawn per second at most, 0 for no limit; the game speed does not depend on it
     
     Connection Protocol:
-        1. Client connects via TCP socket
-        2. Server sends: "screenWidth,screenHeight,playerSide" (e.g., "640,480,left")
+        1. Client connects via TCP socket and sends a HELLO frame offering the binary protocol
+        2. Server sends a WELCOME frame with screenWidth, screenHeight and playerSide, or a CSV-only
+           server sends: "screenWidth,screenHeight,playerSide" (e.g., "640,480,left")
         3. Client parses this and starts the game with assigned side
+        Over UDP the HELLO and WELCOME are the same frames, resent until acknowledged
+        A spectator's HELLO asks to watch; the WELCOME then names "spectator" as the side
+        A player waits in the server's lobby until an opponent is found, so the WELCOME may take a while
+        A binary player's WELCOME also carries a session, which playGame uses to resume() a dropped connection
     """
+    role = ROLE_SPECTATOR if spectate else ROLE_LOCKSTEP if lockstep else ROLE_PLAYER
     try:
-        # ===== SOCKET INITIALIZATION =====
-        # Create TCP socket (SOCK_STREAM) with IPv4 addressing (AF_INET)
-        # TCP is used for reliable, ordered delivery of game state
-        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        client.connect((ip, int(port)))  # Establish connection to server
-
-        # ===== INITIAL HANDSHAKE =====
-        # Receive configuration from server to determine our role in the game
-        # Server assigns "left" or "right" based on connection order
-        data = client.recv(1024).decode()  # Receive and decode configuration string
-        parts = data.split(',')  # Parse CSV format: [width, height, side]480", "left"]
-        
-        # Extract configuration values
-        screenWidth = int(parts[0])   # Game window width in pixels
-        screenHeight = int(parts[1])  # Game window height in pixels
-        playerPaddle = parts[2]       # Our assigned side: "left" or "right"
+        network, screenWidth, screenHeight, playerPaddle, tickRate = connect(ip, int(port), udp, role, rating,
+                                                                            region, name=name)
 
         # Update UI to show successful connection and assigned side
-        errorLabel.config(text=f"Connected! Playing as {playerPaddle}")
+        errorLabel.config(text=f"Connected{' over UDP' if udp else ''}! Playing as {playerPaddle}")
         errorLabel.update()  # Force GUI update before hiding window
 
         # ===== START GAME =====
         # Hide connection window and launch game with server-provided configuration
         app.withdraw()  # Hide the tkinter window (keeps it in memory)
-        playGame(screenWidth, screenHeight, playerPaddle, client)  # Enter main game loop
+        playGame(screenWidth, screenHeight, playerPaddle, network, tickRate,
+                 lockstep=role == ROLE_LOCKSTEP, fps=fps)  # Enter main game loop
         app.quit()  # Destroy the tkinter window after game ends
         
     except Exception as e:
@@ -356,8 +767,42 @@ def joinServer(ip:str, port:str, errorLabel:tk.Label, app:tk.Tk) -> None:
         errorLabel.update()
 
 
+def quickStart(ip:str, port:int, headless:bool = False, audio:bool = True, udp:bool = False, spectate:bool = False,
+               rating:int | None = None, region:int = 0, lockstep:bool = False, name:str | None = None,
+               fps:int = MAX_FPS) -> None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Launch straight into a game from the command line, without the Tk start screen
+    # Pre:              Called at startup, before anything imported pygame; the server is running at ip:port
+    # Post:             Connected and played like joinServer, with pygame, the fonts and the sounds loading on a
+    #                   thread during the handshake. Prints one "[startup]" line with the time to the WELCOME
+    #                   ("connected"), to the assets being ready, to the first frame and to the first server state.
+    #                   Exits with an error message when the connection fails
+    timer = StartupTimer(STARTED_AT)
+    if headless:
+        # SDL reads these when pygame initializes, which is why nothing may import pygame before this point
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    loader = AssetLoader(audio and not headless)
+    role = ROLE_SPECTATOR if spectate else ROLE_LOCKSTEP if lockstep else ROLE_PLAYER
+    try:
+        network, screenWidth, screenHeight, playerPaddle, tickRate = connect(ip, port, udp, role, rating, region,
+                                                                             name=name)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Error: {e}")
+    timer.mark("connected")
+    print(f"Connected{' over UDP' if udp else ''}! Playing as {playerPaddle}", flush=True)
+    assets = loader.result()
+    timer.mark("assets")
+    playGame(screenWidth, screenHeight, playerPaddle, network, tickRate, lockstep=role == ROLE_LOCKSTEP,
+             assets=assets, headless=headless, timer=timer, fps=fps)
+
+
 # This displays the opening screen, you don't need to edit this (but may if you like)
-def startScreen() -> None:
+def startScreen(rating: int | None = None, region: int = 0, lockstep: bool = False, name: str | None = None,
+                fps: int = MAX_FPS) -> None:
+    import tkinter as tk
+
     app = tk.Tk()
     app.title("Server Info")
 
@@ -378,18 +823,69 @@ def startScreen() -> None:
     portEntry = tk.Entry(app)
     portEntry.grid(column=1, row=2)
 
+    udpChoice = tk.BooleanVar(app, value=False)
+    udpCheck = tk.Checkbutton(app, text="Use UDP", variable=udpChoice)
+    udpCheck.grid(column=0, row=3)
+
+    spectateChoice = tk.BooleanVar(app, value=False)
+    spectateCheck = tk.Checkbutton(app, text="Spectate", variable=spectateChoice)
+    spectateCheck.grid(column=1, row=3)
+
     errorLabel = tk.Label(text="")
-    errorLabel.grid(column=0, row=4, columnspan=2)
+    errorLabel.grid(column=0, row=5, columnspan=2)
 
-    joinButton = tk.Button(text="Join", command=lambda: joinServer(ipEntry.get(), portEntry.get(), errorLabel, app))
-    joinButton.grid(column=0, row=3, columnspan=2)
+    joinButton = tk.Button(text="Join", command=lambda: joinServer(ipEntry.get(), portEntry.get(), errorLabel, app,
+                                                                   udpChoice.get(), spectateChoice.get(),
+                                                                   rating, region, lockstep, name, fps))
+    joinButton.grid(column=0, row=4, columnspan=2)
 
     app.mainloop()
 
 if __name__ == "__main__":
-    startScreen()
+    parser = argparse.ArgumentParser(description="Multiplayer Pong client")
+    parser.add_argument("--replay", metavar="FILE", help="play back a recording from pongServer.py --record")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed, e.g. 0.25 or 4 (default: 1)")
+    parser.add_argument("--start", type=float, default=0.0, help="seconds into the recording to start at")
+    parser.add_argument("--rating", type=int, help="matchmaking rating, 0-65534 (default: the server's)")
+    parser.add_argument("--region", type=int, default=0, help="matchmaking region, 0-255 (default: 0)")
+    parser.add_argument("--name", help=f"player name for the server's match results, up to {MAX_NAME} bytes "
+                                       f"(default: unnamed)")
+    parser.add_argument("--lockstep", action="store_true",
+                        help="simulate the match locally with rollback, sending only inputs (TCP only)")
+    parser.add_argument("--host", help="connect to this server right away instead of showing the start screen")
+    parser.add_argument("--port", type=int, default=5555, help="server port with --host (default: 5555)")
+    parser.add_argument("--headless", action="store_true",
+                        help="no window and no audio; the paddle follows the ball and the client exits when the "
+                             "game is won (implies --host 127.0.0.1 when --host is not given)")
+    parser.add_argument("--no-audio", action="store_true", help="do not open the audio device")
+    parser.add_argument("--fps", type=int, default=MAX_FPS,
+                        help=f"frames drawn per second at most, e.g. your display's refresh rate, 0 for no limit; "
+                             f"the game speed is the same at any frame rate (default: {MAX_FPS})")
+    parser.add_argument("--udp", action="store_true", help="use UDP with --host (the server must run with --udp)")
+    parser.add_argument("--spectate", action="store_true", help="watch a match instead of playing, with --host")
+    args = parser.parse_args()
+    if args.rating is not None and not 0 <= args.rating < RATING_DEFAULT:
+        parser.error(f"--rating must be between 0 and {RATING_DEFAULT - 1}")
+    if args.name is not None and not 0 < len(args.name.encode("utf-8")) <= MAX_NAME:
+        parser.error(f"--name must be 1 to {MAX_NAME} bytes long")
+    if not 0 <= args.region <= 0xFF:
+        parser.error("--region must be between 0 and 255")
+    if args.fps < 0:
+        parser.error("--fps must not be negative")
+    if args.replay is not None:
+        if args.speed <= 0:
+            parser.error("--speed must be positive")
+        try:
+            replayGame(args.replay, args.speed, args.start)
+        except (OSError, ValueError) as e:
+            sys.exit(f"Cannot replay {args.replay}: {e}")
+    elif args.host is not None or args.headless:
+        quickStart(args.host or "127.0.0.1", args.port, args.headless, not args.no_audio, args.udp, args.spectate,
+                   args.rating, args.region, args.lockstep, args.name, args.fps)
+    else:
+        startScreen(args.rating, args.region, args.lockstep, args.name, args.fps)
     
     # Uncomment the line below if you want to play the game without a server to see how it should work
     # the startScreen() function should call playGame with the arguments given to it by the server this is
     # here for demo purposes only
-    # playGame(640, 480,"left",socket.socket(socket.AF_INET, socket.SOCK_STREAM))
\ No newline at end of file
+    # playGame(640, 480,"left",ClientNetwork(socket.socket(socket.AF_INET, socket.SOCK_STREAM), None))
\ No newline at end of file
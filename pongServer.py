@@ -2,190 +2,1531 @@
 # Contributing Authors:	    Ehsanullah Dehzad, Fatima Fayazi, David Salas
 # Email Addresses:          ede274@uky.edu, ffa241@uky.edu, davidsalas@uky.edu
 # Date:                     Nov 25, 2025
-# Purpose:                  This server manages the game state for a multiplayer Pong game.
-#                           It handles connections from two clients, synchronizes paddle positions,
-#                           ball coordinates, and scores, and relays this information between players.
-# Misc:                     Uses TCP sockets for reliable communication. The left client is the
-#                           authoritative physics engine. Threading allows simultaneous client handling.
-#                           Communication protocol: CSV format for game state (6 fields).
+# Purpose:                  This server manages the game state for multiplayer Pong matches.
+#                           It pairs incoming connections into independent matches, synchronizes
+#                           paddle positions, ball coordinates, and scores, and relays this
+#                           information between the two players of each match.
+# Misc:                     Uses TCP sockets for reliable communication. The server is the authoritative
+#                           physics engine and steps every match at a fixed tick rate (assets/code/physics.py).
+#                           A single selectors event loop serves every connection of every match, so no
+#                           thread or global lock is needed per client.
+#                           Communication protocol: length-prefixed binary frames (assets/code/protocol.py)
+#                           for clients that send HELLO, CSV format for game state (6 fields) otherwise.
+#                           Binary TCP clients are read with recv_into() into a buffer of their own and their
+#                           frames parsed in place (FrameReader); replies are packed into one reused buffer.
+#                           With --udp the same frames are also accepted over UDP on the same port
+#                           (assets/code/udp.py), where snapshots are unreliable and the newest one wins.
+#                           Spectators watch a match read-only: each tick's snapshot is encoded once and the
+#                           same bytes go to every spectator, skipping frames a slow one cannot keep up with.
+#                           With --record DIR every game is also written to DIR (assets/code/recording.py) and
+#                           can be watched again with pongClient.py --replay.
+#                           Tick timing, handler latency, per-connection traffic, RTT and sync gap are always
+#                           measured (assets/code/metrics.py); --metrics-port serves them over HTTP in the
+#                           Prometheus text format and --metrics-log prints a summary line periodically.
+#                           Players wait in a matchmaking lobby (assets/code/lobby.py) until an opponent near
+#                           their rating and in their region is found; only then are they seated and sent the
+#                           handshake. A player whose opponent leaves waits there again, keeping the seat.
+#                           Lockstep players (ROLE_LOCKSTEP) simulate the match themselves with rollback
+#                           (assets/code/rollback.py); the server relays their inputs and steps its own copy
+#                           of the match only as far as both players' inputs are known, for spectators and
+#                           recordings.
+#                           Paddle hits are lag compensated (assets/code/lagcomp.py): a ball that got past a paddle
+#                           is judged again once that player's view lag has passed, against the paddle where the
+#                           player had it when the ball reached it on their screen, and replayed as a hit if so.
+#                           PONGs carry the match's tick clock so clients can work out their view lag.
+#                           With --workers N a Supervisor accepts connections and hands each one to one of N
+#                           worker processes, each running its own GameServer, so matches use every core.
+#                           A binary player whose connection drops keeps its seat for SESSION_GRACE seconds, with
+#                           its match paused, and can take it back by presenting its session token (ROLE_RESUME).
+#                           With --results FILE every finished game (won, or forfeited by a player leaving) is
+#                           saved to a SQLite database (assets/code/results.py) by a background writer, under the
+#                           names players give in their HELLO; the loop only queues the result.
 # =================================================================================================
 
+import argparse
+import itertools
+import math
+import multiprocessing
+import os
+import secrets
+import selectors
 import socket
-import threading
-
-# Use this file to write your server logic
-# You will need to support at least two clients
-# You will need to keep track of where on the screen (x,y coordinates) each paddle is, the score 
-# for each player and where the ball is, and relay that to each client
-# I suggest you use the sync variable in pongClient.py to determine how out of sync your two
-# clients are and take actions to resync the games
-
-# Global game state dictionary to store the current status of the game elements
-# This acts as the "source of truth" for the server
-gameState = {
-    "leftPaddleY": 215,  # Center (480/2 - 50/2)
-    "rightPaddleY": 215,
-    "ballX": 320,        # Center (640/2)
-    "ballY": 240,        # Center (480/2)
-    "lScore": 0,
-    "rScore": 0,
-    "sync": 0
-}
-
-# Lock to ensure thread-safe access to the global gameState
-# This prevents race conditions when multiple client threads try to read/write state simultaneously
-gameLock = threading.Lock()
-
-# Track connected clients to handle disconnections and reconnections
-connected_clients = {"left": None, "right": None}
-
-
-def reset_game_state() -> None:
-    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
-    # Purpose:          Reset the global game state to initial values when both clients disconnect
-    # Pre:              Called when both clients have disconnected (connected_clients["left"] and ["right"] are None)
-    # Post:             All gameState variables are reset to starting values
-    #                   (paddles centered, ball centered, scores 0, sync 0)
-    gameState["leftPaddleY"] = 215
-    gameState["rightPaddleY"] = 215
-    gameState["ballX"] = 320
-    gameState["ballY"] = 240
-    gameState["lScore"] = 0
-    gameState["rScore"] = 0
-    gameState["sync"] = 0
-    print("Game state reset.")
-
-
-def client_handler(client_socket: socket.socket, player_side: str) -> None:
+import struct
+import time
+
+from assets.code.delta import *
+from assets.code.lagcomp import *
+from assets.code.lobby import *
+from assets.code.metrics import *
+from assets.code.physics import *
+from assets.code.protocol import *
+from assets.code.recording import *
+from assets.code.results import *
+from assets.code.rollback import *
+from assets.code.udp import *
+
+# If the loop falls further behind than this many ticks, the backlog is dropped instead of replayed
+MAX_CATCHUP_TICKS = 5
+
+# Most ticks a LOCKSTEP message may be ahead of the server's copy of the match. A player runs up to MAX_ROLLBACK
+# ticks past the opponent's newest input, which a delayed burst can put MAX_ROLLBACK past the server's copy; later
+# ticks are malformed. It also bounds how far _step_lockstep() steps a match in one call
+LOCKSTEP_LEAD = 2 * MAX_ROLLBACK + LOCKSTEP_HEARTBEAT
+
+# Size of a single read from a CSV client socket (binary clients read into their FrameReader's buffer)
+RECV_SIZE = 1024
+
+# Bytes of the buffer the replies to one read are packed into. A reply is never longer than twice the frame
+# it answers (a 12-byte PING gets a 20-byte PONG), so the replies to a full READ_BUFFER always fit
+REPLY_BUFFER = 2 * READ_BUFFER
+
+# How long a new connection may take to send HELLO before it is treated as a CSV-only client.
+# CSV clients never speak first, so this is the only delay they see at connect time.
+HANDSHAKE_GRACE = 0.2
+
+# Send times remembered per match for RTT estimates, indexed by tick; an acknowledgement for an older
+# tick gives no sample. A power of two, so the low 16 bits of a tick (all an INPUT ack carries) suffice
+RTT_WINDOW = 256
+
+# RTT and sync gap are sampled from at most one acknowledgement per this many ticks per connection, which
+# is plenty for the histograms and keeps the cost off the per-input path
+ACK_SAMPLE_TICKS = 30
+
+# A TCP client with more than this many bytes it has not read yet is dropped. Snapshots are coalesced
+# while a backlog drains, so only replies and reliable messages can pile up this far
+MAX_OUTBUF = 64 * 1024
+
+# Adaptive send rate: a player's snapshot interval doubles (up to MIN_SEND_RATE snapshots per second)
+# when its backlog has not drained by the next snapshot or its RTT rose more than QUEUE_DELAY_LIMIT
+# seconds above the lowest seen, and shrinks by one tick after RECOVERY_SENDS snapshots without either
+MIN_SEND_RATE = 15
+QUEUE_DELAY_LIMIT = 0.05
+RECOVERY_SENDS = 30
+
+# A seated binary player that sent nothing for this many seconds is gone; clients send at least a heartbeat
+CLIENT_TIMEOUT = 5.0
+
+# A player's view lag (from its INPUTs) may exceed its measured RTT by at most this many seconds, the most
+# interpolation delay a client uses; a larger claim is cut down to that
+VIEW_DELAY_ALLOWANCE = 0.1
+
+# Largest HTTP request the metrics endpoint reads
+MAX_HTTP_REQUEST = 4096
+
+# Sharded mode (--workers): the fields each worker publishes in the shared status array
+STATUS_FIELDS = 4
+STATUS_HEARTBEAT, STATUS_CONNECTIONS, STATUS_MATCHES, STATUS_WAITING = range(STATUS_FIELDS)
+
+# The router skips a worker whose status is older than this (seconds); it is restarted if it died
+WORKER_TIMEOUT = 2.0
+
+# Sent with every handed-off socket: the router saw the client speak first (a HELLO, usually),
+# or the client stayed silent for HANDSHAKE_GRACE and is a CSV client to seat right away
+HANDOFF_BINARY = b"B"
+HANDOFF_CSV = b"C"
+
+
+class Match:
+    # One independent 2-player game. The simulation is the "source of truth" for the match; it only
+    # advances while both seats are taken, so a lone player waits for an opponent. Any number of
+    # spectators may watch; they take no seat.
+    def __init__(self, match_id: int, tick_rate: int = TICK_RATE) -> None:
+        self.match_id = match_id
+        self.tick_rate = tick_rate
+        self.sim = Simulation(SCREEN_WIDTH, SCREEN_HEIGHT, tick_rate)
+        self.lagcomp = LagCompensator(self.sim)
+        self.stepped_at = time.monotonic()  # when sim last stepped, for the tick clock in PONGs
+        self.clients = {"left": None, "right": None}
+        self.spectators = set()
+        self.recorder = None    # MatchRecorder while the server records this game
+        self.started_tick = 0       # sim tick the current players were paired at
+        self.result_saved = False   # this game's result went to the results store (or there is none)
+        # Lockstep matches: the clients simulate, and the server steps sim only through the ticks
+        # both players' inputs are known for
+        self.lockstep = False
+        self.inputs = {"left": InputLog(), "right": InputLog()}
+        self.sent_at = [0.0] * RTT_WINDOW   # send time of each recent tick's snapshots, by tick % RTT_WINDOW
+
+    def tick_clock(self, now: float) -> float:
+        # Ticks stepped plus the fraction of the next one elapsed; a paused match's clock stands still
+        return self.sim.tick + min(1.0, (now - self.stepped_at) * self.tick_rate)
+
+    def state(self, events: int = 0) -> tuple:
+        # The snapshot fields: (leftY, rightY, ballX, ballY, lScore, rScore, events)
+        sim = self.sim
+        return (sim.leftPaddle.rect.y, sim.rightPaddle.rect.y, sim.ball.rect.x, sim.ball.rect.y,
+                sim.lScore, sim.rScore, events)
+
+    def end_recording(self) -> None:
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def paddle(self, side: str) -> Paddle:
+        return self.sim.leftPaddle if side == "left" else self.sim.rightPaddle
+
+    def free_side(self) -> str | None:
+        # Returns the first open slot ("left" before "right"), or None when the match is full
+        if self.clients["left"] is None:
+            return "left"
+        if self.clients["right"] is None:
+            return "right"
+        return None
+
+    def is_empty(self) -> bool:
+        return self.clients["left"] is None and self.clients["right"] is None
+
+    def is_full(self) -> bool:
+        return self.free_side() is None
+
+
+class Connection:
+    # Per-socket bookkeeping for the event loop: which match and side the socket plays, which protocol
+    # it speaks (decoder is None for CSV clients), the snapshots it acknowledged (delta), any response
+    # bytes the kernel has not accepted yet, and its traffic and latency counters (stats)
+    def __init__(self, sock: socket.socket, addr: tuple, stats: ConnectionStats) -> None:
+        self.sock = sock
+        self.addr = addr
+        self.stats = stats
+        self.match = None
+        self.side = None
+        self.outbuf = bytearray()
+        self.decoder = None
+        self.version = PROTOCOL_VERSION
+        self.delta = DeltaEncoder()
+        self.input_seq = 0      # newest INPUT applied, echoed in snapshots for client-side prediction
+        self.sampled_tick = 0   # match tick of the last acknowledgement sampled for the metrics
+        self.rating = DEFAULT_RATING    # matchmaking rating and region, from the HELLO when it has them
+        self.region = DEFAULT_REGION
+        self.name = None        # player name from the HELLO, for the results store
+        self.lockstep = False   # asked for lockstep mode (ROLE_LOCKSTEP)
+        self.relay = []         # lockstep players: LOCKSTEP payloads received, still to forward to the opponent
+        # Spectators only: the newest snapshot that arrived while outbuf was still draining. It replaces
+        # the one before it, so a slow spectator skips frames and holds at most one frame in waiting
+        self.latest = None
+        # Binary players: the same for the player's own state, as (tick, fields), encoded once outbuf drains
+        self.pending_state = None
+        self.pending_events = 0     # events of the ticks since the last snapshot sent, ORed together
+        self.send_interval = 1      # ticks between snapshots, see adapt_send_rate()
+        self.next_send_tick = 0
+        self.clean_sends = 0
+        self.min_rtt = None         # lowest RTT sample, the link's delay without queueing
+        self.rtt_fresh = False      # an RTT sample arrived since the send rate last looked
+        self.view_lag = 0           # ticks between the ball the player sees and its input taking effect, as claimed
+        self.heard_at = time.monotonic()
+        self.token = None       # session token from the WELCOME; binary players that are not in lockstep
+        self.away = False       # the connection dropped and the seat is held for a ROLE_RESUME until expiry
+        self.bye = False        # the player quit (MSG_BYE), so the seat is given up at once
+
+
+class UdpConnection(Connection):
+    # A client on the UDP transport. There is no stream: sock is the server's shared UDP socket, addr
+    # identifies the client, and the channel numbers, acknowledges and retransmits its datagrams
+    def __init__(self, sock: socket.socket, addr: tuple, stats: ConnectionStats) -> None:
+        super().__init__(sock, addr, stats)
+        self.channel = ReliableChannel(time.monotonic())
+
+
+class RoomManager:
+    # Seats the players the lobby paired in matches, and spectators next to them. A match with a waiting
+    # player is filled before a new match is created; the player who waited longer takes the left side.
+    def __init__(self, first_id: int = 1, id_step: int = 1, tick_rate: int = TICK_RATE) -> None:
+        self.tick_rate = tick_rate
+        self.matches = {}
+        self.open_matches = {}  # match_id -> Match, insertion ordered so the oldest waiting match fills first
+        # Sharded workers number their matches first_id, first_id + id_step, ... so ids are unique across
+        # workers and the id alone tells the router which worker holds a match
+        self._ids = itertools.count(first_id, id_step)
+
+    def pair(self, first: Connection, second: Connection) -> Match:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Seat two players the lobby paired in one match
+        # Pre:              At most one of them is seated already (a player whose opponent left, waiting in
+        #                   its match); first is the one who waited longer
+        # Post:             Both are seated in the seated player's match, else in the oldest open match that is
+        #                   empty (kept for its spectators), else in a new match; the newcomers take the free
+        #                   sides in order. Lockstep players always start a new match, since both clients
+        #                   simulate it from the first tick. The match is full and no longer in open_matches.
+        #                   Returns it
+        match = first.match or second.match
+        if match is None and not first.lockstep:
+            match = next((m for m in self.open_matches.values() if m.is_empty()), None)
+        if match is None:
+            match = Match(next(self._ids), self.tick_rate)
+            match.lockstep = first.lockstep
+            self.matches[match.match_id] = match
+
+        for conn in (first, second):
+            if conn.match is None:
+                side = match.free_side()
+                match.clients[side] = conn
+                conn.match = match
+                conn.side = side
+        self.open_matches.pop(match.match_id, None)
+        return match
+
+    def watch(self, conn: Connection, match_id: int) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Attach a spectator to a match
+        # Pre:              conn has not been assigned yet; match_id is the match asked for, 0 for any
+        # Post:             conn.side is "spectator" and conn is in the match's spectators. Without a usable
+        #                   match_id the oldest match in progress is picked, then the oldest waiting one; with
+        #                   no match at all a new one is opened for the next players to fill
+        match = self.matches.get(match_id)
+        if match is None:
+            match = next((m for m in self.matches.values() if m.is_full()), None)
+        if match is None:
+            match = next(iter(self.matches.values()), None)
+        if match is None:
+            match = Match(next(self._ids), self.tick_rate)
+            self.matches[match.match_id] = match
+            self.open_matches[match.match_id] = match
+        match.spectators.add(conn)
+        conn.match = match
+        conn.side = "spectator"
+
+    def release(self, conn: Connection) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Free the slot held by a disconnected connection
+        # Pre:              conn was seated by assign()
+        # Post:             The slot is reopened and the leaving player's paddle stops; once both clients of a
+        #                   match are gone its game state is reset, and the match itself is discarded when no
+        #                   spectator is left watching either
+        match = conn.match
+        if match is None:
+            return
+        conn.match = None
+        if conn.side == "spectator":
+            match.spectators.discard(conn)
+            if match.is_empty() and not match.spectators:
+                self.open_matches.pop(match.match_id, None)
+                del self.matches[match.match_id]
+            return
+        match.clients[conn.side] = None
+        match.paddle(conn.side).moving = ""
+
+        if match.is_empty():
+            print(f"Match {match.match_id} ended. Game state reset.")
+            match.end_recording()
+            if not match.spectators:
+                self.open_matches.pop(match.match_id, None)
+                del self.matches[match.match_id]
+                return
+            # Spectators stay and watch whoever plays next in this match
+            match.sim = Simulation(SCREEN_WIDTH, SCREEN_HEIGHT, match.tick_rate)
+            match.lagcomp = LagCompensator(match.sim)
+            match.started_tick = 0
+            match.result_saved = False
+            match.lockstep = False
+            match.inputs = {"left": InputLog(), "right": InputLog()}
+        self.open_matches[match.match_id] = match
+
+
+def parse_csv_state(data: bytes) -> tuple | None:
     # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
-    # Purpose:          Handle continuous communication with a connected client, receiving
-    #                   their state and sending back synchronized game state
-    # Pre:              client_socket is a valid connected socket; player_side is either "left" or "right";
-    #                   gameState and connected_clients are initialized
-    # Post:             Client's paddle position is updated in gameState; if client's sync is newer, ball/score
-    #                   state is updated; opponent's state is sent back to client; on disconnect, client is removed
-    #                   from connected_clients and game may be reset
-
-    global gameState, connected_clients
-    
+    # Purpose:          Parse one CSV state message from a CSV-only client
+    # Pre:              data is what one recv() returned
+    # Post:             Returns (paddleY, ballX, ballY, lScore, rScore, sync), or None when the message was malformed
+    # Expected Format: paddleY,ballX,ballY,lScore,rScore,sync
     try:
+        parts = data.decode().split(',')
+        if len(parts) != 6:
+            return None
+        return float(parts[0]), float(parts[1]), float(parts[2]), int(parts[3]), int(parts[4]), int(parts[5])
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+def apply_state(conn: Connection, paddleY: float, ballX: float, ballY: float, lScore: int, rScore: int,
+                sync: int) -> tuple | None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Apply one full-state update from a client that does not send inputs, and build the reply
+    # Pre:              conn is seated in a match; the arguments are the fields of the client's state message
+    # Post:             Client's paddle is moved to the reported position, clamped to the field between the walls.
+    #                   The ball, scores and sync the client reports are ignored because the server simulation
+    #                   owns them; returns the reply fields (oppPaddleY, ballX, ballY, lScore, rScore, sync) with
+    #                   the server tick as sync, or None when paddleY is not a finite number
+    sim = conn.match.sim
+    if not math.isfinite(paddleY):
+        return None
+
+    # We only trust the client to update their OWN paddle position
+    conn.match.paddle(conn.side).rect.y = min(max(int(paddleY), 10), sim.screenHeight - 10 - PADDLE_HEIGHT)
+
+    # We send the OPPONENT'S paddle position so this client can render it.
+    oppPaddleY = conn.match.paddle("right" if conn.side == "left" else "left").rect.y
+
+    return oppPaddleY, sim.ball.rect.x, sim.ball.rect.y, sim.lScore, sim.rScore, sim.tick
+
+
+def handle_csv(conn: Connection, data: bytes) -> bytes | None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Serve one message from a CSV-only client
+    # Pre:              conn is seated in a match and did not negotiate the binary protocol
+    # Post:             Returns the encoded reply, or None when the message was malformed
+    conn.stats.messagesIn += 1
+    fields = parse_csv_state(data)
+    if fields is None:
+        conn.stats.malformed += 1
+        return None
+    state = apply_state(conn, *fields)
+    if state is None:
+        conn.stats.malformed += 1
+        return None
+    # The client echoes the server tick of the last reply it got, so the difference is how stale its view is
+    conn.stats.observeSyncGap(max(0, conn.match.sim.tick - fields[5]))
+    # Format: oppPaddleY,ballX,ballY,lScore,rScore,sync
+    return ",".join(str(value) for value in state).encode()
+
+
+def handle_frames(conn: Connection, reader: FrameReader, out: memoryview) -> int:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Serve the binary frames a client sent
+    # Pre:              conn negotiated the binary protocol; reader (conn.decoder) holds the frames received and
+    #                   not served yet; out has room for twice their bytes
+    # Post:             INPUT frames set the player's paddle direction for the next tick and move its delta
+    #                   baseline forward (or drop it on a resync request). LOCKSTEP frames from a lockstep
+    #                   player are logged for the match and queued in conn.relay, unless their tick is more
+    #                   than LOCKSTEP_LEAD past the match's. STATE frames are applied in arrival order and
+    #                   each answered with one STATE frame, PING frames with a PONG
+    #                   carrying the match's tick clock. An INPUT's view lag is kept for lag compensation.
+    #                   Spectators are read-only, so only their PINGs are served. BYE sets conn.bye.
+    #                   Snapshot acks also give RTT and sync gap samples for the metrics.
+    #                   Frames are decoded in place in the reader's buffer and the replies packed one after another
+    #                   at the start of out; returns their length (may be 0). Malformed and unknown frames are
+    #                   skipped; a bad frame header raises ProtocolError, as the rest of the stream is lost
+    replied = 0
+    watching = conn.side == "spectator"
+    buffer = reader.buffer
+    while True:
+        msgType = reader.next()
+        if msgType is None:
+            return replied
+        conn.stats.messagesIn += 1
+        try:
+            if watching and msgType != MSG_PING:
+                continue
+            if msgType == MSG_INPUT:
+                seq, moving, ackTick, resync, view_lag = decodeInput(buffer, reader.payload, reader.payloadEnd)
+                conn.input_seq = seq
+                if view_lag is not None:
+                    conn.view_lag = view_lag
+                if moving is not None:
+                    conn.match.paddle(conn.side).moving = moving
+                if resync:
+                    conn.delta.reset()
+                elif ackTick is not None:
+                    conn.delta.ack(ackTick)
+                    observe_ack(conn, ackTick)
+            elif msgType == MSG_LOCKSTEP:
+                if not conn.match.lockstep:
+                    conn.stats.malformed += 1
+                    continue
+                payload = reader.payloadBytes()     # kept in conn.relay until it is forwarded
+                tick, moving = decodeLockstep(payload)
+                if tick > conn.match.sim.tick + LOCKSTEP_LEAD:
+                    conn.stats.malformed += 1
+                    continue
+                conn.match.inputs[conn.side].add(tick, moving)
+                conn.relay.append(payload)
+            elif msgType == MSG_STATE:
+                state = apply_state(conn, *decodeState(reader.payloadBytes()))
+                if state is None:
+                    conn.stats.malformed += 1
+                    continue
+                replied = packState(out, replied, *state, version=conn.version)
+            elif msgType == MSG_BYE:
+                conn.bye = True
+            elif msgType == MSG_PING:
+                if reader.payloadEnd - reader.payload != PING.size:
+                    conn.stats.malformed += 1
+                    continue
+                (sent_at,) = PING.unpack_from(buffer, reader.payload)
+                replied = packPong(out, replied, sent_at, conn.match.tick_clock(time.monotonic()), conn.version)
+        except (struct.error, KeyError):
+            conn.stats.malformed += 1
+            continue
+
+
+def observe_ack(conn: Connection, ack_tick: int) -> None:
+    # A client acknowledged the snapshot of ack_tick (low 16 bits): it is that many ticks behind the match,
+    # and the time since the tick was sent estimates the round trip (plus up to one client frame)
+    match = conn.match
+    if match.sim.tick < conn.sampled_tick + ACK_SAMPLE_TICKS and match.sim.tick >= conn.sampled_tick:
+        return
+    conn.sampled_tick = match.sim.tick
+    gap = (match.sim.tick - ack_tick) & 0xFFFF
+    conn.stats.observeSyncGap(gap)
+    if gap < RTT_WINDOW:
+        sample = time.monotonic() - match.sent_at[ack_tick % RTT_WINDOW]
+        conn.stats.observeRtt(sample)
+        conn.min_rtt = sample if conn.min_rtt is None else min(conn.min_rtt, sample)
+        conn.rtt_fresh = True
+
+
+def compensated_lag(conn: Connection) -> int:
+    # A player's view lag as claimed, but no more than its measured RTT plus VIEW_DELAY_ALLOWANCE (in ticks), so a
+    # client cannot have its misses judged against where its paddle went long after it saw the ball
+    if conn.stats.rtt is None:
+        return 0
+    return min(conn.view_lag, round((conn.stats.rtt + VIEW_DELAY_ALLOWANCE) * conn.match.tick_rate))
+
+
+def adapt_send_rate(conn: Connection, max_interval: int) -> None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Choose how many ticks apart a player's snapshots go out, before one is sent
+    # Pre:              max_interval >= 1; conn is a binary player whose next snapshot is due
+    # Post:             conn.send_interval doubled (capped at max_interval) if the previous snapshots are still
+    #                   queued or a new RTT sample shows queueing delay, and shrank by one after RECOVERY_SENDS
+    #                   snapshots with neither. Halving the rate quickly and raising it slowly lets a link that
+    #                   was congested drain before it is filled again
+    congested = bool(conn.outbuf)
+    if conn.rtt_fresh:
+        conn.rtt_fresh = False
+        congested = congested or conn.stats.rtt - conn.min_rtt > QUEUE_DELAY_LIMIT
+    if congested:
+        conn.send_interval = min(max_interval, conn.send_interval * 2)
+        conn.clean_sends = 0
+    elif conn.send_interval > 1:
+        conn.clean_sends += 1
+        if conn.clean_sends >= RECOVERY_SENDS:
+            conn.send_interval -= 1
+            conn.clean_sends = 0
+
+
+class HttpClient:
+    # A connection to the metrics endpoint: the request read so far, then the response left to send
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.request = bytearray()
+        self.response = None
+
+
+class GameServer:
+    # Single-threaded server: one selector watches the listening socket and every client socket.
+    # Each match's state is only ever touched from this loop, so matches never contend on a lock.
+    def __init__(self, server_ip: str, server_port: int, tick_rate: int = TICK_RATE, udp: bool = False,
+                 record_dir: str | None = None, metrics_port: int | None = None,
+                 metrics_interval: float | None = None, handoff: socket.socket | None = None,
+                 shard: tuple | None = None, results_path: str | None = None) -> None:
+        # handoff and shard are only given to sharded workers: the socket the Supervisor passes connections
+        # over, and (worker index, worker count, shared status array)
+        self.selector = selectors.DefaultSelector()
+        self.shard = shard
+        self.rooms = RoomManager(1, 1, tick_rate) if shard is None else RoomManager(shard[0] + 1, shard[1], tick_rate)
+        self.lobby = Lobby()
+        # Connections that have not finished the handshake -> deadline for their HELLO.
+        # The grace period is constant, so insertion order is also deadline order.
+        self.handshakes = {}
+        # Session token -> the seated player it belongs to, and players away -> when their seat is given up
+        # (in deadline order, like handshakes)
+        self.sessions = {}
+        self.suspended = {}
+
+        self.tick_rate = tick_rate
+        self.tick_interval = 1.0 / tick_rate
+        self.max_send_interval = max(1, tick_rate // MIN_SEND_RATE)
+        self.next_tick = time.monotonic() + self.tick_interval
+        # Replies to the frames of one read are packed here, then copied into the client's outbuf (or datagram)
+        self.replies = memoryview(bytearray(REPLY_BUFFER))
+
+        # Directory games are recorded to, or None; recordings are numbered in the order their games start
+        self.record_dir = record_dir
+        self.recordings = itertools.count(1)
+        self.started_at = time.strftime("%Y%m%d-%H%M%S")
+        # Finished games are queued here for the results database, or None
+        self.results = ResultsStore(results_path) if results_path is not None else None
+
+        self.server = None
+        self.handoff = handoff
+        if handoff is None:
+            # Create a TCP/IP socket
+            # AF_INET = IPv4, SOCK_STREAM = TCP
+            self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server.bind((server_ip, server_port))
+            # A deep backlog lets bursts of players queue while the loop is busy with other matches
+            self.server.listen(socket.SOMAXCONN)
+            self.server.setblocking(False)
+            self.selector.register(self.server, selectors.EVENT_READ, None)
+            self.address = self.server.getsockname()
+        else:
+            # Sharded worker: the Supervisor owns the port and passes accepted connections over handoff
+            handoff.setblocking(False)
+            self.selector.register(handoff, selectors.EVENT_READ, None)
+            self.address = (server_ip, server_port)
+
+        # Optional UDP transport on the same port number; its clients are keyed by address
+        self.udp = None
+        self.udp_peers = {}
+        if udp:
+            self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.udp.bind(self.address)
+            self.udp.setblocking(False)
+            self.selector.register(self.udp, selectors.EVENT_READ, None)
+
+        self.metrics = ServerMetrics()
+        # Optional HTTP endpoint for the metrics, served by this same loop
+        self.metrics_sock = None
+        if metrics_port is not None:
+            self.metrics_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.metrics_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.metrics_sock.bind((server_ip, metrics_port))
+            self.metrics_sock.listen()
+            self.metrics_sock.setblocking(False)
+            self.selector.register(self.metrics_sock, selectors.EVENT_READ, None)
+        self.metrics_interval = metrics_interval
+        self.next_metrics_log = time.monotonic() + metrics_interval if metrics_interval else None
+        if shard is not None:
+            self._publish_status()
+
+    def serve_forever(self) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Run the event loop
+        # Pre:              The listening socket is bound
+        # Post:             Never returns
         while True:
-            # Receive data from client
-            # Expected Format: paddleY,ballX,ballY,lScore,rScore,sync
-            data = client_socket.recv(1024).decode()
-            if not data:
+            self.run_once(None)
+
+    def run_once(self, timeout: float | None) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Wait for socket readiness once and dispatch it
+        # Pre:              timeout is the longest wait in seconds, or None to wait indefinitely
+        # Post:             Accept, read and write readiness have been handled by the methods below,
+        #                   connections that stayed silent past HANDSHAKE_GRACE were seated as CSV clients,
+        #                   seats held past SESSION_GRACE were given up, and every match tick that came due has run
+        wait = max(0.0, self.next_tick - time.monotonic())
+        timeout = wait if timeout is None else min(timeout, wait)
+        if self.handshakes:
+            deadline = next(iter(self.handshakes.values()))
+            wait = max(0.0, deadline - time.monotonic())
+            timeout = wait if timeout is None else min(timeout, wait)
+
+        events = self.selector.select(timeout)
+        started = time.perf_counter()
+        for key, mask in events:
+            if key.data is None:
+                if key.fileobj is self.udp:
+                    self._read_udp()
+                elif key.fileobj is self.metrics_sock:
+                    self._accept_http()
+                elif key.fileobj is self.handoff:
+                    self._receive_handoff()
+                else:
+                    self._accept()
+            elif isinstance(key.data, HttpClient):
+                self._serve_http(key.data)
+            else:
+                if mask & selectors.EVENT_READ:
+                    self._read(key.data)
+                if mask & selectors.EVENT_WRITE and key.data.sock.fileno() != -1:
+                    self._flush(key.data)
+        if events:
+            self.metrics.handler.observe(time.perf_counter() - started)
+
+        now = time.monotonic()
+        while self.handshakes:
+            conn, deadline = next(iter(self.handshakes.items()))
+            if deadline > now:
+                break
+            # No HELLO: a CSV-only client waiting for "640,480,left"
+            conn.decoder = None
+            self._seat(conn)
+        while self.suspended:
+            conn, deadline = next(iter(self.suspended.items()))
+            if deadline > now:
                 break
-            
-            parts = data.split(',')
-            if len(parts) != 6:
+            print(f"Session of {conn.side} in match {conn.match.match_id} expired")
+            del self.suspended[conn]
+            conn.away = False
+            self._release(conn)
+
+        if now >= self.next_tick:
+            # Waiting players whose rating windows widened enough to accept each other
+            for first, second in self.lobby.poll(now):
+                self._start_match(first, second)
+            self.metrics.tickLateness.observe(now - self.next_tick)
+            behind = int((now - self.next_tick) / self.tick_interval) + 1
+            if behind > MAX_CATCHUP_TICKS:
+                # The loop stalled; skip ahead rather than running the matches in fast-forward
+                self.metrics.ticksSkipped += behind - 1
+                self.next_tick = now
+                behind = 1
+            for _ in range(behind):
+                started = time.perf_counter()
+                self._tick()
+                self.metrics.tick.observe(time.perf_counter() - started)
+            self.metrics.ticks += behind
+            self.next_tick += behind * self.tick_interval
+            if self.udp_peers:
+                self._service_udp(now)
+            if self.shard is not None:
+                self._publish_status()
+
+        if self.next_metrics_log is not None and now >= self.next_metrics_log:
+            print(self.metrics.summary(self._metric_labels(), now))
+            self.next_metrics_log = now + self.metrics_interval
+
+    def _tick(self) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Advance every full match by one physics tick and push the result to its players
+        # Pre:              Called once per tick interval from run_once()
+        # Post:             Each match with both seats taken has stepped once; binary clients received the new
+        #                   state as a DELTA against the snapshot they last acknowledged (or a SNAPSHOT keyframe),
+        #                   together with the sequence number of their newest input the server has applied,
+        #                   every send_interval ticks (see adapt_send_rate()) and only once their backlog drained.
+        #                   Seated binary TCP players silent for CLIENT_TIMEOUT are dropped.
+        #                   Spectators all got the same SNAPSHOT keyframe, encoded once per match and tick.
+        #                   CSV clients keep the request/response exchange and read the state when they next ask.
+        #                   A match with a player away waits for it to resume. Matches step through their
+        #                   LagCompensator, with each player's view lag
+        #                   Lockstep matches instead step through the ticks both players' inputs now cover
+        # A failed send can close a connection and discard its match, so walk a copy
+        for match in list(self.rooms.matches.values()):
+            left = match.clients["left"]
+            right = match.clients["right"]
+            if left is None or right is None or left.away or right.away:
                 continue
-                
-            # Parse the received data
-            paddleY = float(parts[0])
-            ballX = float(parts[1])
-            ballY = float(parts[2])
-            lScore = int(parts[3])
-            rScore = int(parts[4])
-            sync = int(parts[5])
-            
-            # Acquire lock to safely update the shared game state
-            with gameLock:
-                # Update server state based on who sent it
-                # We only trust the client to update their OWN paddle position
-                if player_side == "left":
-                    gameState["leftPaddleY"] = paddleY
-                else:
-                    gameState["rightPaddleY"] = paddleY
-                
-                # Update shared state (ball, score, sync)
-                # Logic: If the client's sync count is higher, it means they have newer game data.
-                # This is a simple way to keep states roughly in sync, though a more robust
-                # authoritative server model would calculate physics here instead of trusting clients.
-                if sync > gameState["sync"]:
-                    gameState["ballX"] = ballX
-                    gameState["ballY"] = ballY
-                    gameState["lScore"] = lScore
-                    gameState["rScore"] = rScore
-                    gameState["sync"] = sync
-                
-                # Prepare response to send back to the client
-                # We send the OPPONENT'S paddle position so this client can render it.
-                # We also send back the authoritative (or latest) ball and score data.
-                # Format: oppPaddleY,ballX,ballY,lScore,rScore,sync
-                if player_side == "left":
-                    oppPaddleY = gameState["rightPaddleY"]
+            if match.lockstep:
+                self._step_lockstep(match)
+                continue
+            sim = match.sim
+            scores = (sim.lScore, sim.rScore)
+            rewinds = match.lagcomp.rewinds
+            events = match.lagcomp.step({"left": compensated_lag(left), "right": compensated_lag(right)})
+            self.metrics.lagRewinds += match.lagcomp.rewinds - rewinds
+            match.stepped_at = time.monotonic()
+            # Only once no miss is left to turn into a hit, since that could take the winning point back
+            if sim.isOver() and not match.result_saved and not match.lagcomp.misses:
+                self._save_result(match)
+            fields = match.state(events)
+            if self.record_dir is not None:
+                self._record(match, fields)
+            now = match.sent_at[sim.tick % RTT_WINDOW] = time.monotonic()
+            for conn in (left, right):
+                if conn.decoder is not None:
+                    if now - conn.heard_at > CLIENT_TIMEOUT and not isinstance(conn, UdpConnection):
+                        print(f"Client {conn.addr} timed out")
+                        self._close(conn)
+                        continue
+                    self._push_state(conn, sim.tick, fields)
+                    # A lost UDP snapshot can take a point with it, so UDP clients also get score changes reliably
+                    # (a lag compensated hit can also take one back)
+                    if ((sim.lScore, sim.rScore) != scores and isinstance(conn, UdpConnection)
+                            and conn.match is not None):
+                        self._send(conn, encodeScore(sim.tick, sim.lScore, sim.rScore, conn.version), reliable=True)
+            if match.spectators:
+                self._show_spectators(match, fields)
+
+    def _push_state(self, conn: Connection, tick: int, fields: tuple) -> None:
+        # Send a player this tick's state if a snapshot is due. While earlier bytes are still queued the state
+        # only replaces the one waiting in conn.pending_state, so a slow link gets the newest state once it
+        # drains instead of a backlog; the events of skipped ticks ride along with the next snapshot sent
+        conn.pending_events |= fields[EVENTS_FIELD]
+        if conn.pending_state is not None:
+            conn.pending_state = (tick, fields)
+            return
+        if tick < conn.next_send_tick:
+            return
+        adapt_send_rate(conn, self.max_send_interval)
+        conn.next_send_tick = tick + conn.send_interval
+        if conn.outbuf:
+            conn.pending_state = (tick, fields)
+            return
+        self._send(conn, self._encode_state(conn, tick, fields))
+
+    def _encode_state(self, conn: Connection, tick: int, fields: tuple) -> bytes:
+        # The player's snapshot: DELTA against its baseline, or a keyframe, with every event since the last one
+        payload = conn.delta.encode(tick, fields[:EVENTS_FIELD] + (conn.pending_events, conn.input_seq),
+                                    conn.version)
+        conn.pending_events = 0
+        return payload
+
+    def _step_lockstep(self, match: Match) -> None:
+        # Step the server's copy of a lockstep match through every tick both players' inputs are known for, at
+        # most LOCKSTEP_LEAD of them. The players simulate it themselves, so only spectators and the recording
+        # see these states
+        sim = match.sim
+        left, right = match.inputs["left"], match.inputs["right"]
+        last = min(left.confirmed, right.confirmed, sim.tick + LOCKSTEP_LEAD)
+        while sim.tick <= last:
+            sim.leftPaddle.moving = left.move(sim.tick)
+            sim.rightPaddle.moving = right.move(sim.tick)
+            fields = match.state(sim.step())
+            if self.record_dir is not None:
+                self._record(match, fields)
+            if match.spectators:
+                self._show_spectators(match, fields)
+        left.trim(sim.tick)
+        right.trim(sim.tick)
+        if sim.isOver() and not match.result_saved:
+            self._save_result(match)
+
+    def _save_result(self, match: Match, forfeit: str | None = None) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Hand a finished game to the results store
+        # Pre:              Both seats are taken; the game was won, or the forfeit side is leaving it
+        # Post:             The result is queued (never written from here) and the match is marked saved, so it
+        #                   is saved once. Without --results only the mark is set
+        match.result_saved = True
+        if self.results is None:
+            return
+        sim = match.sim
+        left, right = match.clients["left"], match.clients["right"]
+        if forfeit is not None:
+            winner = "right" if forfeit == "left" else "left"
+        else:
+            winner = "left" if sim.lScore > sim.rScore else "right"
+        self.results.record(MatchResult(time.time(), match.match_id, (sim.tick - match.started_tick) / self.tick_rate,
+                                        left.name, right.name, sim.lScore, sim.rScore, winner, forfeit,
+                                        left.stats.meanSyncGap(), right.stats.meanSyncGap()))
+
+    def close_results(self) -> None:
+        # Write out every result still queued; called on shutdown
+        if self.results is not None:
+            self.results.close()
+
+    def _record(self, match: Match, fields: tuple) -> None:
+        if match.recorder is None:
+            self._start_recording(match)
+        match.recorder.write(match.sim.tick, *fields)
+
+    def _show_spectators(self, match: Match, fields: tuple) -> None:
+        # Keyframes, not deltas: every spectator can decode any frame, so skipping some is harmless.
+        # The input echo is meaningless to spectators and left at 0
+        frames = {}
+        for conn in list(match.spectators):
+            frame = frames.get(conn.version)
+            if frame is None:
+                frame = frames[conn.version] = encodeSnapshot(match.sim.tick, *fields, 0, version=conn.version)
+            self._fan_out(conn, frame)
+
+    def _start_recording(self, match: Match) -> None:
+        # Recording starts with the game's first tick; a match that restarts gets a new file
+        base = os.path.join(self.record_dir, f"{self.started_at}-{next(self.recordings):04d}-match{match.match_id}")
+        match.recorder = MatchRecorder(base, match.match_id, match.sim.tick, SCREEN_WIDTH, SCREEN_HEIGHT,
+                                       self.tick_rate)
+        print(f"Recording match {match.match_id} to {match.recorder.path}")
+
+    def _accept(self) -> None:
+        # Drain every pending connection; the listening socket is level-triggered so one call is enough
+        while True:
+            try:
+                client_sock, addr = self.server.accept()
+            except BlockingIOError:
+                return
+            client_sock.setblocking(False)
+            self._adopt(client_sock, addr)
+
+    def _adopt(self, client_sock: socket.socket, addr: tuple, silent: bool = False) -> None:
+        # Start serving a new client socket. silent means the Supervisor already waited out the HELLO grace
+        # period, so the client speaks CSV and is seated right away
+        # Frames are small and latency-bound, so they go out at once rather than waiting to be batched (Nagle)
+        client_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = Connection(client_sock, addr, ConnectionStats(self.metrics))
+        self.selector.register(client_sock, selectors.EVENT_READ, conn)
+        if silent:
+            conn.decoder = None
+            self._seat(conn)
+            return
+        # Wait for the client's HELLO before choosing a protocol and a seat.
+        # HELLO itself is always framed with version 1 so any client can be understood.
+        conn.decoder = FrameReader(1)
+        self.handshakes[conn] = time.monotonic() + HANDSHAKE_GRACE
+
+    def _receive_handoff(self) -> None:
+        # Sharded worker: adopt every connection the Supervisor passed over, one tag byte and one fd each
+        while True:
+            try:
+                tag, fds, flags, addr = socket.recv_fds(self.handoff, 1, 1)
+            except BlockingIOError:
+                return
+            if not tag:
+                raise SystemExit("Supervisor exited")
+            if not fds:
+                continue
+            client_sock = socket.socket(fileno=fds[0])
+            client_sock.setblocking(False)
+            try:
+                addr = client_sock.getpeername()
+            except OSError:
+                client_sock.close()     # the client left while it was being routed
+                continue
+            self._adopt(client_sock, addr, silent=tag == HANDOFF_CSV)
+
+    def _publish_status(self) -> None:
+        # Sharded worker: tell the router how loaded this worker is and whether a player is waiting here
+        index, count, status = self.shard
+        base = index * STATUS_FIELDS
+        status[base + STATUS_CONNECTIONS] = len(self.selector.get_map())
+        status[base + STATUS_MATCHES] = len(self.rooms.matches)
+        status[base + STATUS_WAITING] = len(self.lobby)
+        status[base + STATUS_HEARTBEAT] = time.monotonic()
+
+    def _seat(self, conn: Connection, role: int = ROLE_PLAYER, match_id: int = 0, token: int | None = None) -> None:
+        # Finish the handshake: a spectator is attached to a match and welcomed right away, a player
+        # waits in the lobby until it is paired, and a returning player takes back its seat
+        self.handshakes.pop(conn, None)
+        if role == ROLE_RESUME:
+            self._resume(conn, match_id, token)
+            return
+        self.metrics.connections += 1
+        if role == ROLE_SPECTATOR:
+            self.rooms.watch(conn, match_id)
+            self._welcome(conn)
+        else:
+            # Lockstep needs every input delivered in order, so over UDP the client is an ordinary player
+            conn.lockstep = role == ROLE_LOCKSTEP and not isinstance(conn, UdpConnection)
+            self._queue(conn)
+
+    def _resume(self, conn: Connection, match_id: int, token: int | None) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Give a reconnecting player its seat back, in one round trip
+        # Pre:              conn sent a ROLE_RESUME HELLO for match_id with token (None if it carried none)
+        # Post:             If token names a player of that match on the same transport, conn takes over its seat
+        #                   and session (its inputs are numbered afresh) and is sent WELCOME and a SNAPSHOT keyframe
+        #                   of the match right away; the old connection is closed if the server still thought it
+        #                   open. A seat without an opponent goes back to the lobby. Otherwise conn is refused and
+        #                   closed
+        old = self.sessions.get(token)
+        if (old is None or old.match is None or old.match.match_id != match_id
+                or isinstance(old, UdpConnection) != isinstance(conn, UdpConnection)):
+            print(f"Refused to resume a session from {conn.addr}")
+            self._close(conn)
+            return
+        if not old.away:
+            self._close(old)    # a half-open connection the client has already given up on
+        del self.suspended[old]
+        old.away = False
+
+        match, side = old.match, old.side
+        match.clients[side] = conn
+        conn.match, conn.side, conn.token = match, side, token
+        conn.rating, conn.region = old.rating, old.region
+        old.match = None
+        self.sessions[token] = conn
+        self.metrics.connections += 1
+        print(f"Resumed {side} in match {match.match_id} for {conn.addr}")
+        self._welcome(conn)
+        self._send(conn, conn.delta.encode(match.sim.tick, match.state() + (conn.input_seq,), conn.version))
+        if conn.match is not None and not match.is_full():
+            self._queue(conn, host=True)
+
+    def _queue(self, conn: Connection, host: bool = False) -> None:
+        # Put a player in the lobby and start the match for any pair that can be made right away.
+        # host marks a player still seated in its match, waiting for a new opponent. Lockstep players
+        # queue apart from the others, as if in a region of their own
+        for first, second in self.lobby.join(conn, conn.rating, (conn.region, conn.lockstep), time.monotonic(),
+                                             host):
+            self._start_match(first, second)
+
+    def _start_match(self, first: Connection, second: Connection) -> None:
+        # Seat a pair from the lobby; whoever was not seated yet gets the handshake now
+        newcomers = [conn for conn in (first, second) if conn.match is None]
+        match = self.rooms.pair(first, second)
+        # A newcomer taking over a seat plays on from the score the game is at; it counts as a game of its own
+        match.started_tick = match.sim.tick
+        match.result_saved = match.sim.isOver()
+        for conn in newcomers:
+            self._welcome(conn)
+
+    def _welcome(self, conn: Connection) -> None:
+        # Send the initial configuration in the connection's protocol. Binary clients get WELCOME,
+        # CSV clients get "screenWidth,screenHeight,playerSide"
+        # A binary player that is not in lockstep also gets a session to resume with if its connection drops
+        print(f"Accepted connection from {conn.addr} as {conn.side} in match {conn.match.match_id}")
+        if conn.decoder is not None:
+            session = None
+            if conn.side != "spectator" and not conn.lockstep:
+                if conn.token is None:
+                    conn.token = secrets.randbits(64)
+                    self.sessions[conn.token] = conn
+                session = (conn.match.match_id, conn.token)
+            self._send(conn, encodeWelcome(SCREEN_WIDTH, SCREEN_HEIGHT, conn.side, self.tick_rate, conn.version,
+                                           session), reliable=True)
+        else:
+            self._send(conn, f"{SCREEN_WIDTH},{SCREEN_HEIGHT},{conn.side}".encode())
+
+    def _handshake(self, conn: Connection) -> None:
+        # The first frame from a new client must be its HELLO; negotiate the highest common version
+        reader = conn.decoder
+        try:
+            msgType = reader.next()
+        except ProtocolError:
+            msgType = -1
+        if msgType is None:
+            return  # HELLO split across reads, wait for the rest
+        if msgType != MSG_HELLO or reader.payloadEnd - reader.payload < HELLO.size:
+            print(f"Bad handshake from {conn.addr}")
+            conn.stats.malformed += 1
+            self._close(conn)
+            return
+        self._hello(conn, reader.payloadBytes())
+        # Anything sent right behind the HELLO is ordinary traffic, once the client has a seat
+        self._dispatch(conn, None)
+
+    def _hello(self, conn: Connection, hello: bytes) -> None:
+        # Take what a HELLO says about the client (version, rating, region, name) and seat it as it asks
+        clientVersion, role, match_id = decodeHello(hello)
+        conn.version = min(clientVersion, PROTOCOL_VERSION)
+        conn.decoder.version = conn.version
+        rating = decodeHelloRating(hello)
+        if rating is not None:
+            if rating[0] != RATING_DEFAULT:
+                conn.rating = rating[0]
+            conn.region = rating[1]
+        conn.name = decodeHelloName(hello)
+        self._seat(conn, role, match_id, decodeHelloToken(hello))
+
+    def _read(self, conn: Connection) -> None:
+        # Binary clients are read straight into their FrameReader; CSV clients a message at a time
+        data = None
+        try:
+            if conn.decoder is not None:
+                received = conn.decoder.readFrom(conn.sock)
+            else:
+                data = conn.sock.recv(RECV_SIZE)
+                received = len(data)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            print(f"Error with {conn.side} client: {e}")
+            self._close(conn)
+            return
+        if not received:
+            self._close(conn)
+            return
+        conn.stats.bytesIn += received
+        conn.heard_at = time.monotonic()
+
+        if conn in self.handshakes:
+            self._handshake(conn)
+        else:
+            self._dispatch(conn, data)
+
+    def _dispatch(self, conn: Connection, data: bytes | None) -> None:
+        # data is what a CSV client sent; a binary client's bytes are waiting in its FrameReader
+        if conn.match is None and conn.decoder is None:
+            return  # still in the lobby; clients wait for their handshake before they send anything
+        if conn.decoder is None:
+            response = handle_csv(conn, data)
+        else:
+            try:
+                if conn.match is None:
+                    conn.decoder.skip()
+                    return
+                replied = handle_frames(conn, conn.decoder, self.replies)
+            except ProtocolError as e:
+                # Framing is lost for the rest of the stream, so the connection cannot continue
+                print(f"Error with {conn.side} client: {e}")
+                conn.stats.malformed += 1
+                self._close(conn)
+                return
+            response = self.replies[:replied]
+            if conn.bye:
+                self._close(conn)
+                return
+        if response:
+            self._send(conn, response)
+        if conn.relay:
+            self._relay(conn)
+
+    def _relay(self, conn: Connection) -> None:
+        # Forward a lockstep player's inputs to the opponent as they arrive; the server adds no delay
+        opponent = conn.match.clients["right" if conn.side == "left" else "left"]
+        if opponent is not None:
+            self._send(opponent, b"".join(encodeFrame(MSG_LOCKSTEP, payload, opponent.version)
+                                          for payload in conn.relay))
+        conn.relay.clear()
+
+    def _send(self, conn: Connection, payload: bytes, reliable: bool = False) -> None:
+        # Queue the bytes behind anything still pending, then try to push them out right away.
+        # reliable only matters for UDP clients; TCP delivers everything anyway
+        conn.stats.bytesOut += len(payload)
+        conn.stats.messagesOut += 1
+        if isinstance(conn, UdpConnection):
+            if reliable:
+                self._send_datagram(conn, conn.channel.packReliable(payload, time.monotonic()))
+            else:
+                self._send_datagram(conn, conn.channel.packUnreliable(payload))
+            return
+        conn.outbuf += payload
+        self._flush(conn)
+
+    def _fan_out(self, conn: Connection, frame: bytes) -> None:
+        # Send a spectator the shared frame. While its outbuf is still draining the frame only replaces the
+        # one waiting in conn.latest, so a spectator that reads slower than the tick rate skips frames
+        # instead of growing a backlog
+        if conn.outbuf:
+            conn.latest = frame
+            return
+        self._send(conn, frame)
+
+    def _flush(self, conn: Connection) -> None:
+        while True:
+            try:
+                sent = conn.sock.send(conn.outbuf)
+            except BlockingIOError:
+                sent = 0
+            except OSError as e:
+                print(f"Error with {conn.side} client: {e}")
+                self._close(conn)
+                return
+            del conn.outbuf[:sent]
+            if conn.outbuf:
+                break
+            # A client that caught up gets the newest frame (spectators) or state (players) from the meantime
+            if conn.latest is not None:
+                payload, conn.latest = conn.latest, None
+            elif conn.pending_state is not None:
+                payload = self._encode_state(conn, *conn.pending_state)
+                conn.pending_state = None
+            else:
+                break
+            conn.outbuf += payload
+            conn.stats.bytesOut += len(payload)
+            conn.stats.messagesOut += 1
+
+        if len(conn.outbuf) > MAX_OUTBUF:
+            # Holding more for a client that reads this slowly would only grow the server's memory
+            print(f"Client {conn.addr} cannot keep up; dropping it")
+            self._close(conn)
+            return
+
+        # Only ask for write readiness while there is a backlog, otherwise the selector would spin
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if conn.outbuf else 0)
+        if self.selector.get_key(conn.sock).events != events:
+            self.selector.modify(conn.sock, events, conn)
+
+    def _close(self, conn: Connection) -> None:
+        # Clean up the connection when the peer leaves or an error occurs. A player with a session keeps its
+        # seat for SESSION_GRACE seconds (its match paused); anyone else gives it up right away
+        print(f"Client {conn.side} disconnected")
+        self.handshakes.pop(conn, None)
+        self.lobby.leave(conn)
+        if conn.token is not None and conn.match is not None and not conn.bye:
+            conn.away = True
+            conn.match.paddle(conn.side).moving = ""
+            self.suspended[conn] = time.monotonic() + SESSION_GRACE
+        else:
+            self._release(conn)
+        self.metrics.retire(conn.stats)
+        if isinstance(conn, UdpConnection):
+            # The socket is shared; just forget the peer (and tell it, in case it is still listening)
+            if self.udp_peers.pop(conn.addr, None) is not None:
+                self._send_datagram(conn, conn.channel.packUnreliable(encodeBye(conn.version)))
+            return
+        self.selector.unregister(conn.sock)
+        conn.sock.close()
+
+    def _release(self, conn: Connection) -> None:
+        # Give up a connection's seat for good; the opponent goes back to the lobby, or is closed in lockstep
+        self.sessions.pop(conn.token, None)
+        match, side = conn.match, conn.side
+        # Leaving a game in progress forfeits it
+        if (match is not None and side in ("left", "right") and not match.result_saved
+                and None not in match.clients.values() and match.sim.tick > match.started_tick):
+            self._save_result(match, forfeit=side)
+        self.rooms.release(conn)
+        if match is not None and side in ("left", "right"):
+            opponent = match.clients["right" if side == "left" else "left"]
+            if opponent is not None and match.lockstep:
+                # A lockstep game cannot take a new player midway: both would have to start it from tick 0
+                self._close(opponent)
+            elif opponent is not None and not opponent.away and opponent not in self.lobby:
+                # Back to the lobby, keeping the seat, for the next player near the opponent's rating
+                self._queue(opponent, host=True)
+
+    def _metric_labels(self) -> list:
+        # [(labels, stats), ...] for every open client connection, the form ServerMetrics expects
+        live = []
+        conns = [key.data for key in self.selector.get_map().values() if isinstance(key.data, Connection)]
+        for conn in conns + list(self.udp_peers.values()):
+            transport = "udp" if isinstance(conn, UdpConnection) else "tcp"
+            match_id = conn.match.match_id if conn.match is not None else ""
+            live.append((f'addr="{conn.addr[0]}:{conn.addr[1]}",transport="{transport}",match="{match_id}",'
+                         f'side="{conn.side or ""}"', conn.stats))
+        return live
+
+    def _accept_http(self) -> None:
+        try:
+            sock, addr = self.metrics_sock.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        self.selector.register(sock, selectors.EVENT_READ, HttpClient(sock))
+
+    def _serve_http(self, client: HttpClient) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Advance one metrics endpoint request: read it, then write the response
+        # Pre:              client's socket was reported ready
+        # Post:             Once the request headers are in, GET /metrics (or /) is answered with the Prometheus
+        #                   text and anything else with 404; the socket is closed when the response is out
+        try:
+            if client.response is None:
+                data = client.sock.recv(MAX_HTTP_REQUEST)
+                client.request += data
+                if data and b"\r\n\r\n" not in client.request and len(client.request) < MAX_HTTP_REQUEST:
+                    return
+                parts = bytes(client.request).split(b" ", 2)
+                if len(parts) > 1 and parts[0] == b"GET" and parts[1] in (b"/", b"/metrics"):
+                    status, body = "200 OK", self.metrics.render(self._metric_labels()).encode()
                 else:
-                    oppPaddleY = gameState["leftPaddleY"]
-                
-                response = f"{oppPaddleY},{gameState['ballX']},{gameState['ballY']},{gameState['lScore']},{gameState['rScore']},{gameState['sync']}"
-            
-            # Send the constructed response string back to the client
-            client_socket.send(response.encode())
-            
-    except Exception as e:
-        print(f"Error with {player_side} client: {e}")
+                    status, body = "404 Not Found", b"not found\n"
+                client.response = bytearray(
+                    f"HTTP/1.0 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                    f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+                self.selector.modify(client.sock, selectors.EVENT_WRITE, client)
+            sent = client.sock.send(client.response)
+            del client.response[:sent]
+            if client.response:
+                return
+        except BlockingIOError:
+            return
+        except OSError:
+            pass
+        self.selector.unregister(client.sock)
+        client.sock.close()
+
+    def _read_udp(self) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Drain the UDP socket and serve every datagram
+        # Pre:              The UDP transport is enabled
+        # Post:             A HELLO from a new address seats it like a TCP client and answers with a reliable
+        #                   WELCOME; BYE closes the sender; other frames are served by handle_frames. Stale,
+        #                   duplicate and malformed datagrams are dropped
+        now = time.monotonic()
+        while True:
+            try:
+                datagram, addr = self.udp.recvfrom(MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                print(f"UDP error: {e}")
+                return
+
+            conn = self.udp_peers.get(addr)
+            if conn is None:
+                conn = UdpConnection(self.udp, addr, ConnectionStats(self.metrics))
+                conn.decoder = FrameReader(1)
+            conn.stats.bytesIn += len(datagram)
+            try:
+                payloads, reliable = conn.channel.unpack(datagram, now)
+            except struct.error:
+                conn.stats.malformed += 1
+                continue
+            reader = conn.decoder
+            for payload in payloads:
+                try:
+                    reader.load(payload)
+                    if addr not in self.udp_peers:
+                        if reader.next() != MSG_HELLO or reader.payloadEnd - reader.payload < HELLO.size:
+                            continue
+                        self.udp_peers[addr] = conn
+                        self._hello(conn, reader.payloadBytes())
+                    replied = 0
+                    if conn.match is not None:
+                        replied = handle_frames(conn, reader, self.replies)
+                    else:
+                        # In the lobby the client only keeps the session alive until its WELCOME, or leaves
+                        msgType = reader.next()
+                        while msgType is not None and msgType != MSG_BYE:
+                            msgType = reader.next()
+                        conn.bye = msgType == MSG_BYE
+                except ProtocolError:
+                    # A datagram holds whole frames, so only this one is lost
+                    conn.stats.malformed += 1
+                    continue
+                if conn.bye:
+                    # Acknowledge a reliable goodbye before the peer is forgotten, or the client keeps resending it
+                    if reliable:
+                        self._send_datagram(conn, conn.channel.packAck())
+                    self._close(conn)
+                    break
+                if replied:
+                    self._send(conn, self.replies[:replied])
+            if reliable and addr in self.udp_peers:
+                self._send_datagram(conn, conn.channel.packAck())
+
+    def _service_udp(self, now: float) -> None:
+        # Once per tick: resend unacknowledged reliable messages and drop UDP clients that went silent
+        for conn in list(self.udp_peers.values()):
+            if conn.channel.expired(now):
+                print(f"UDP client {conn.addr} timed out")
+                self._close(conn)
+                continue
+            for datagram in conn.channel.due(now):
+                self._send_datagram(conn, datagram)
+
+    def _send_datagram(self, conn: UdpConnection, datagram: bytes) -> None:
+        # UDP never blocks for long and never queues: a datagram the kernel refuses is simply lost,
+        # which the protocol already tolerates
+        try:
+            self.udp.sendto(datagram, conn.addr)
+        except OSError:
+            pass
+
+
+def run_worker(index: int, count: int, handoff: socket.socket, status, server_ip: str, server_port: int,
+               tick_rate: int, record_dir: str | None, metrics_port: int | None,
+               metrics_interval: float | None, results_path: str | None) -> None:
+    # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+    # Purpose:          Worker process body in sharded mode
+    # Pre:              Started by Supervisor; handoff is this worker's end of its socket pair
+    # Post:             Serves the connections the Supervisor hands over until the Supervisor exits. A metrics
+    #                   port is offset by the worker index so every worker can be scraped. Every worker writes its
+    #                   results to the same database
+    if metrics_port is not None:
+        metrics_port += index
+    server = GameServer(server_ip, server_port, tick_rate, False, record_dir, metrics_port, metrics_interval,
+                        handoff, (index, count, status), results_path)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
     finally:
-        # Clean up the connection when the loop ends or an error occurs
-        print(f"Client {player_side} disconnected")
-        with gameLock:
-            connected_clients[player_side] = None
-            if connected_clients["left"] is None and connected_clients["right"] is None:
-                reset_game_state()
-        client_socket.close()
+        server.close_results()
+
+
+class Supervisor:
+    # Sharded mode. This process owns the port and only routes: each new connection is handed (file
+    # descriptor and all) to one of the worker processes, which runs its own GameServer with its own
+    # matches, so the GIL limits each worker instead of the whole server. The router waits for a
+    # client's HELLO (peeking, so the worker still reads it) to tell players from spectators:
+    #   - players come in pairs: the second player goes wherever the first went, so both share a match;
+    #     a worker with players waiting in its lobby (say, one whose opponent quit) gets the next player
+    #     instead, and otherwise the least loaded worker starts the next pair. Each worker matches the
+    #     players it is given by rating in its own lobby
+    #   - a spectator asking for a match id goes to the worker owning it (ids are strided by worker), and
+    #     so does a player resuming its session in that match
+    # Workers publish their load and a heartbeat in a shared array every tick; a worker that dies is
+    # restarted. Anything that must return to a match (a spectator, a resumed session) is routed by
+    # match id, so it lands on the same worker as the match.
+    def __init__(self, server_ip: str, server_port: int, workers: int, tick_rate: int = TICK_RATE,
+                 record_dir: str | None = None, metrics_port: int | None = None,
+                 metrics_interval: float | None = None, results_path: str | None = None) -> None:
+        self.selector = selectors.DefaultSelector()
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((server_ip, server_port))
+        self.server.listen(socket.SOMAXCONN)
+        self.server.setblocking(False)
+        self.selector.register(self.server, selectors.EVENT_READ, None)
+        self.address = self.server.getsockname()
+
+        self.options = (self.address[0], self.address[1], tick_rate, record_dir, metrics_port, metrics_interval,
+                        results_path)
+        self.count = workers
+        self.status = multiprocessing.RawArray("d", workers * STATUS_FIELDS)
+        self.workers = [None] * workers     # (process, handoff socket) per worker
+        self.waiting = {}   # socket -> (addr, deadline) for connections whose HELLO the router waits for
+        self.pending = None # worker holding the first player of a pair; the next player goes there too
+        for index in range(workers):
+            self._start_worker(index)
+        self.next_check = time.monotonic() + WORKER_TIMEOUT
+
+        # Every worker must be up before connections can be routed
+        deadline = time.monotonic() + 10 * WORKER_TIMEOUT
+        while len(self._healthy()) < workers and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def _start_worker(self, index: int) -> None:
+        ours, theirs = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        process = multiprocessing.Process(target=run_worker, name=f"pong-worker-{index}",
+                                          args=(index, self.count, theirs, self.status) + self.options,
+                                          daemon=True)
+        process.start()
+        theirs.close()
+        self.workers[index] = (process, ours)
+
+    def serve_forever(self) -> None:
+        while True:
+            self.run_once(None)
+
+    def run_once(self, timeout: float | None) -> None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Accept, inspect and route connections once
+        # Pre:              timeout is the longest wait in seconds, or None to wait until the next health check
+        # Post:             New connections are waiting for their HELLO or were handed to a worker, silent ones
+        #                   past HANDSHAKE_GRACE went to a worker as CSV clients, dead workers were restarted
+        now = time.monotonic()
+        wait = self.next_check - now
+        if self.waiting:
+            wait = min(wait, next(iter(self.waiting.values()))[1] - now)
+        wait = max(0.0, wait)
+        timeout = wait if timeout is None else min(timeout, wait)
+
+        for key, mask in self.selector.select(timeout):
+            if key.fileobj is self.server:
+                self._accept()
+            else:
+                self._peek(key.fileobj)
+
+        now = time.monotonic()
+        while self.waiting:
+            sock, (addr, deadline) = next(iter(self.waiting.items()))
+            if deadline > now:
+                break
+            self._route(sock, HANDOFF_CSV, ROLE_PLAYER, 0)
+        if now >= self.next_check:
+            self._check_workers()
+            self.next_check = now + WORKER_TIMEOUT
+
+    def close(self) -> None:
+        # Stop every worker and wait for it, so its CPU time is accounted to this process
+        for process, handoff in self.workers:
+            process.terminate()
+            process.join()
+            handoff.close()
+        self.server.close()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                client_sock, addr = self.server.accept()
+            except BlockingIOError:
+                return
+            client_sock.setblocking(False)
+            self.selector.register(client_sock, selectors.EVENT_READ, None)
+            self.waiting[client_sock] = (addr, time.monotonic() + HANDSHAKE_GRACE)
+
+    def _peek(self, sock: socket.socket) -> None:
+        # Look at the client's first bytes without consuming them, and route it once its HELLO is complete
+        try:
+            data = sock.recv(HEADER.size + HELLO.size + HELLO_ROLE.size, socket.MSG_PEEK)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            # Gone before it was routed
+            del self.waiting[sock]
+            self.selector.unregister(sock)
+            sock.close()
+            return
+        role, match_id = ROLE_PLAYER, 0
+        if isFrameStart(data):
+            length, version, msg_type = HEADER.unpack_from(data)
+            if msg_type == MSG_HELLO:
+                if len(data) < min(2 + length, HEADER.size + HELLO.size + HELLO_ROLE.size):
+                    return  # the rest of the HELLO is on its way
+                try:
+                    client_version, role, match_id = decodeHello(data[HEADER.size:2 + length])
+                except struct.error:
+                    pass    # the worker rejects it
+        self._route(sock, HANDOFF_BINARY, role, match_id)
+
+    def _route(self, sock: socket.socket, tag: bytes, role: int, match_id: int) -> None:
+        del self.waiting[sock]
+        self.selector.unregister(sock)
+        worker = self._pick_worker(role, match_id)
+        if worker is not None:
+            try:
+                socket.send_fds(self.workers[worker][1], [tag], [sock.fileno()])
+            except OSError as e:
+                print(f"Handoff to worker {worker} failed: {e}")
+        else:
+            print("No worker available")
+        # The worker has its own descriptor for the connection now
+        sock.close()
+
+    def _healthy(self) -> list:
+        now = time.monotonic()
+        return [index for index in range(self.count)
+                if now - self.status[index * STATUS_FIELDS + STATUS_HEARTBEAT] < WORKER_TIMEOUT]
+
+    def _pick_worker(self, role: int, match_id: int) -> int | None:
+        # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
+        # Purpose:          Choose the worker for a new connection
+        # Pre:              role and match_id come from the client's HELLO (ROLE_PLAYER, 0 without one)
+        # Post:             Returns a healthy worker's index, or None when none is. See the class comment for
+        #                   the rules; load is the worker's connection count
+        healthy = self._healthy()
+        if not healthy:
+            return None
+        status = self.status
+        if role == ROLE_SPECTATOR or role == ROLE_RESUME:
+            owner = (match_id - 1) % self.count if match_id > 0 else None
+            if owner in healthy:
+                return owner
+            # Any match in progress will do; the worker with the most matches has the most to watch
+            return max(healthy, key=lambda index: status[index * STATUS_FIELDS + STATUS_MATCHES])
+
+        if self.pending in healthy:
+            worker, self.pending = self.pending, None
+            return worker
+        load = lambda index: status[index * STATUS_FIELDS + STATUS_CONNECTIONS]
+        queued = [index for index in healthy if status[index * STATUS_FIELDS + STATUS_WAITING] > 0]
+        if queued:
+            self.pending = None
+            return min(queued, key=load)
+        self.pending = min(healthy, key=load)
+        return self.pending
+
+    def _check_workers(self) -> None:
+        # Restart any worker that exited; its matches are lost, the other workers are not affected
+        for index, (process, handoff) in enumerate(self.workers):
+            if process.is_alive():
+                continue
+            print(f"Worker {index} exited with code {process.exitcode}, restarting it")
+            handoff.close()
+            self.status[index * STATUS_FIELDS + STATUS_HEARTBEAT] = 0.0
+            if self.pending == index:
+                self.pending = None
+            self._start_worker(index)
 
 
 def main() -> None:
     # Author:           Ehsanullah Dehzad, Fatima Fayazi, David Salas
-    # Purpose:          Initialize the server socket, bind to IP/port, listen for connections, and spawn client handler threads
-    # Pre:              Port 5555 is available; gameState and connected_clients are initialized as globals
-    # Post:             Server listens on 127.0.0.1:5555; up to 2 clients can connect; each client gets a
-    #                   side assignment ("left" or "right") and a handler thread; additional connections are rejected
-    # Server configuration
-    server_ip = "127.0.0.1" # Localhost
-    server_port = 5555      # Port to listen on
-    
-    # Create a TCP/IP socket
-    # AF_INET = IPv4, SOCK_STREAM = TCP
-    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    
-    # Bind the socket to the address and port
-    server.bind((server_ip, server_port))
-    
-    # Listen for incoming connections (queue up to 2 requests)
-    server.listen(2)
-    
-    print(f"Server listening on {server_ip}:{server_port}")
-    
-    # Wait for clients to connect
-    while True:
-        client_sock, addr = server.accept()
-        print(f"Accepted connection from {addr}")
-        
-        # Determine side assignment based on available slots
-        side = None
-        with gameLock:
-            if connected_clients["left"] is None:
-                side = "left"
-            elif connected_clients["right"] is None:
-                side = "right"
-        
-        if side:
-            with gameLock:
-                connected_clients[side] = client_sock
-            
-            # Send initial configuration to the client
-            # Format: screenWidth,screenHeight,playerSide
-            # Screen size is hardcoded to 640x480 to match the client's default
-            config = f"640,480,{side}"
-            client_sock.send(config.encode())
-            
-            # Start a new thread to handle this client's communication
-            # This allows the server to handle multiple clients simultaneously
-            thread = threading.Thread(target=client_handler, args=(client_sock, side))
-            thread.start()
-        else:
-            print("Server full. Rejecting connection.")
-            client_sock.close()
+    # Purpose:          Parse the command line, bind the server socket and run the event loop
+    # Pre:              The requested port is available
+    # Post:             Server listens on the given address (127.0.0.1:5555 by default); connections are paired
+    #                   into matches, each client gets a side assignment ("left" or "right") in its match, and
+    #                   spectators are attached to the match they asked for
+    parser = argparse.ArgumentParser(description="Multiplayer Pong server")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: localhost)")
+    parser.add_argument("--port", type=int, default=5555, help="port to listen on (default: 5555)")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE,
+                        help=f"physics ticks per second for every match; the game speed is the same at any rate, "
+                             f"20-30 halves or thirds the CPU and bandwidth per match (default: {TICK_RATE})")
+    parser.add_argument("--udp", action="store_true",
+                        help="also accept clients over UDP on the same port")
+    parser.add_argument("--record", metavar="DIR",
+                        help="record every game to DIR for pongClient.py --replay (default: off)")
+    parser.add_argument("--metrics-port", type=int,
+                        help="serve Prometheus-style metrics over HTTP on this port (default: off)")
+    parser.add_argument("--metrics-log", type=float, metavar="SECONDS",
+                        help="print a metrics summary line this often (default: off)")
+    parser.add_argument("--results", metavar="FILE",
+                        help="save every finished game to the SQLite database FILE, for leaderboards (default: off)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes to spread matches over, e.g. one per core (default: 1)")
+    args = parser.parse_args()
+    if args.workers > 1 and args.udp:
+        parser.error("--udp is not supported with --workers")
+
+    if args.record is not None:
+        os.makedirs(args.record, exist_ok=True)
+    if args.results is not None:
+        openResults(args.results).close()   # create it up front, so a bad path fails here and not in a worker
+    if args.workers > 1:
+        server = Supervisor(args.host, args.port, args.workers, args.tick_rate, args.record, args.metrics_port,
+                            args.metrics_log, args.results)
+        print(f"Server listening on {args.host}:{args.port} with {args.workers} workers")
+        if args.metrics_port is not None:
+            print(f"Metrics at http://{args.host}:{args.metrics_port}-{args.metrics_port + args.workers - 1}"
+                  f"/metrics, one port per worker")
+    else:
+        server = GameServer(args.host, args.port, args.tick_rate, args.udp, args.record, args.metrics_port,
+                            args.metrics_log, results_path=args.results)
+        print(f"Server listening on {args.host}:{args.port}" + (" (TCP and UDP)" if args.udp else ""))
+        if args.metrics_port is not None:
+            print(f"Metrics at http://{args.host}:{args.metrics_port}/metrics")
+    try:
+        server.serve_forever()
+    finally:
+        if isinstance(server, GameServer):
+            server.close_results()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()